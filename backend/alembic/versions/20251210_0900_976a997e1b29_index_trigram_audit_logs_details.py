@@ -0,0 +1,35 @@
+"""Index trigram sur audit_logs.details
+
+Revision ID: 976a997e1b29
+Revises: 1e865f6d3e26
+Create Date: 2025-12-10 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '976a997e1b29'
+down_revision = '1e865f6d3e26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Index GIN trigram sur details::text.
+    
+    Permet à la recherche textuelle des logs d'audit
+    (details::text ILIKE '%...%') d'utiliser un index au lieu
+    d'un parcours séquentiel de la table.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_audit_logs_details_trgm
+        ON audit_logs USING gin ((details::text) gin_trgm_ops);
+    """)
+
+
+def downgrade() -> None:
+    """Supprimer l'index trigram (l'extension pg_trgm est conservée)."""
+    op.execute("DROP INDEX IF EXISTS ix_audit_logs_details_trgm;")
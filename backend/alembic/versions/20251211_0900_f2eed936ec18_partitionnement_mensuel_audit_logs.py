@@ -0,0 +1,144 @@
+"""Partitionnement mensuel de audit_logs
+
+Revision ID: f2eed936ec18
+Revises: 976a997e1b29
+Create Date: 2025-12-11 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2eed936ec18'
+down_revision = '976a997e1b29'
+branch_labels = None
+depends_on = None
+
+
+def _create_indexes() -> None:
+    """Index de audit_logs (propagés automatiquement aux partitions)."""
+    op.execute("CREATE INDEX ix_audit_logs_id ON audit_logs (id);")
+    op.execute("CREATE INDEX ix_audit_logs_user_id ON audit_logs (user_id);")
+    op.execute("CREATE INDEX ix_audit_logs_action ON audit_logs (action);")
+    op.execute("CREATE INDEX ix_audit_logs_entity_type ON audit_logs (entity_type);")
+    op.execute("CREATE INDEX ix_audit_logs_created_at ON audit_logs (created_at);")
+    op.execute("""
+        CREATE INDEX ix_audit_logs_details_trgm
+        ON audit_logs USING gin ((details::text) gin_trgm_ops);
+    """)
+
+
+def upgrade() -> None:
+    """
+    Convertit audit_logs en table partitionnée par mois (RANGE created_at).
+
+    - Partitions audit_logs_YYYY_MM créées par create_audit_logs_partition()
+      (appelée à la migration puis chaque jour par la tâche de nettoyage)
+    - Partition audit_logs_default pour les lignes hors partitions
+    - La clé primaire inclut created_at (contrainte PostgreSQL)
+    """
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_old;")
+    op.execute("ALTER TABLE audit_logs_old RENAME CONSTRAINT audit_logs_pkey TO audit_logs_old_pkey;")
+    for index_name in (
+        'ix_audit_logs_id', 'ix_audit_logs_user_id', 'ix_audit_logs_action',
+        'ix_audit_logs_entity_type', 'ix_audit_logs_created_at', 'ix_audit_logs_details_trgm',
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index_name};")
+
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id UUID NOT NULL,
+            user_id UUID REFERENCES users(id) ON DELETE SET NULL,
+            action VARCHAR(100) NOT NULL,
+            entity_type VARCHAR(50),
+            entity_id UUID,
+            details JSONB,
+            ip_address VARCHAR(45),
+            user_agent TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at);
+    """)
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;")
+    _create_indexes()
+
+    # Création idempotente de la partition d'un mois
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_audit_logs_partition(month_start DATE)
+        RETURNS VOID AS $$
+        DECLARE
+            start_date DATE := date_trunc('month', month_start)::date;
+            partition_name TEXT := 'audit_logs_' || to_char(start_date, 'YYYY_MM');
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_logs '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition_name, start_date, (start_date + interval '1 month')::date
+            );
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Partitions des mois existants (+ mois courant et suivant)
+    op.execute("""
+        SELECT create_audit_logs_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', LEAST(
+                COALESCE((SELECT min(created_at) FROM audit_logs_old), now()),
+                now()
+            )),
+            date_trunc('month', now()) + interval '1 month',
+            interval '1 month'
+        ) AS month;
+    """)
+
+    op.execute("""
+        INSERT INTO audit_logs (
+            id, user_id, action, entity_type, entity_id,
+            details, ip_address, user_agent, created_at
+        )
+        SELECT
+            id, user_id, action, entity_type, entity_id,
+            details, ip_address, user_agent, created_at
+        FROM audit_logs_old;
+    """)
+    op.execute("DROP TABLE audit_logs_old;")
+
+
+def downgrade() -> None:
+    """Revenir à une table audit_logs non partitionnée."""
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned;")
+    op.execute(
+        "ALTER TABLE audit_logs_partitioned "
+        "RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey;"
+    )
+    for index_name in (
+        'ix_audit_logs_id', 'ix_audit_logs_user_id', 'ix_audit_logs_action',
+        'ix_audit_logs_entity_type', 'ix_audit_logs_created_at', 'ix_audit_logs_details_trgm',
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index_name};")
+
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id UUID PRIMARY KEY,
+            user_id UUID REFERENCES users(id) ON DELETE SET NULL,
+            action VARCHAR(100) NOT NULL,
+            entity_type VARCHAR(50),
+            entity_id UUID,
+            details JSONB,
+            ip_address VARCHAR(45),
+            user_agent TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        );
+    """)
+    _create_indexes()
+
+    op.execute("""
+        INSERT INTO audit_logs
+        SELECT
+            id, user_id, action, entity_type, entity_id,
+            details, ip_address, user_agent, created_at
+        FROM audit_logs_partitioned;
+    """)
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE;")
+    op.execute("DROP FUNCTION IF EXISTS create_audit_logs_partition(DATE);")
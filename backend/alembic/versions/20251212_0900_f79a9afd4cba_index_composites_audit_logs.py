@@ -0,0 +1,45 @@
+"""Index composites audit_logs (filtre + created_at DESC)
+
+Revision ID: f79a9afd4cba
+Revises: f2eed936ec18
+Create Date: 2025-12-12 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f79a9afd4cba'
+down_revision = 'f2eed936ec18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Index (colonne filtrée, created_at DESC) pour les listes « N derniers » :
+    get_user_activity et get_logs filtré par action / type d'entité.
+    
+    Pas de CREATE INDEX CONCURRENTLY : non supporté sur une table
+    partitionnée (l'index est créé sur chaque partition).
+    """
+    op.create_index(
+        'ix_audit_logs_user_created', 'audit_logs',
+        ['user_id', sa.text('created_at DESC')]
+    )
+    op.create_index(
+        'ix_audit_logs_action_created', 'audit_logs',
+        ['action', sa.text('created_at DESC')]
+    )
+    op.create_index(
+        'ix_audit_logs_entity_created', 'audit_logs',
+        ['entity_type', sa.text('created_at DESC')]
+    )
+
+
+def downgrade() -> None:
+    """Supprimer les index composites."""
+    op.drop_index('ix_audit_logs_entity_created', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_action_created', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_user_created', table_name='audit_logs')
@@ -0,0 +1,46 @@
+"""Hash des requêtes du cache en BYTEA
+
+Revision ID: a3c41f5e8d27
+Revises: f79a9afd4cba
+Create Date: 2025-12-13 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c41f5e8d27'
+down_revision = 'f79a9afd4cba'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    query_cache.query_hash : digest SHA-256 brut (32 octets) au lieu de
+    l'hexadécimal (64 caractères).
+
+    - L'unicité reste assurée par la contrainte query_cache_query_hash_key
+    - idx_query_cache_hash devient un index hash (recherche L1 par égalité)
+    """
+    op.drop_index('idx_query_cache_hash', table_name='query_cache')
+    op.execute("""
+        ALTER TABLE query_cache
+        ALTER COLUMN query_hash TYPE BYTEA USING decode(query_hash, 'hex');
+    """)
+    op.execute("CREATE INDEX idx_query_cache_hash ON query_cache USING hash (query_hash);")
+
+
+def downgrade() -> None:
+    """Revenir au hash hexadécimal VARCHAR(64)."""
+    op.drop_index('idx_query_cache_hash', table_name='query_cache')
+    op.execute("""
+        ALTER TABLE query_cache
+        ALTER COLUMN query_hash TYPE VARCHAR(64) USING encode(query_hash, 'hex');
+    """)
+    op.create_index(
+        'idx_query_cache_hash',
+        'query_cache',
+        ['query_hash'],
+        unique=True
+    )
@@ -0,0 +1,55 @@
+"""Normalisation des embeddings du cache
+
+Revision ID: c58e2b71d0f4
+Revises: a3c41f5e8d27
+Create Date: 2025-12-14 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c58e2b71d0f4'
+down_revision = 'a3c41f5e8d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Ramène les query_embedding existants à une norme L2 de 1.
+
+    Les nouvelles entrées sont normalisées à l'écriture (save_to_cache) ;
+    les vecteurs vides ou de norme nulle sont laissés tels quels.
+    """
+    op.execute("""
+        WITH arrays AS MATERIALIZED (
+            SELECT id, query_embedding
+            FROM query_cache
+            WHERE query_embedding IS NOT NULL
+              AND jsonb_typeof(query_embedding) = 'array'
+        ),
+        normalized AS (
+            SELECT
+                a.id,
+                jsonb_agg(e.value::float8 / norms.norm ORDER BY e.ordinality) AS embedding
+            FROM arrays AS a
+            CROSS JOIN LATERAL (
+                SELECT sqrt(sum(x.value::float8 ^ 2)) AS norm
+                FROM jsonb_array_elements_text(a.query_embedding) AS x(value)
+            ) AS norms
+            CROSS JOIN LATERAL jsonb_array_elements_text(a.query_embedding)
+                WITH ORDINALITY AS e(value, ordinality)
+            WHERE norms.norm > 0
+            GROUP BY a.id
+        )
+        UPDATE query_cache AS qc
+        SET query_embedding = normalized.embedding
+        FROM normalized
+        WHERE qc.id = normalized.id;
+    """)
+
+
+def downgrade() -> None:
+    """Les normes d'origine ne sont pas conservées : rien à restaurer."""
+    pass
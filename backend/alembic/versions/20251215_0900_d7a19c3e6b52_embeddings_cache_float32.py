@@ -0,0 +1,64 @@
+"""Embeddings du cache en float32 binaire
+
+Revision ID: d7a19c3e6b52
+Revises: c58e2b71d0f4
+Create Date: 2025-12-15 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a19c3e6b52'
+down_revision = 'c58e2b71d0f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    query_cache.query_embedding : JSONB -> BYTEA (float32 big-endian,
+    4 octets par dimension, format de float4send).
+    """
+    op.execute("ALTER TABLE query_cache ADD COLUMN query_embedding_f32 BYTEA;")
+    op.execute("""
+        UPDATE query_cache AS qc
+        SET query_embedding_f32 = packed.embedding
+        FROM (
+            SELECT
+                q.id,
+                string_agg(float4send(e.value::float4), ''::bytea ORDER BY e.ordinality) AS embedding
+            FROM (
+                SELECT id, query_embedding
+                FROM query_cache
+                WHERE query_embedding IS NOT NULL
+                  AND jsonb_typeof(query_embedding) = 'array'
+            ) AS q
+            CROSS JOIN LATERAL jsonb_array_elements_text(q.query_embedding)
+                WITH ORDINALITY AS e(value, ordinality)
+            GROUP BY q.id
+        ) AS packed
+        WHERE qc.id = packed.id;
+    """)
+    op.execute("ALTER TABLE query_cache DROP COLUMN query_embedding;")
+    op.execute("ALTER TABLE query_cache RENAME COLUMN query_embedding_f32 TO query_embedding;")
+    op.execute("""
+        COMMENT ON COLUMN query_cache.query_embedding IS
+        'Embedding unitaire de la question (float32 big-endian) pour recherche par similarité';
+    """)
+
+
+def downgrade() -> None:
+    """
+    Revenir à JSONB.
+
+    Les embeddings binaires ne sont pas reconvertis : les entrées
+    existantes restent utilisables en L1 et sont ré-alimentées en L2 au
+    fil des nouvelles réponses.
+    """
+    op.execute("ALTER TABLE query_cache DROP COLUMN query_embedding;")
+    op.execute("""
+        ALTER TABLE query_cache ADD COLUMN query_embedding JSONB;
+        COMMENT ON COLUMN query_cache.query_embedding IS
+        'Vecteur embedding de la question pour recherche par similarité';
+    """)
@@ -0,0 +1,34 @@
+"""Index partiel des entrées de cache avec embedding
+
+Revision ID: e41b8f06a9c3
+Revises: d7a19c3e6b52
+Create Date: 2025-12-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41b8f06a9c3'
+down_revision = 'd7a19c3e6b52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Index partiel (expires_at, created_at) des entrées query_cache ayant un
+    embedding : filtre et signature (count, max(created_at)) du cache L2.
+    """
+    op.create_index(
+        'idx_query_cache_active_embedding',
+        'query_cache',
+        ['expires_at', 'created_at'],
+        postgresql_where=sa.text('query_embedding IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Supprimer l'index partiel."""
+    op.drop_index('idx_query_cache_active_embedding', table_name='query_cache')
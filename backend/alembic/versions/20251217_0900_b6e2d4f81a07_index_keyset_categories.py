@@ -0,0 +1,30 @@
+"""Index (name, id) pour la pagination par clé des catégories
+
+Revision ID: b6e2d4f81a07
+Revises: e41b8f06a9c3
+Create Date: 2025-12-17 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e2d4f81a07'
+down_revision = 'e41b8f06a9c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Index composite (name, id) sur categories.
+    
+    Sert l'ORDER BY name, id des listes et la condition de pagination par
+    clé (name, id) > (:last_name, :last_id) sans tri ni OFFSET.
+    """
+    op.create_index('ix_categories_name_id', 'categories', ['name', 'id'])
+
+
+def downgrade() -> None:
+    """Supprimer l'index composite."""
+    op.drop_index('ix_categories_name_id', table_name='categories')
@@ -0,0 +1,48 @@
+"""FK documents.category_id ON DELETE RESTRICT et index
+
+Revision ID: c3f7a9e25d14
+Revises: b6e2d4f81a07
+Create Date: 2025-12-18 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7a9e25d14'
+down_revision = 'b6e2d4f81a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    documents.category_id : FK ON DELETE RESTRICT et index.
+    
+    La suppression d'une catégorie contenant des documents est refusée par
+    la base elle-même ; l'index sert le test EXISTS de delete_category et
+    la jointure documents/catégories des statistiques.
+    """
+    op.drop_constraint('documents_category_id_fkey', 'documents', type_='foreignkey')
+    op.create_foreign_key(
+        'documents_category_id_fkey',
+        'documents',
+        'categories',
+        ['category_id'],
+        ['id'],
+        ondelete='RESTRICT'
+    )
+    op.create_index('ix_documents_category_id', 'documents', ['category_id'])
+
+
+def downgrade() -> None:
+    """Revenir à la FK sans action et supprimer l'index."""
+    op.drop_index('ix_documents_category_id', table_name='documents')
+    op.drop_constraint('documents_category_id_fkey', 'documents', type_='foreignkey')
+    op.create_foreign_key(
+        'documents_category_id_fkey',
+        'documents',
+        'categories',
+        ['category_id'],
+        ['id']
+    )
@@ -0,0 +1,35 @@
+"""Index trigram sur categories.name et categories.description
+
+Revision ID: a8d1c6f3b072
+Revises: c3f7a9e25d14
+Create Date: 2025-12-19 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d1c6f3b072'
+down_revision = 'c3f7a9e25d14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Index GIN trigram sur (name, description).
+    
+    Permet à la recherche des catégories (name ILIKE '%...%' OR
+    description ILIKE '%...%') d'utiliser un index (BitmapOr) au lieu
+    d'un parcours séquentiel de la table.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_categories_name_trgm
+        ON categories USING gin (name gin_trgm_ops, description gin_trgm_ops);
+    """)
+
+
+def downgrade() -> None:
+    """Supprimer l'index trigram (l'extension pg_trgm est conservée)."""
+    op.execute("DROP INDEX IF EXISTS ix_categories_name_trgm;")
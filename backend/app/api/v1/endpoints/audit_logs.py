@@ -37,6 +37,7 @@ from app.schemas.audit_log import (
     AVAILABLE_ACTIONS,
     AVAILABLE_ENTITY_TYPES,
 )
+from app.schemas.base import construct_from_attributes
 from app.services.audit_log_service import AuditLogService
 
 logger = logging.getLogger(__name__)
@@ -122,18 +123,13 @@ async def get_audit_logs(
         # Construction de la réponse
         items = []
         for log in logs:
-            # Informations utilisateur si disponibles
+            # Informations utilisateur si disponibles (données ORM de
+            # confiance : construction sans validation)
             user_info = None
             if log.user:
-                user_info = AuditLogUserInfo(
-                    id=log.user.id,
-                    matricule=log.user.matricule,
-                    nom=log.user.nom,
-                    prenom=log.user.prenom,
-                    email=log.user.email
-                )
+                user_info = construct_from_attributes(AuditLogUserInfo, log.user)
             
-            items.append(AuditLogResponse(
+            items.append(AuditLogResponse.model_construct(
                 id=log.id,
                 user_id=log.user_id,
                 action=log.action,
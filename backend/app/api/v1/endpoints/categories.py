@@ -30,6 +30,7 @@ async def get_categories(
     page: int = Query(1, ge=1, description="Numéro de page"),
     page_size: int = Query(20, ge=1, le=100, description="Taille de page"),
     search: Optional[str] = Query(None, description="Recherche dans nom et description"),
+    cursor: Optional[str] = Query(None, description="Curseur de pagination (remplace page)"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -39,6 +40,8 @@ async def get_categories(
     - **page**: Numéro de page (commence à 1)
     - **page_size**: Nombre d'éléments par page (max 100)
     - **search**: Terme de recherche optionnel
+    - **cursor**: Curseur `next_cursor` de la page précédente (pagination
+      par clé, à privilégier pour les pages profondes)
     
     Accessible à tous les utilisateurs authentifiés.
     """
@@ -49,18 +52,26 @@ async def get_categories(
         db=db,
         skip=skip,
         limit=page_size,
-        search=search
+        search=search,
+        cursor=cursor
     )
     
     # Calculate total pages
     total_pages = math.ceil(total / page_size) if total > 0 else 0
     
+    # Cursor of the next page (None on the last page)
+    next_cursor = None
+    if len(categories) == page_size:
+        last = categories[-1]
+        next_cursor = CategoryService.encode_cursor(last["name"], last["id"])
+    
     return CategoryListResponse(
         items=categories,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
@@ -15,13 +15,14 @@ Sprint 9 - Phase 1 : Recherche avancée, export, auto-archivage, stats feedbacks
 """
 
 import logging
-import json
 import csv
 import io
+from dataclasses import asdict, is_dataclass
 from typing import Optional
 from uuid import UUID
 from datetime import datetime, timedelta
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
@@ -32,7 +33,7 @@ from app.models.user import User
 from app.models.conversation import Conversation
 from app.models.message import Message
 from app.models.feedback import Feedback
-from app.schemas.message import ChatRequest
+from app.schemas.message import ChatRequest, encode_sse_event
 from app.schemas.conversation import (
     ConversationResponse,
     ConversationListResponse,
@@ -49,6 +50,7 @@ from app.schemas.feedback import (
     FeedbackTrendsResponse
 )
 from app.services.chat_service import get_chat_service
+from app.utils.serialization import dumps
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
@@ -101,13 +103,11 @@ async def chat_stream(
                 event_data = event.get("data", {})
                 
                 # Format SSE: chaque ligne doit commencer par "event:" ou "data:"
-                yield f"event: {event_type}\n"
-                yield f"data: {json.dumps(event_data, default=str)}\n\n"
+                yield encode_sse_event(event_type, event_data)
         
         except Exception as e:
             logger.error(f"Erreur streaming: {e}")
-            yield f"event: error\n"
-            yield f"data: {json.dumps({'error': str(e), 'code': 'STREAM_ERROR'})}\n\n"
+            yield encode_sse_event("error", {"error": str(e), "code": "STREAM_ERROR"})
     
     return StreamingResponse(
         event_generator(),
@@ -164,6 +164,8 @@ async def chat_sync(
     ):
         event_type = event.get("event")
         event_data = event.get("data", {})
+        if is_dataclass(event_data):
+            event_data = asdict(event_data)
         
         if event_type == "start":
             result["conversation_id"] = event_data.get("conversation_id")
@@ -493,7 +495,16 @@ async def get_conversation(
             detail="Conversation non trouvée"
         )
     
-    return result
+    # Sérialisation orjson : les sources brutes (JSONB) sont insérées sans décodage
+    messages = []
+    for message, sources_raw in zip(result["messages"], result["sources_raw"]):
+        data = message.model_dump()
+        if sources_raw is not None:
+            data["sources"] = orjson.Fragment(sources_raw)
+        messages.append(data)
+    
+    payload = {"conversation": result["conversation"], "messages": messages}
+    return Response(content=dumps(payload), media_type="application/json")
 
 
 @router.delete("/conversations/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -4,7 +4,7 @@ Endpoints API pour le dashboard manager.
 Accessible par les rôles Admin et Manager.
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Optional
@@ -69,14 +69,15 @@ async def get_manager_dashboard_stats(
     try:
         logger.info(f"📊 GET /manager/dashboard/stats - User: {current_user.matricule}")
         
-        stats = ManagerDashboardService.get_manager_stats(
+        stats = ManagerDashboardService.get_manager_stats_json(
             db,
             current_user.id,
             start_date,
             end_date
         )
         
-        return stats
+        # JSON pré-assemblé depuis les fragments en cache : pas de re-sérialisation
+        return Response(content=stats, media_type="application/json")
         
     except Exception as e:
         logger.error(f"❌ Erreur récupération stats manager: {str(e)}")
@@ -140,7 +140,7 @@ async def mark_notification_as_read(
         priority=notification.priority,
         title=notification.title,
         message=notification.message,
-        data=notification.data or {},
+        data=notification.data or None,
         is_read=notification.is_read,
         is_dismissed=notification.is_dismissed,
         created_at=notification.created_at,
@@ -209,7 +209,7 @@ async def dismiss_notification(
         priority=notification.priority,
         title=notification.title,
         message=notification.message,
-        data=notification.data or {},
+        data=notification.data or None,
         is_read=notification.is_read,
         is_dismissed=notification.is_dismissed,
         created_at=notification.created_at,
@@ -689,7 +689,7 @@ async def create_notification_admin(
         priority=notification.priority,
         title=notification.title,
         message=notification.message,
-        data=notification.data or {},
+        data=notification.data or None,
         is_read=notification.is_read,
         is_dismissed=notification.is_dismissed,
         created_at=notification.created_at,
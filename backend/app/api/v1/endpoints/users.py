@@ -20,6 +20,7 @@ from app.schemas.user import (
     UserImportResult,
     UserStatsResponse
 )
+from app.schemas.base import construct_from_attributes
 from app.services import UserService
 from app.models.user import User, UserRole
 
@@ -227,7 +228,7 @@ async def get_users(
     page = (skip // limit) + 1
     
     return UserListResponse(
-        users=[UserResponse.model_validate(user) for user in users],
+        users=[construct_from_attributes(UserResponse, user) for user in users],
         total=total,
         page=page,
         page_size=limit,
@@ -1,7 +1,7 @@
 """Module de sécurité pour authentification et gestion des tokens JWT."""
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Iterable, Optional
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 import re
@@ -14,6 +14,10 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # Configuration JWT
 ALGORITHM = "HS256"
 
+# Clé de signature construite une seule fois (jose la reconstruirait
+# à chaque encode/decode à partir de la chaîne SECRET_KEY)
+_SIGNING_KEY = jwk.construct(settings.SECRET_KEY, ALGORITHM)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -96,7 +100,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     
     return encoded_jwt
 
@@ -114,33 +118,51 @@ def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     
     return encoded_jwt
 
 
-def decode_token(token: str) -> dict:
+def decode_token(
+    token: str,
+    required_claims: Iterable[str] = (),
+    expected_type: Optional[str] = None
+) -> dict:
     """
     Décode et valide un token JWT.
     
+    Les claims standards requis (sub, exp, ...) sont vérifiés par jose
+    pendant le décodage ; le type est contrôlé dans la même passe.
+    
     Args:
         token: Token JWT à décoder
+        required_claims: Claims standards obligatoires (ex: ("sub", "exp"))
+        expected_type: Type attendu ("access" ou "refresh"), non vérifié si None
         
     Returns:
         dict: Payload du token
         
     Raises:
-        HTTPException: Si le token est invalide ou expiré
+        HTTPException: Si le token est invalide, expiré ou du mauvais type
     """
+    options = {f"require_{claim}": True for claim in required_claims}
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=[ALGORITHM], options=options)
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token invalide ou expiré",
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
+    
+    if expected_type is not None and payload.get("type") != expected_type:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Type de token invalide",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return payload
 
 
 def verify_token_type(payload: dict, expected_type: str) -> bool:
@@ -1,7 +1,9 @@
 """Database session configuration."""
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.utils.serialization import dumps_db_json
 
 # Create database engine
 engine = create_engine(
@@ -10,6 +12,9 @@ engine = create_engine(
     pool_size=10,
     max_overflow=20,
     echo=settings.DEBUG,
+    # Colonnes JSON/JSONB (audit_logs.details, ...) encodées/décodées par orjson
+    json_serializer=dumps_db_json,
+    json_deserializer=orjson.loads,
 )
 
 # Create session factory
@@ -4,6 +4,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.schemas.base import build_deferred_schemas
+from app.services.token_usage_service import TokenUsageService
 import logging
 
 # SPRINT 13 - Monitoring : Import des middlewares de métriques
@@ -62,6 +64,10 @@ async def startup_event():
     logger.info(f"Starting {settings.APP_NAME} in {settings.APP_ENV} mode")
     logger.info("API v1 routes mounted at /v1")
     
+    # Construire les schemas de réponse différés avant le premier appel
+    built_schemas = build_deferred_schemas()
+    logger.info(f"{built_schemas} schemas Pydantic construits")
+    
     # SPRINT 13 - Monitoring : Initialize Prometheus metrics
     logger.info("Initializing Prometheus metrics...")
     initialize_metrics()
@@ -73,6 +79,9 @@ async def startup_event():
 async def shutdown_event():
     """Run on application shutdown."""
     logger.info(f"Shutting down {settings.APP_NAME}")
+    
+    # Insérer les TokenUsage encore en tampon
+    TokenUsageService.flush()
 
 
 @app.get("/health")
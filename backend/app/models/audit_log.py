@@ -1,5 +1,5 @@
 """Audit log model."""
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -12,6 +12,8 @@ class AuditLog(Base):
     """Audit log model for tracking user actions."""
     
     __tablename__ = "audit_logs"
+    # Table partitionnée par mois sur created_at (migration f2eed936ec18,
+    # clé primaire (id, created_at) côté PostgreSQL)
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -35,5 +37,12 @@ class AuditLog(Base):
     # Relationships
     user = relationship("User", back_populates="audit_logs")
     
+    # Index composites pour les listes « N derniers » filtrées
+    __table_args__ = (
+        Index('ix_audit_logs_user_created', 'user_id', created_at.desc()),
+        Index('ix_audit_logs_action_created', 'action', created_at.desc()),
+        Index('ix_audit_logs_entity_created', 'entity_type', created_at.desc()),
+    )
+    
     def __repr__(self):
         return f"<AuditLog {self.action} by User {self.user_id}>"
\ No newline at end of file
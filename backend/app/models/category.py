@@ -1,5 +1,5 @@
 """Category model."""
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -32,5 +32,10 @@ class Category(Base):
     creator = relationship("User", foreign_keys=[created_by])
     documents = relationship("Document", back_populates="category")
     
+    __table_args__ = (
+        # Keyset pagination of the listings (ORDER BY name, id)
+        Index('ix_categories_name_id', 'name', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Category {self.name}>"
\ No newline at end of file
@@ -12,19 +12,22 @@ Sprint 6 - Phase 1 : Modèles Cache
 
 import uuid
 from datetime import datetime, timedelta
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict, Iterable
 
 from sqlalchemy import (
     Column,
-    String,
+    LargeBinary,
     Text,
     Integer,
     DateTime,
     Numeric,
-    Index
+    Index,
+    column,
+    text,
+    values
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, relationship
 
 from app.db.session import Base
 
@@ -39,8 +42,8 @@ class QueryCache(Base):
     Attributes:
         id: Identifiant unique (UUID)
         query_text: Texte original de la question
-        query_hash: Hash SHA-256 de la question (pour correspondance exacte)
-        query_embedding: Vecteur embedding de la question (pour similarité)
+        query_hash: Digest SHA-256 de la question (pour correspondance exacte)
+        query_embedding: Embedding unitaire float32 de la question (pour similarité)
         response: Réponse générée par le LLM
         sources: Liste des sources utilisées (documents, pages, chunks)
         token_count: Nombre de tokens de la réponse
@@ -71,17 +74,16 @@ class QueryCache(Base):
     )
     
     query_hash = Column(
-        String(64),
+        LargeBinary(32),
         nullable=False,
         unique=True,
-        index=True,
-        comment="Hash SHA-256 de la question pour correspondance exacte"
+        comment="Digest SHA-256 (32 octets) de la question pour correspondance exacte"
     )
     
     query_embedding = Column(
-        JSONB,
+        LargeBinary,
         nullable=True,
-        comment="Vecteur embedding de la question pour recherche par similarité"
+        comment="Embedding unitaire de la question (float32 big-endian) pour recherche par similarité"
     )
     
     # Données de la réponse
@@ -169,10 +171,18 @@ class QueryCache(Base):
     
     # Index composites pour optimisation
     __table_args__ = (
-        # Index pour la recherche par hash (cache L1)
-        Index("idx_query_cache_hash", "query_hash"),
+        # Index hash pour la recherche par égalité (cache L1)
+        Index("idx_query_cache_hash", "query_hash", postgresql_using="hash"),
         # Index pour le nettoyage des caches expirés
         Index("idx_query_cache_expires_at", "expires_at"),
+        # Index partiel des entrées avec embedding (cache L2) : signature
+        # count/max(created_at) des entrées actives en index-only scan
+        Index(
+            "idx_query_cache_active_embedding",
+            "expires_at",
+            "created_at",
+            postgresql_where=text("query_embedding IS NOT NULL")
+        ),
         # Index pour les statistiques
         Index("idx_query_cache_created_at", "created_at"),
         {
@@ -189,10 +199,46 @@ class QueryCache(Base):
         """Vérifie si le cache est expiré."""
         return datetime.utcnow() > self.expires_at if self.expires_at else True
     
-    def increment_hit(self) -> None:
-        """Incrémente le compteur de hits et met à jour last_hit_at."""
-        self.hit_count += 1
-        self.last_hit_at = datetime.utcnow()
+    @classmethod
+    def register_hits(cls, db: Session, hits: Iterable[Dict[str, Any]]) -> None:
+        """
+        Enregistre des hits en un seul UPDATE atomique, sans charger les lignes.
+        
+        hit_count est incrémenté côté SQL (hit_count = hit_count + n) : pas
+        de lecture-modification-écriture, donc pas de hit perdu entre
+        processus concurrents. Pas de commit.
+        
+        Args:
+            db: Session de base de données
+            hits: Dicts id, hits (nombre), last_hit_at, expires_at
+                  (une entrée par id de cache)
+        """
+        rows = [
+            (hit["id"], hit["hits"], hit["last_hit_at"], hit["expires_at"])
+            for hit in hits
+        ]
+        if not rows:
+            return
+        
+        table = cls.__table__
+        batch = values(
+            column("id", UUID(as_uuid=True)),
+            column("hits", Integer),
+            column("last_hit_at", DateTime(timezone=True)),
+            column("expires_at", DateTime(timezone=True)),
+            name="hits"
+        ).data(rows)
+        
+        db.execute(
+            table.update()
+            .where(table.c.id == batch.c.id)
+            .values(
+                hit_count=table.c.hit_count + batch.c.hits,
+                last_hit_at=batch.c.last_hit_at,
+                expires_at=batch.c.expires_at,
+                updated_at=batch.c.last_hit_at
+            )
+        )
     
     def reset_ttl(self, days: int = 7) -> None:
         """Réinitialise le TTL du cache."""
@@ -208,7 +254,7 @@ class QueryCache(Base):
         return {
             "id": str(self.id),
             "query_text": self.query_text,
-            "query_hash": self.query_hash,
+            "query_hash": self.query_hash.hex() if self.query_hash else None,
             "response": self.response,
             "sources": self.sources,
             "token_count": self.token_count,
@@ -29,6 +29,7 @@ from app.rag.prompts import (
     ChunkForPrompt,
     HistoryMessage
 )
+from app.schemas.message import MessageHistoryTuple
 
 logger = logging.getLogger(__name__)
 
@@ -351,24 +352,21 @@ class LLMGenerator:
     
     def _convert_history(
         self, 
-        history: Optional[List[Dict[str, str]]]
+        history: Optional[List[MessageHistoryTuple]]
     ) -> Optional[List[HistoryMessage]]:
-        """Convertit l'historique dict en HistoryMessage."""
+        """Convertit l'historique (rôle, contenu) en HistoryMessage."""
         if not history:
             return None
         return [
-            HistoryMessage(
-                role=h.get("role", "user"),
-                content=h.get("content", "")
-            )
-            for h in history
+            HistoryMessage(role=role, content=content)
+            for role, content in history
         ]
     
     async def generate_streaming(
         self,
         query: str,
         chunks: List[Dict[str, Any]],
-        history: Optional[List[Dict[str, str]]] = None,
+        history: Optional[List[MessageHistoryTuple]] = None,
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None
@@ -520,7 +518,7 @@ class LLMGenerator:
         self,
         query: str,
         chunks: List[Dict[str, Any]],
-        history: Optional[List[Dict[str, str]]] = None,
+        history: Optional[List[MessageHistoryTuple]] = None,
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None
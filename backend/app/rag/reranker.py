@@ -472,8 +472,9 @@ Format attendu :
             db: Session DB
         """
         try:
-            from app.models.token_usage import TokenUsage, OperationType
+            from app.models.token_usage import OperationType
             from app.services.exchange_rate_service import ExchangeRateService
+            from app.services.token_usage_service import TokenUsageService
             
             # Récupérer le taux de change
             exchange_rate = ExchangeRateService.get_current_rate(db, "USD", "XAF")
@@ -501,7 +502,8 @@ Format attendu :
             cost_usd = costs["cost_total"]
             cost_xaf = cost_usd * float(exchange_rate)
             
-            usage = TokenUsage(
+            # Insertion groupée (tampon TokenUsageService)
+            TokenUsageService.enqueue(
                 operation_type=OperationType.RERANKING,
                 model_name=model_name,
                 token_count_input=token_count_input,
@@ -514,8 +516,6 @@ Format attendu :
                 message_id=None,  # Pas de message associé
                 document_id=None
             )
-            db.add(usage)
-            db.commit()
             
             logger.info(
                 f"Reranking tokens tracked: {token_count_total} tokens, "
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Configuration Pydantic partagée par les schemas.
+
+RESPONSE_CONFIG est appliquée aux schemas de réponse (*Response) :
+- defer_build : le core schema est construit au premier usage et non à
+  l'import (démarrage de FastAPI plus rapide)
+- revalidate_instances='never' : les sous-modèles déjà validés (ex:
+  SourceReference, FeedbackResponse) ne sont pas revalidés récursivement
+
+SlimModel est la base des petits schemas feuilles alloués en grand nombre
+(items de timeline, répartitions par catégorie, ...).
+
+construct_from_attributes construit un schema depuis un objet ORM de
+confiance sans validation (listes paginées).
+
+build_deferred_schemas construit au démarrage de l'API les schemas
+différés, pour que la première requête ne paie pas ce coût.
+"""
+
+from typing import Any, Type, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+RESPONSE_CONFIG = ConfigDict(
+    from_attributes=True,
+    defer_build=True,
+    revalidate_instances="never",
+    populate_by_name=True,
+)
+
+
+class SlimModel(BaseModel):
+    """
+    Base des petits schemas immuables.
+    
+    frozen + extra='forbid' : aucune donnée supplémentaire n'est conservée
+    par instance et les instances sont hashables/partageables.
+    """
+    
+    model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
+
+
+def construct_from_attributes(model: Type[ModelT], obj: Any) -> ModelT:
+    """
+    Construit un schema depuis les attributs d'un objet sans validation.
+    
+    À réserver aux données de confiance (lignes ORM déjà conformes au
+    schema) et aux schemas sans sous-modèle à convertir.
+    
+    Args:
+        model: Classe du schema
+        obj: Objet source (ex: instance ORM)
+        
+    Returns:
+        Instance du schema
+    """
+    return model.model_construct(
+        **{name: getattr(obj, name) for name in model.model_fields}
+    )
+
+
+def build_deferred_schemas() -> int:
+    """
+    Construit les schemas app.schemas encore différés (defer_build).
+    
+    Returns:
+        Nombre de schemas construits
+    """
+    built = 0
+    pending = list(BaseModel.__subclasses__())
+    while pending:
+        model = pending.pop()
+        pending.extend(model.__subclasses__())
+        if model.__module__.startswith("app.schemas") and not model.__pydantic_complete__:
+            # Références non résolues : construction laissée au premier usage
+            if model.model_rebuild(raise_errors=False):
+                built += 1
+    return built
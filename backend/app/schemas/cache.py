@@ -112,6 +112,12 @@ class QueryCacheResponse(QueryCacheBase):
         """Sérialise les datetime en ISO + Z."""
         return dt.isoformat() + 'Z' if dt else None
     
+    @field_validator('query_hash', mode='before')
+    @classmethod
+    def hash_to_hex(cls, v):
+        """Convertit le digest BYTEA en hexadécimal."""
+        return v.hex() if isinstance(v, (bytes, memoryview)) else v
+    
     @field_validator('is_expired', mode='before')
     @classmethod
     def check_expired(cls, v, info):
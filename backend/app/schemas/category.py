@@ -122,6 +122,7 @@ class CategoryListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = Field(None, description="Curseur de la page suivante")
     
     class Config:
         from_attributes = True
\ No newline at end of file
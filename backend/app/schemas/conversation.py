@@ -15,6 +15,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict, field_serializer
 
+from app.schemas.base import RESPONSE_CONFIG
+
 
 # =============================================================================
 # SCHEMAS DE BASE
@@ -78,7 +80,7 @@ class ConversationArchive(BaseModel):
 class ConversationResponse(BaseModel):
     """Schema de réponse pour une conversation."""
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = RESPONSE_CONFIG
     
     id: UUID
     user_id: UUID
@@ -107,6 +109,8 @@ class ConversationResponse(BaseModel):
 class ConversationListResponse(BaseModel):
     """Schema de réponse pour une liste de conversations."""
     
+    model_config = RESPONSE_CONFIG
+    
     conversations: List[ConversationResponse]
     total: int
     page: int
@@ -140,6 +144,8 @@ class ConversationSummary(BaseModel):
 class ConversationSummaryListResponse(BaseModel):
     """Schema de réponse pour une liste de résumés de conversations."""
     
+    model_config = RESPONSE_CONFIG
+    
     conversations: List[ConversationSummary]
     total: int
     page: int
@@ -262,6 +268,8 @@ class ConversationExportData(BaseModel):
 class AutoArchiveResponse(BaseModel):
     """Schema de réponse pour l'auto-archivage."""
     
+    model_config = RESPONSE_CONFIG
+    
     archived_count: int = Field(
         ...,
         description="Nombre de conversations archivées automatiquement"
@@ -16,6 +16,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from app.schemas.base import RESPONSE_CONFIG
+
 
 # =============================================================================
 # SCHEMAS USERS STATS
@@ -154,6 +156,7 @@ class TopDocument(BaseModel):
 
 class TopDocumentsResponse(BaseModel):
     """Réponse top documents."""
+    model_config = RESPONSE_CONFIG
     documents: List[TopDocument]
     total: int = Field(..., description="Nombre total retourné")
 
@@ -171,6 +174,7 @@ class ActivityDay(BaseModel):
 
 class ActivityTimelineResponse(BaseModel):
     """Réponse timeline d'activité."""
+    model_config = RESPONSE_CONFIG
     timeline: List[ActivityDay]
     days: int = Field(..., description="Nombre de jours analysés")
 
@@ -189,5 +193,6 @@ class UserActivity(BaseModel):
 
 class UserActivityResponse(BaseModel):
     """Réponse activité utilisateurs."""
+    model_config = RESPONSE_CONFIG
     users: List[UserActivity]
     total: int = Field(..., description="Nombre d'utilisateurs retournés")
\ No newline at end of file
@@ -8,6 +8,8 @@ from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List, Dict
 from datetime import datetime
 
+from app.schemas.base import RESPONSE_CONFIG, SlimModel
+
 
 class ManagerDocumentStats(BaseModel):
     """Statistiques des documents du manager."""
@@ -47,7 +49,7 @@ class ManagerMessageStats(BaseModel):
     )
 
 
-class DocumentByCategory(BaseModel):
+class DocumentByCategory(SlimModel):
     """Nombre de documents par catégorie."""
     
     category: str = Field(..., description="Nom de la catégorie")
@@ -64,7 +66,7 @@ class DocumentByCategory(BaseModel):
     )
 
 
-class DateRange(BaseModel):
+class DateRange(SlimModel):
     """Plage de dates pour les statistiques."""
     
     start: str = Field(..., description="Date de début au format ISO")
@@ -89,7 +91,7 @@ class ManagerDashboardOverviewResponse(BaseModel):
     date_range: DateRange
     
     model_config = ConfigDict(
-        from_attributes=True,
+        **RESPONSE_CONFIG,
         json_schema_extra={
             "example": {
                 "documents": {
@@ -148,7 +150,7 @@ class ManagerTopDocumentsResponse(BaseModel):
     documents: List[ManagerTopDocument]
     
     model_config = ConfigDict(
-        from_attributes=True,
+        **RESPONSE_CONFIG,
         json_schema_extra={
             "example": {
                 "documents": [
@@ -166,7 +168,7 @@ class ManagerTopDocumentsResponse(BaseModel):
     )
 
 
-class DocumentTimelineItem(BaseModel):
+class DocumentTimelineItem(SlimModel):
     """Item de la timeline des documents."""
     
     date: Optional[str] = Field(None, description="Date au format ISO")
@@ -189,7 +191,7 @@ class ManagerDocumentsTimelineResponse(BaseModel):
     timeline: List[DocumentTimelineItem]
     
     model_config = ConfigDict(
-        from_attributes=True,
+        **RESPONSE_CONFIG,
         json_schema_extra={
             "example": {
                 "timeline": [
@@ -9,12 +9,17 @@ Sprint 7 - Phase 2 : Schemas Messages
 CORRECTION Sprint 9 : Ajout import réel FeedbackResponse et model_rebuild()
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal, Tuple
 from uuid import UUID
 from enum import Enum
 
-from pydantic import BaseModel, Field, ConfigDict, field_serializer
+import orjson
+from pydantic import BaseModel, Field, field_serializer
+
+from app.schemas.base import RESPONSE_CONFIG, SlimModel
+from app.utils.serialization import dumps
 
 
 
@@ -35,7 +40,7 @@ class MessageRoleEnum(str, Enum):
 class SourceReference(BaseModel):
     """Référence à une source citée dans la réponse."""
     
-    document_id: str = Field(..., description="ID du document source")
+    document_id: UUID = Field(..., description="ID du document source")
     title: str = Field(..., description="Titre du document")
     category: Optional[str] = Field(default=None, description="Catégorie du document")
     page: Optional[int] = Field(default=None, description="Numéro de page")
@@ -115,7 +120,7 @@ class MessageCreateInternal(BaseModel):
 class MessageResponse(BaseModel):
     """Schema de réponse pour un message."""
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = RESPONSE_CONFIG
     
     id: UUID
     conversation_id: UUID
@@ -174,6 +179,8 @@ class MessageResponse(BaseModel):
 class MessageListResponse(BaseModel):
     """Schema de réponse pour une liste de messages."""
     
+    model_config = RESPONSE_CONFIG
+    
     messages: List[MessageResponse]
     total: int
     conversation_id: UUID
@@ -231,6 +238,8 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     """Schema de réponse pour une requête de chat (non-streamée)."""
     
+    model_config = RESPONSE_CONFIG
+    
     conversation_id: UUID
     message_id: UUID
     content: str
@@ -244,33 +253,40 @@ class ChatResponse(BaseModel):
     model_used: str
 
 
-class ChatStreamStartEvent(BaseModel):
+# Les événements de streaming sont construits à chaque token émis par le LLM :
+# des dataclasses slottées (sérialisées par orjson) évitent le coût de
+# construction/validation d'un BaseModel Pydantic par token.
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ChatStreamStartEvent:
     """Événement de début de streaming."""
     
-    event: str = "start"
     conversation_id: UUID
     message_id: UUID
     is_new_conversation: bool = False
+    event: str = "start"
 
 
-class ChatStreamTokenEvent(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ChatStreamTokenEvent:
     """Événement de token streamé."""
     
-    event: str = "token"
     content: str
+    event: str = "token"
 
 
-class ChatStreamSourcesEvent(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ChatStreamSourcesEvent:
     """Événement avec les sources."""
     
-    event: str = "sources"
     sources: List[SourceReference]
+    event: str = "sources"
 
 
-class ChatStreamMetadataEvent(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ChatStreamMetadataEvent:
     """Événement avec les métadonnées finales."""
     
-    event: str = "metadata"
     token_count_input: int
     token_count_output: int
     cost_usd: float
@@ -278,34 +294,65 @@ class ChatStreamMetadataEvent(BaseModel):
     cache_hit: bool
     response_time_seconds: float
     model_used: str
+    event: str = "metadata"
 
 
-class ChatStreamEndEvent(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ChatStreamEndEvent:
     """Événement de fin de streaming."""
     
-    event: str = "done"
     message_id: UUID
+    event: str = "done"
 
 
-class ChatStreamErrorEvent(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ChatStreamErrorEvent:
     """Événement d'erreur."""
     
-    event: str = "error"
     error: str
     code: Optional[str] = None
+    event: str = "error"
+
+
+_SSE_TOKEN_PREFIX = b'event: token\ndata: {"content":'
+_SSE_TOKEN_SUFFIX = b',"event":"token"}\n\n'
+
+
+def encode_sse_event(event_type: str, data: Any) -> bytes:
+    """
+    Encode un événement au format SSE (``event:`` + ``data:``).
+    
+    Les tokens (événement le plus fréquent) passent par un chemin rapide
+    qui ne sérialise que le contenu textuel.
+    
+    Args:
+        event_type: Type d'événement SSE
+        data: Événement de streaming ou dict sérialisable
+    
+    Returns:
+        Trame SSE encodée en UTF-8
+    """
+    if type(data) is ChatStreamTokenEvent:
+        return _SSE_TOKEN_PREFIX + orjson.dumps(data.content) + _SSE_TOKEN_SUFFIX
+    return b"event: " + event_type.encode() + b"\ndata: " + dumps(data) + b"\n\n"
 
 
 # =============================================================================
 # SCHEMAS POUR L'HISTORIQUE
 # =============================================================================
 
-class MessageHistoryItem(BaseModel):
+class MessageHistoryItem(SlimModel):
     """Item d'historique pour le contexte LLM."""
     
     role: MessageRoleEnum
     content: str
 
 
+# Format interne de l'historique transmis au LLM : (rôle, contenu).
+# Les modèles Pydantic ci-dessus ne servent qu'à la validation/OpenAPI.
+MessageHistoryTuple = Tuple[Literal["USER", "ASSISTANT"], str]
+
+
 class ConversationHistory(BaseModel):
     """Historique de conversation pour le contexte LLM."""
     
@@ -11,6 +11,8 @@ from enum import Enum
 
 from pydantic import BaseModel, Field, ConfigDict, field_serializer
 
+from app.schemas.base import RESPONSE_CONFIG, SlimModel
+
 
 # ==============================================================================
 # ENUMS
@@ -54,7 +56,7 @@ class NotificationBase(BaseModel):
     priority: NotificationPriority = NotificationPriority.MEDIUM
     title: str = Field(..., min_length=1, max_length=200)
     message: Optional[str] = None
-    data: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    data: Optional[Dict[str, Any]] = None
 
 
 class NotificationCreate(NotificationBase):
@@ -81,7 +83,7 @@ class NotificationResponse(NotificationBase):
     icon: str
     color: str
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = RESPONSE_CONFIG
     
     @field_serializer('created_at', 'read_at', 'expires_at')
     def serialize_datetime(self, dt: Optional[datetime]) -> Optional[str]:
@@ -91,6 +93,7 @@ class NotificationResponse(NotificationBase):
 
 class NotificationListResponse(BaseModel):
     """Réponse paginée des notifications."""
+    model_config = RESPONSE_CONFIG
     items: List[NotificationResponse]
     total: int
     unread_count: int
@@ -141,7 +144,13 @@ class FeedbackEvent(BaseModel):
 
 
 class DashboardStatsEvent(BaseModel):
-    """Événement SSE pour les statistiques dashboard."""
+    """
+    Événement SSE pour les statistiques dashboard.
+    
+    Schéma de documentation uniquement : la diffusion passe par
+    `SSEConnectionManager.broadcast_dashboard_update`, qui sérialise
+    les stats une seule fois pour toutes les connexions.
+    """
     total_users: int
     total_documents: int
     total_conversations: int
@@ -167,8 +176,9 @@ class NotificationBulkAction(BaseModel):
     action: str = Field(..., pattern="^(read|dismiss|delete)$")
 
 
-class NotificationBulkResponse(BaseModel):
+class NotificationBulkResponse(SlimModel):
     """Réponse pour les actions en masse."""
+    model_config = RESPONSE_CONFIG
     success: bool
     affected_count: int
     message: str
@@ -15,6 +15,16 @@ class OperationType(str, Enum):
     OCR = "OCR"
 
 
+def _isoformat_utc(dt: datetime) -> str:
+    """
+    Formate un datetime naïf (UTC) en ISO + Z.
+    
+    isoformat() est implémenté en C : plus rapide qu'un formatage manuel
+    (f-string ou strftime) champ par champ.
+    """
+    return dt.isoformat() + 'Z'
+
+
 # ============== Base Schemas ==============
 
 class TokenUsageBase(BaseModel):
@@ -27,6 +37,9 @@ class TokenUsageBase(BaseModel):
     cost_usd: float = Field(..., ge=0)
     cost_xaf: float = Field(..., ge=0)
     exchange_rate: float = Field(..., gt=0)
+    
+    # operation_type conservé sous forme de str (pas d'instance d'Enum créée)
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class TokenUsageCreate(TokenUsageBase):
@@ -46,10 +59,10 @@ class TokenUsageResponse(TokenUsageBase):
     token_metadata: Optional[dict[str, Any]] = None
     created_at: datetime
     
-    @field_serializer('created_at')
-    def serialize_datetime(self, dt: Optional[datetime]) -> Optional[str]:
+    @field_serializer('created_at', when_used='unless-none')
+    def serialize_datetime(self, dt: datetime) -> str:
         """Sérialise les datetime en ISO + Z."""
-        return dt.isoformat() + 'Z' if dt else None
+        return _isoformat_utc(dt)
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -90,10 +103,10 @@ class TokenUsageByDate(BaseModel):
     total_cost_xaf: float
     count: int
     
-    @field_serializer('date')
-    def serialize_datetime(self, dt: Optional[datetime]) -> Optional[str]:
+    @field_serializer('date', when_used='unless-none')
+    def serialize_datetime(self, dt: datetime) -> str:
         """Sérialise les datetime en ISO + Z."""
-        return dt.isoformat() + 'Z' if dt else None
+        return _isoformat_utc(dt)
 
 
 class TokenUsageStats(BaseModel):
@@ -124,4 +137,5 @@ class TokenUsageList(BaseModel):
     total: int
     page: int
     size: int
-    pages: int
\ No newline at end of file
+    pages: int
+
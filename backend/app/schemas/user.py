@@ -1,5 +1,5 @@
 """Schémas Pydantic pour la gestion des utilisateurs et l'authentification."""
-from pydantic import BaseModel, EmailStr, Field, field_validator, field_serializer
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, field_validator, field_serializer
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
@@ -7,6 +7,33 @@ from uuid import UUID
 from app.models.user import UserRole
 
 
+BEAC_EMAIL_DOMAIN = "@beac.int"
+
+
+def _validate_beac_email(v: str) -> str:
+    """
+    Valide que l'email appartient au domaine @beac.int et le normalise.
+    
+    Seul le suffixe est comparé sans casse (pas de copie minuscule
+    intermédiaire de l'adresse complète).
+    
+    Args:
+        v: Adresse email à valider
+        
+    Returns:
+        str: Email normalisé en minuscules
+        
+    Raises:
+        ValueError: Si le domaine n'est pas @beac.int
+    """
+    if len(v) <= len(BEAC_EMAIL_DOMAIN) or v[-len(BEAC_EMAIL_DOMAIN):].lower() != BEAC_EMAIL_DOMAIN:
+        raise ValueError(
+            "L'adresse email doit appartenir au domaine @beac.int. "
+            f"Email fourni: {v}"
+        )
+    return v.lower()
+
+
 # ============================================================================
 # SCHÉMAS BASE
 # ============================================================================
@@ -36,12 +63,7 @@ class UserBase(BaseModel):
         Raises:
             ValueError: Si le domaine n'est pas @beac.int
         """
-        if not v.lower().endswith("@beac.int"):
-            raise ValueError(
-                "L'adresse email doit appartenir au domaine @beac.int. "
-                f"Email fourni: {v}"
-            )
-        return v.lower()  # Normaliser en minuscules
+        return _validate_beac_email(v)
 
 
 # ============================================================================
@@ -78,12 +100,7 @@ class UserUpdate(BaseModel):
     @classmethod
     def validate_email_domain(cls, v: Optional[str]) -> Optional[str]:
         """Valide que l'email appartient au domaine @beac.int."""
-        if v is not None and not v.lower().endswith("@beac.int"):
-            raise ValueError(
-                "L'adresse email doit appartenir au domaine @beac.int. "
-                f"Email fourni: {v}"
-            )
-        return v.lower() if v else None
+        return _validate_beac_email(v) if v else None
 
 
 class UserImportRow(BaseModel):
@@ -100,12 +117,7 @@ class UserImportRow(BaseModel):
     @classmethod
     def validate_email_domain(cls, v: str) -> str:
         """Valide que l'email appartient au domaine @beac.int."""
-        if not v.lower().endswith("@beac.int"):
-            raise ValueError(
-                "L'adresse email doit appartenir au domaine @beac.int. "
-                f"Email fourni: {v}"
-            )
-        return v.lower()
+        return _validate_beac_email(v)
     
     @field_validator("role")
     @classmethod
@@ -117,6 +129,11 @@ class UserImportRow(BaseModel):
         return v
 
 
+# Validation d'un fichier d'import complet en un seul appel pydantic-core
+# (rôle normalisé en amont, force du mot de passe vérifiée par UserCreate)
+USER_IMPORT_ADAPTER = TypeAdapter(list[UserCreate])
+
+
 # ============================================================================
 # SCHÉMAS RÉPONSE
 # ============================================================================
@@ -130,10 +147,10 @@ class UserResponse(UserBase):
     updated_at: datetime
     last_login: Optional[datetime] = None
     
-    @field_serializer('created_at', 'updated_at', 'last_login')
-    def serialize_datetime(self, dt: Optional[datetime]) -> Optional[str]:
-        """Sérialise les datetime en ISO + Z."""
-        return dt.isoformat() + 'Z' if dt else None
+    @field_serializer('created_at', 'updated_at', 'last_login', when_used='unless-none')
+    def serialize_datetime(self, dt: datetime) -> str:
+        """Sérialise les datetime en ISO + Z (None sérialisé par pydantic-core)."""
+        return dt.isoformat() + 'Z'
     
     class Config:
         from_attributes = True
@@ -227,12 +244,7 @@ class ProfileUpdateRequest(BaseModel):
     @classmethod
     def validate_email_domain(cls, v: Optional[str]) -> Optional[str]:
         """Valide que l'email appartient au domaine @beac.int."""
-        if v is not None and not v.lower().endswith("@beac.int"):
-            raise ValueError(
-                "L'adresse email doit appartenir au domaine @beac.int. "
-                f"Email fourni: {v}"
-            )
-        return v.lower() if v else None
+        return _validate_beac_email(v) if v else None
 
 
 class ForgotPasswordRequest(BaseModel):
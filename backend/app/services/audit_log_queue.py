@@ -0,0 +1,161 @@
+"""
+File d'attente des écritures de logs d'audit.
+
+Les logs d'audit du chemin d'authentification (connexion, profil,
+réinitialisation) ne sont plus commités dans la requête : ils sont mis en
+file et insérés par lots (INSERT multi-lignes via SQLAlchemy Core) par un
+BatchWriter (voir batch_writer.py pour le déclenchement des lots et la
+backpressure). Si un lot est rejeté, ses lignes sont réinsérées une à une.
+
+Les logs d'une modification (connexion réussie, profil) passent par
+enqueue_after_commit : ils ne sont mis en file qu'une fois la transaction
+de l'appelant commitée.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.audit_log import AuditLog
+from app.services.batch_writer import BatchWriter
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Taille maximale d'un lot inséré
+FLUSH_MAX_ROWS = 100
+
+# Attente maximale avant l'insertion d'un lot incomplet (secondes)
+FLUSH_INTERVAL_SECONDS = 1.0
+
+# Au-delà, les lignes sont écrites de façon synchrone
+MAX_PENDING_ROWS = 10_000
+
+
+# =============================================================================
+# AUDIT LOG QUEUE
+# =============================================================================
+
+class AuditLogQueue:
+    """File partagée (thread-safe) des logs d'audit à insérer."""
+    
+    @classmethod
+    def enqueue(
+        cls,
+        action: str,
+        user_id: Optional[uuid.UUID] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[uuid.UUID] = None,
+        details: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> None:
+        """
+        Ajoute un log d'audit à la file.
+        
+        Args:
+            action: Action effectuée (ex: LOGIN_FAILED)
+            user_id: ID de l'utilisateur
+            entity_type: Type d'entité concernée
+            entity_id: ID de l'entité concernée
+            details: Détails JSON
+            ip_address: Adresse IP
+            user_agent: User agent
+        """
+        _writer.put(_audit_row(
+            action, user_id, entity_type, entity_id, details, ip_address, user_agent
+        ))
+    
+    @classmethod
+    def enqueue_after_commit(
+        cls,
+        db: Session,
+        action: str,
+        user_id: Optional[uuid.UUID] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[uuid.UUID] = None,
+        details: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> None:
+        """
+        Commite la transaction de l'appelant puis met le log d'audit en file.
+        
+        Un commit en échec lève son exception sans produire de log. Si la
+        file est saturée, le log est ajouté à la session avant le commit
+        (écrit avec les modifications qu'il décrit).
+        
+        Args:
+            db: Session de l'appelant, à commiter
+            action: Action effectuée (ex: LOGIN_SUCCESS)
+            user_id: ID de l'utilisateur
+            entity_type: Type d'entité concernée
+            entity_id: ID de l'entité concernée
+            details: Détails JSON
+            ip_address: Adresse IP
+            user_agent: User agent
+        """
+        row = _audit_row(
+            action, user_id, entity_type, entity_id, details, ip_address, user_agent
+        )
+        
+        if _writer.is_saturated():
+            db.add(AuditLog(**row))
+            db.commit()
+            return
+        
+        db.commit()
+        _writer.put(row)
+    
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Insère immédiatement toutes les lignes en attente.
+        
+        Returns:
+            Nombre de lignes insérées
+        """
+        return _writer.flush()
+
+
+def _audit_row(
+    action: str,
+    user_id: Optional[uuid.UUID],
+    entity_type: Optional[str],
+    entity_id: Optional[uuid.UUID],
+    details: Optional[Dict[str, Any]],
+    ip_address: Optional[str],
+    user_agent: Optional[str]
+) -> Dict[str, Any]:
+    """Construit la ligne d'un log d'audit (sans instance ORM)."""
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "details": details,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        # Horodatage de l'événement, pas de l'insertion
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _insert_audit_logs(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Insère un lot de logs d'audit (INSERT multi-lignes, sans commit)."""
+    db.execute(AuditLog.__table__.insert(), rows)
+
+
+_writer = BatchWriter(
+    name="audit-log",
+    label="logs d'audit",
+    write=_insert_audit_logs,
+    max_rows=FLUSH_MAX_ROWS,
+    flush_interval=FLUSH_INTERVAL_SECONDS,
+    max_pending=MAX_PENDING_ROWS,
+    row_fallback=True
+)
@@ -11,18 +11,162 @@ Date: 2025-12-02
 """
 
 import logging
+import re
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 
-from sqlalchemy import func, and_, or_, cast, String
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, and_, or_, cast, select, text, Text
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.models.audit_log import AuditLog
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Nombre de logs supprimés par transaction lors du nettoyage
+CLEANUP_BATCH_SIZE = 10000
+
+# Partitions mensuelles de audit_logs (migration f2eed936ec18)
+_PARTITION_NAME_RE = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+
+_IS_PARTITIONED_SQL = text(
+    "SELECT relkind = 'p' FROM pg_class WHERE oid = 'audit_logs'::regclass"
+)
+
+_PARTITIONS_SQL = text("""
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = 'audit_logs'::regclass
+""")
+
+_CREATE_PARTITION_SQL = text("SELECT create_audit_logs_partition(:month_start)")
+
+# Lignes d'un mois tombées dans la partition par défaut (mois sans partition
+# au moment de l'insertion) : elles empêchent la création de sa partition
+_DEFAULT_HAS_MONTH_SQL = text("""
+    SELECT EXISTS (
+        SELECT 1 FROM audit_logs_default
+        WHERE created_at >= :month_start AND created_at < :month_end
+    )
+""")
+
+_MOVED_TABLE_SQL = text(
+    "CREATE TEMP TABLE audit_logs_moved (LIKE audit_logs) ON COMMIT DROP"
+)
+
+_MOVE_OUT_OF_DEFAULT_SQL = text("""
+    WITH moved AS (
+        DELETE FROM audit_logs_default
+        WHERE created_at >= :month_start AND created_at < :month_end
+        RETURNING *
+    )
+    INSERT INTO audit_logs_moved SELECT * FROM moved
+""")
+
+_MOVE_BACK_SQL = text("INSERT INTO audit_logs SELECT * FROM audit_logs_moved")
+
+# Nombre de lignes d'une partition estimé par le planificateur (pas de
+# parcours de la partition avant son DROP)
+_PARTITION_ESTIMATED_COUNT_SQL = text("""
+    SELECT GREATEST(reltuples, 0)::bigint
+    FROM pg_class
+    WHERE oid = CAST(:partition_name AS regclass)
+""")
+
+# Nombre de lignes estimé par le planificateur (somme des partitions ;
+# reltuples vaut -1 pour une table jamais analysée)
+_ESTIMATED_COUNT_SQL = text("""
+    SELECT COALESCE(sum(GREATEST(c.reltuples, 0)), 0)::bigint
+    FROM pg_class c
+    WHERE (c.oid = 'audit_logs'::regclass AND c.relkind = 'r')
+       OR c.oid IN (
+           SELECT inhrelid FROM pg_inherits
+           WHERE inhparent = 'audit_logs'::regclass
+       )
+""")
+
+# Statistiques : requêtes compilées une fois au chargement du module
+_STATS_PERIODS_SQL = text("""
+    SELECT
+        count(*) FILTER (WHERE created_at >= :month_start),
+        count(*) FILTER (WHERE created_at >= :week_start),
+        count(*) FILTER (WHERE created_at >= :today_start)
+    FROM audit_logs
+    WHERE created_at >= :period_start
+""")
+
+_STATS_GROUPED_SQL = text("""
+    SELECT
+        grouping(action) AS action_grouped,
+        grouping(entity_type) AS entity_grouped,
+        action,
+        entity_type,
+        count(*),
+        max(created_at)
+    FROM audit_logs
+    GROUP BY GROUPING SETS ((action), (entity_type), ())
+""")
+
+
+def _day_start(d: date) -> datetime:
+    """Début de journée (00:00:00) d'une date."""
+    return datetime(d.year, d.month, d.day)
+
+
+def _day_end(d: date) -> datetime:
+    """Fin de journée (23:59:59.999999) d'une date."""
+    return datetime(d.year, d.month, d.day, 23, 59, 59, 999999)
+
+
+def _next_month(d: date) -> date:
+    """Premier jour du mois suivant."""
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def _distinct_values_sql(column: str):
+    """
+    Valeurs distinctes d'une colonne indexée d'audit_logs par « loose index
+    scan » (CTE récursive) : une recherche d'index par valeur distincte au
+    lieu d'un parcours complet de la table. Résultat trié.
+    """
+    return text(f"""
+        WITH RECURSIVE t AS (
+            SELECT (
+                SELECT {column} FROM audit_logs
+                WHERE {column} IS NOT NULL ORDER BY {column} LIMIT 1
+            ) AS value
+            UNION ALL
+            SELECT (
+                SELECT {column} FROM audit_logs
+                WHERE {column} > t.value ORDER BY {column} LIMIT 1
+            )
+            FROM t WHERE t.value IS NOT NULL
+        )
+        SELECT value FROM t WHERE value IS NOT NULL AND value <> ''
+    """)
+
+
+_DISTINCT_ACTIONS_SQL = _distinct_values_sql("action")
+_DISTINCT_ENTITY_TYPES_SQL = _distinct_values_sql("entity_type")
+
+
+# Activité quotidienne avec remplissage des jours vides (generate_series)
+_ACTIVITY_BY_DATE_SQL = text("""
+    SELECT d.day::date AS date, COALESCE(x.count, 0) AS count
+    FROM generate_series(
+        CAST(:start_date AS date), CAST(:end_date AS date), interval '1 day'
+    ) AS d(day)
+    LEFT JOIN (
+        SELECT date(created_at) AS log_date, count(*) AS count
+        FROM audit_logs
+        WHERE created_at >= :start_ts AND created_at <= :end_ts
+        GROUP BY 1
+    ) AS x ON x.log_date = d.day::date
+    ORDER BY d.day
+""")
+
 
 class AuditLogService:
     """Service pour la gestion des logs d'audit."""
@@ -42,7 +186,8 @@ class AuditLogService:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         search: Optional[str] = None,
-        include_user: bool = True
+        include_user: bool = True,
+        exact_count: bool = False
     ) -> Tuple[List[AuditLog], int]:
         """
         Récupère les logs d'audit avec pagination et filtrage.
@@ -58,18 +203,13 @@ class AuditLogService:
             end_date: Date de fin (incluse)
             search: Recherche textuelle dans les détails
             include_user: Inclure les informations utilisateur
+            exact_count: Compter exactement le total même sans filtre
+                (par défaut estimé via pg_class.reltuples)
             
         Returns:
             Tuple (liste des logs, nombre total)
         """
         try:
-            # Construction de la requête de base
-            query = db.query(AuditLog)
-            
-            # Jointure avec User si demandé
-            if include_user:
-                query = query.options(joinedload(AuditLog.user))
-            
             # Application des filtres
             filters = []
             
@@ -84,34 +224,72 @@ class AuditLogService:
                 
             if start_date:
                 # Début de journée
-                start_datetime = datetime.combine(start_date, datetime.min.time())
+                start_datetime = _day_start(start_date)
                 filters.append(AuditLog.created_at >= start_datetime)
                 
             if end_date:
                 # Fin de journée (23:59:59)
-                end_datetime = datetime.combine(end_date, datetime.max.time())
+                end_datetime = _day_end(end_date)
                 filters.append(AuditLog.created_at <= end_datetime)
                 
             if search:
-                # Recherche dans les détails JSONB (cast en string)
+                # Recherche dans les détails JSONB (details::text, même
+                # expression que l'index trigram ix_audit_logs_details_trgm)
                 search_pattern = f"%{search}%"
                 filters.append(
-                    cast(AuditLog.details, String).ilike(search_pattern)
+                    cast(AuditLog.details, Text).ilike(search_pattern)
+                )
+            
+            # Sans filtre, le total est estimé par le planificateur
+            # (pg_class.reltuples) au lieu d'un comptage complet de la table
+            estimate_total = not filters and not exact_count
+            
+            # Construction de la requête de base (sinon total via
+            # count(*) OVER () : page et nombre total en un seul aller-retour)
+            if estimate_total:
+                query = db.query(AuditLog)
+            else:
+                query = db.query(AuditLog, func.count().over().label("total"))
+            
+            # Utilisateurs chargés par une requête IN séparée, limitée aux
+            # colonnes affichées (pas de jointure élargissant chaque ligne)
+            if include_user:
+                query = query.options(
+                    selectinload(AuditLog.user).load_only(
+                        User.id, User.matricule, User.nom, User.prenom, User.email
+                    )
                 )
             
             # Appliquer les filtres
             if filters:
                 query = query.filter(and_(*filters))
             
-            # Compter le total
-            total = query.count()
-            
             # Pagination et tri
             offset = (page - 1) * page_size
-            logs = query.order_by(
+            rows = query.order_by(
                 AuditLog.created_at.desc()
             ).offset(offset).limit(page_size).all()
             
+            if estimate_total:
+                logs = rows
+                if rows and len(rows) < page_size:
+                    # Dernière page : total exact
+                    total = offset + len(rows)
+                else:
+                    total = db.execute(_ESTIMATED_COUNT_SQL).scalar() or 0
+                    if total < offset + len(rows) or (not rows and offset):
+                        # Estimation absente ou obsolète : comptage exact
+                        total = db.query(func.count(AuditLog.id)).scalar() or 0
+            else:
+                logs = [log for log, _ in rows]
+                if rows:
+                    total = rows[0].total
+                elif offset:
+                    # Page au-delà de la fin : aucune ligne pour porter le total
+                    total = query.with_entities(func.count(AuditLog.id)).scalar() or 0
+                else:
+                    total = 0
+            
             logger.info(
                 f"📋 Récupération logs d'audit: page={page}, "
                 f"page_size={page_size}, total={total}"
@@ -169,52 +347,42 @@ class AuditLogService:
         """
         try:
             now = datetime.utcnow()
-            today_start = datetime.combine(now.date(), datetime.min.time())
+            today_start = _day_start(now)
             week_start = today_start - timedelta(days=now.weekday())
             month_start = today_start.replace(day=1)
             
-            # Total des logs
-            total_logs = db.query(func.count(AuditLog.id)).scalar() or 0
-            
-            # Logs aujourd'hui
-            logs_today = db.query(func.count(AuditLog.id)).filter(
-                AuditLog.created_at >= today_start
-            ).scalar() or 0
-            
-            # Logs cette semaine
-            logs_this_week = db.query(func.count(AuditLog.id)).filter(
-                AuditLog.created_at >= week_start
-            ).scalar() or 0
-            
-            # Logs ce mois
-            logs_this_month = db.query(func.count(AuditLog.id)).filter(
-                AuditLog.created_at >= month_start
-            ).scalar() or 0
-            
-            # Par type d'action
-            action_counts = db.query(
-                AuditLog.action,
-                func.count(AuditLog.id)
-            ).group_by(AuditLog.action).all()
-            
-            by_action = {action: count for action, count in action_counts if action}
-            
-            # Par type d'entité
-            entity_counts = db.query(
-                AuditLog.entity_type,
-                func.count(AuditLog.id)
-            ).group_by(AuditLog.entity_type).all()
-            
-            by_entity_type = {
-                entity: count for entity, count in entity_counts if entity
-            }
-            
-            # Dernière activité
-            last_log = db.query(AuditLog).order_by(
-                AuditLog.created_at.desc()
-            ).first()
-            
-            last_activity = last_log.created_at if last_log else None
+            # La semaine peut commencer le mois précédent : borne commune
+            period_start = min(week_start, month_start)
+            
+            # Compteurs par période : un seul parcours de l'index created_at
+            # à partir de period_start
+            logs_this_month, logs_this_week, logs_today = db.execute(
+                _STATS_PERIODS_SQL,
+                {
+                    "period_start": period_start,
+                    "month_start": month_start,
+                    "week_start": week_start,
+                    "today_start": today_start,
+                }
+            ).one()
+            
+            # Total, dernière activité et répartitions par action / type
+            # d'entité en une passe (GROUPING SETS, () = total global)
+            grouped_counts = db.execute(_STATS_GROUPED_SQL).all()
+            
+            total_logs = 0
+            last_activity = None
+            by_action = {}
+            by_entity_type = {}
+            for action_grouped, entity_grouped, action, entity, count, last in grouped_counts:
+                if action_grouped and entity_grouped:
+                    total_logs = count
+                    last_activity = last
+                elif action_grouped:
+                    if entity:
+                        by_entity_type[entity] = count
+                elif action:
+                    by_action[action] = count
             
             logger.info(f"📊 Statistiques logs: total={total_logs}, today={logs_today}")
             
@@ -250,31 +418,19 @@ class AuditLogService:
             Liste d'activité par date
         """
         try:
-            # Requête pour compter par date
-            daily_counts = db.query(
-                func.date(AuditLog.created_at).label('log_date'),
-                func.count(AuditLog.id).label('count')
-            ).filter(
-                AuditLog.created_at >= datetime.combine(start_date, datetime.min.time()),
-                AuditLog.created_at <= datetime.combine(end_date, datetime.max.time())
-            ).group_by(
-                func.date(AuditLog.created_at)
-            ).order_by(
-                func.date(AuditLog.created_at)
+            # Série de dates complète générée côté PostgreSQL (jours sans
+            # log à 0), aucune boucle de remplissage côté Python
+            rows = db.execute(
+                _ACTIVITY_BY_DATE_SQL,
+                {
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "start_ts": _day_start(start_date),
+                    "end_ts": _day_end(end_date),
+                }
             ).all()
             
-            # Construire le résultat avec toutes les dates
-            result = []
-            current_date = start_date
-            counts_dict = {str(row.log_date): row.count for row in daily_counts}
-            
-            while current_date <= end_date:
-                date_str = str(current_date)
-                result.append({
-                    "date": current_date,
-                    "count": counts_dict.get(date_str, 0)
-                })
-                current_date += timedelta(days=1)
+            result = [{"date": day, "count": count} for day, count in rows]
             
             logger.info(
                 f"📈 Activité logs: {start_date} → {end_date}, "
@@ -303,8 +459,7 @@ class AuditLogService:
             Liste des types d'actions
         """
         try:
-            actions = db.query(AuditLog.action).distinct().all()
-            return sorted([a[0] for a in actions if a[0]])
+            return list(db.execute(_DISTINCT_ACTIONS_SQL).scalars())
         except Exception as e:
             logger.error(f"❌ Erreur récupération actions: {e}")
             raise
@@ -321,8 +476,7 @@ class AuditLogService:
             Liste des types d'entités
         """
         try:
-            types = db.query(AuditLog.entity_type).distinct().all()
-            return sorted([t[0] for t in types if t[0]])
+            return list(db.execute(_DISTINCT_ENTITY_TYPES_SQL).scalars())
         except Exception as e:
             logger.error(f"❌ Erreur récupération entity types: {e}")
             raise
@@ -376,11 +530,25 @@ class AuditLogService:
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
             
-            deleted = db.query(AuditLog).filter(
-                AuditLog.created_at < cutoff_date
-            ).delete(synchronize_session=False)
+            # Partitions entièrement expirées : DETACH + DROP (sans DELETE)
+            deleted = AuditLogService._drop_expired_partitions(db, cutoff_date)
             
-            db.commit()
+            # Reste (partition partiellement expirée, partition par défaut) :
+            # suppression par lots (un commit par lot) : verrous courts,
+            # WAL réparti et récupération progressive par l'autovacuum
+            while True:
+                batch_ids = select(AuditLog.id).where(
+                    AuditLog.created_at < cutoff_date
+                ).limit(CLEANUP_BATCH_SIZE).scalar_subquery()
+                
+                batch_deleted = db.query(AuditLog).filter(
+                    AuditLog.id.in_(batch_ids)
+                ).delete(synchronize_session=False)
+                db.commit()
+                
+                deleted += batch_deleted
+                if batch_deleted < CLEANUP_BATCH_SIZE:
+                    break
             
             logger.info(
                 f"🧹 Nettoyage logs d'audit: {deleted} logs supprimés "
@@ -392,4 +560,108 @@ class AuditLogService:
         except Exception as e:
             db.rollback()
             logger.error(f"❌ Erreur nettoyage logs: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    # ==========================================================================
+    # PARTITIONS MENSUELLES
+    # ==========================================================================
+    
+    @staticmethod
+    def _is_partitioned(db: Session) -> bool:
+        """Indique si audit_logs est une table partitionnée."""
+        return bool(db.execute(_IS_PARTITIONED_SQL).scalar())
+    
+    @staticmethod
+    def ensure_partitions(db: Session, months_ahead: int = 1) -> None:
+        """
+        Crée les partitions du mois courant et des mois suivants.
+        
+        Sans effet si audit_logs n'est pas partitionnée (base créée par
+        scripts/init_db.py sans les migrations).
+        
+        Args:
+            db: Session de base de données
+            months_ahead: Nombre de mois à anticiper après le mois courant
+        """
+        try:
+            if not AuditLogService._is_partitioned(db):
+                return
+            
+            month_start = datetime.utcnow().date().replace(day=1)
+            for _ in range(months_ahead + 1):
+                AuditLogService._create_partition(db, month_start)
+                month_start = _next_month(month_start)
+            
+            db.commit()
+            
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erreur création partitions audit_logs: {e}")
+            raise
+    
+    @staticmethod
+    def _create_partition(db: Session, month_start: date) -> None:
+        """
+        Crée la partition d'un mois (sans effet si elle existe).
+        
+        Si des logs de ce mois sont dans la partition par défaut (tâche
+        quotidienne non exécutée à temps), PostgreSQL refuse la création :
+        ils sont d'abord sortis de audit_logs_default puis réinsérés dans
+        la nouvelle partition, dans la même transaction.
+        
+        Args:
+            db: Session de base de données
+            month_start: Premier jour du mois
+        """
+        params = {"month_start": month_start, "month_end": _next_month(month_start)}
+        
+        if not db.execute(_DEFAULT_HAS_MONTH_SQL, params).scalar():
+            db.execute(_CREATE_PARTITION_SQL, {"month_start": month_start})
+            return
+        
+        logger.warning(
+            f"⚠️ Logs de {month_start:%Y-%m} dans audit_logs_default, "
+            f"déplacement vers leur partition"
+        )
+        db.execute(_MOVED_TABLE_SQL)
+        db.execute(_MOVE_OUT_OF_DEFAULT_SQL, params)
+        db.execute(_CREATE_PARTITION_SQL, {"month_start": month_start})
+        db.execute(_MOVE_BACK_SQL)
+        db.execute(text("DROP TABLE audit_logs_moved"))
+    
+    @staticmethod
+    def _drop_expired_partitions(db: Session, cutoff_date: datetime) -> int:
+        """
+        Supprime les partitions mensuelles entièrement antérieures à cutoff_date.
+        
+        Args:
+            db: Session de base de données
+            cutoff_date: Date limite de rétention
+            
+        Returns:
+            Nombre de logs supprimés (estimation pg_class.reltuples)
+        """
+        if not AuditLogService._is_partitioned(db):
+            return 0
+        
+        deleted = 0
+        for partition_name in db.execute(_PARTITIONS_SQL).scalars().all():
+            match = _PARTITION_NAME_RE.match(partition_name)
+            if not match:
+                continue
+            
+            upper_bound = _next_month(date(int(match.group(1)), int(match.group(2)), 1))
+            if _day_start(upper_bound) > cutoff_date:
+                continue
+            
+            deleted += db.execute(
+                _PARTITION_ESTIMATED_COUNT_SQL,
+                {"partition_name": f'"{partition_name}"'}
+            ).scalar() or 0
+            db.execute(text(f'ALTER TABLE audit_logs DETACH PARTITION "{partition_name}"'))
+            db.execute(text(f'DROP TABLE "{partition_name}"'))
+            db.commit()
+            
+            logger.info(f"🧹 Partition {partition_name} supprimée")
+        
+        return deleted
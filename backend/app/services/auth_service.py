@@ -1,9 +1,12 @@
 """Service d'authentification - Gestion des tokens JWT et connexion."""
-from datetime import datetime, timedelta
 from typing import Optional, Tuple
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, func
+from sqlalchemy.orm import Session, defer, load_only
 from fastapi import HTTPException, status
 from uuid import UUID
+from base64 import urlsafe_b64encode
+from functools import lru_cache
+import os
 import secrets
 
 from app.core.security import (
@@ -11,15 +14,28 @@ from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    verify_token_type,
     get_password_hash
 )
 from app.core.config import settings
 from app.models.user import User
-from app.models.audit_log import AuditLog
+from app.services.audit_log_queue import AuditLogQueue
 from app.schemas.user import TokenResponse, UserResponse
 
 
+# Entropie des tokens de réinitialisation (octets, comme token_urlsafe(32))
+RESET_TOKEN_BYTES = 32
+
+# Longueur d'un matricule plausible (mêmes bornes que UserBase et LoginRequest)
+MATRICULE_MIN_LENGTH = 3
+MATRICULE_MAX_LENGTH = 50
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    """Hash factice vérifié quand le matricule est inconnu (temps constant)."""
+    return get_password_hash(secrets.token_urlsafe(16))
+
+
 class AuthService:
     """Service de gestion de l'authentification."""
     
@@ -35,7 +51,6 @@ class AuthService:
         Authentifie un utilisateur avec son matricule et mot de passe.
         
         Args:
-            db: Session de base de données
             matricule: Matricule de l'utilisateur
             password: Mot de passe en clair
             ip_address: Adresse IP de la requête
@@ -44,13 +59,25 @@ class AuthService:
         Returns:
             Optional[User]: Utilisateur si authentification réussie, None sinon
         """
+        # Matricule mal formé : rejet sans passer par bcrypt
+        if not MATRICULE_MIN_LENGTH <= len(matricule) <= MATRICULE_MAX_LENGTH:
+            AuthService._log_failed_login(
+                matricule=matricule,
+                reason="Matricule invalide",
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+            return None
+        
         # Rechercher l'utilisateur par matricule
         user = db.query(User).filter(User.matricule == matricule).first()
         
         if not user:
+            # Vérification factice : même durée que pour un matricule existant
+            verify_password(password, _dummy_password_hash())
+            
             # Log de tentative de connexion échouée (utilisateur inexistant)
             AuthService._log_failed_login(
-                db=db,
                 matricule=matricule,
                 reason="Matricule inexistant",
                 ip_address=ip_address,
@@ -62,7 +89,6 @@ class AuthService:
         if not verify_password(password, user.hashed_password):
             # Log de tentative de connexion échouée (mot de passe incorrect)
             AuthService._log_failed_login(
-                db=db,
                 matricule=matricule,
                 reason="Mot de passe incorrect",
                 ip_address=ip_address,
@@ -75,7 +101,6 @@ class AuthService:
         if not user.is_active:
             # Log de tentative de connexion échouée (compte désactivé)
             AuthService._log_failed_login(
-                db=db,
                 matricule=matricule,
                 reason="Compte désactivé",
                 ip_address=ip_address,
@@ -84,11 +109,10 @@ class AuthService:
             )
             return None
         
-        # Mettre à jour le last_login
-        user.last_login = datetime.utcnow()
-        db.commit()
+        # Mettre à jour le last_login (horodatage calculé par PostgreSQL)
+        user.last_login = func.now()
         
-        # Log de connexion réussie
+        # Commit, puis log de connexion réussie
         AuthService._log_successful_login(
             db=db,
             user=user,
@@ -98,6 +122,15 @@ class AuthService:
         
         return user
     
+    @staticmethod
+    def _token_data(user: User) -> dict:
+        """Claims communs aux access et refresh tokens d'un utilisateur."""
+        return {
+            "sub": str(user.id),
+            "matricule": user.matricule,
+            "role": user.role.value,
+        }
+    
     @staticmethod
     def create_tokens(user: User) -> Tuple[str, str, int]:
         """
@@ -109,12 +142,8 @@ class AuthService:
         Returns:
             Tuple[str, str, int]: (access_token, refresh_token, expires_in)
         """
-        # Données à encoder dans les tokens
-        token_data = {
-            "sub": str(user.id),
-            "matricule": user.matricule,
-            "role": user.role.value,
-        }
+        # Données à encoder dans les tokens (copiées par chaque encodeur)
+        token_data = AuthService._token_data(user)
         
         # Créer l'access token
         access_token = create_access_token(token_data)
@@ -145,9 +174,13 @@ class AuthService:
         Raises:
             HTTPException: Si le refresh token est invalide
         """
-        # Décoder le refresh token
+        # Décoder le refresh token (sub, exp et type vérifiés en une passe)
         try:
-            payload = decode_token(refresh_token)
+            payload = decode_token(
+                refresh_token,
+                required_claims=("sub", "exp"),
+                expected_type="refresh"
+            )
         except HTTPException as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -155,22 +188,7 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             ) from e
         
-        # Vérifier que c'est un refresh token
-        if not verify_token_type(payload, "refresh"):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Type de token invalide",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Récupérer l'user_id
-        user_id_str: Optional[str] = payload.get("sub")
-        if user_id_str is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token invalide: user_id manquant",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        user_id_str: str = payload["sub"]
         
         try:
             user_id = UUID(user_id_str)
@@ -182,7 +200,9 @@ class AuthService:
             ) from e
         
         # Récupérer l'utilisateur
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.query(User).options(
+            load_only(User.id, User.matricule, User.role, User.is_active)
+        ).filter(User.id == user_id).first()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -198,12 +218,7 @@ class AuthService:
             )
         
         # Créer un nouveau access token
-        token_data = {
-            "sub": str(user.id),
-            "matricule": user.matricule,
-            "role": user.role.value,
-        }
-        new_access_token = create_access_token(token_data)
+        new_access_token = create_access_token(AuthService._token_data(user))
         expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         
         return new_access_token, expires_in
@@ -235,7 +250,9 @@ class AuthService:
             HTTPException: Si l'utilisateur n'existe pas ou l'email est déjà utilisé
         """
         # Récupérer l'utilisateur
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.query(User).options(
+            defer(User.hashed_password)
+        ).filter(User.id == user_id).first()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -258,12 +275,11 @@ class AuthService:
         
         if email is not None:
             # Vérifier que l'email n'est pas déjà utilisé par un autre utilisateur
-            existing_user = db.query(User).filter(
-                User.email == email,
-                User.id != user_id
-            ).first()
+            email_taken = db.query(
+                exists().where(User.email == email, User.id != user_id)
+            ).scalar()
             
-            if existing_user:
+            if email_taken:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Cet email est déjà utilisé par un autre utilisateur"
@@ -271,19 +287,17 @@ class AuthService:
             
             user.email = email
         
-        # Mettre à jour updated_at
-        user.updated_at = datetime.utcnow()
-        
-        db.commit()
-        db.refresh(user)
+        # Mettre à jour updated_at (horodatage calculé par PostgreSQL)
+        user.updated_at = func.now()
         
-        # Log de mise à jour du profil
+        # Commit, puis log de mise à jour du profil
         AuthService._log_profile_update(
             db=db,
             user=user,
             old_values=old_values,
             ip_address=ip_address
         )
+        db.refresh(user)
         
         return user
     
@@ -307,10 +321,17 @@ class AuthService:
         Raises:
             HTTPException: Si l'utilisateur n'existe pas ou est inactif
         """
-        # Rechercher l'utilisateur par matricule ou email
-        user = db.query(User).filter(
-            (User.matricule == identifier) | (User.email == identifier)
-        ).first()
+        # Rechercher l'utilisateur par email ou matricule selon la forme de
+        # l'identifiant (une recherche par index unique au lieu d'un OR)
+        user = None
+        if "@" in identifier:
+            user = db.query(User).options(
+                defer(User.hashed_password)
+            ).filter(User.email == identifier).first()
+        if user is None:
+            user = db.query(User).options(
+                defer(User.hashed_password)
+            ).filter(User.matricule == identifier).first()
         
         if not user:
             raise HTTPException(
@@ -326,14 +347,13 @@ class AuthService:
             )
         
         # Générer un token de réinitialisation sécurisé
-        reset_token = secrets.token_urlsafe(32)
+        reset_token = urlsafe_b64encode(os.urandom(RESET_TOKEN_BYTES)).rstrip(b'=').decode('ascii')
         
         # TODO: En production, sauvegarder le token dans la DB avec expiration
         # Pour l'instant, on génère juste le token
         
         # Log de demande de réinitialisation
         AuthService._log_password_reset_request(
-            db=db,
             user=user,
             ip_address=ip_address
         )
@@ -358,20 +378,23 @@ class AuthService:
             dict: Informations sur l'envoi (email masqué, etc.)
         """
         # Masquer l'email
-        email_parts = user.email.split('@')
-        masked_email = f"{email_parts[0][:2]}***@{email_parts[1]}"
+        local_part, _, domain = user.email.rpartition('@')
+        masked_email = f"{local_part[:2]}***@{domain}"
         
         if is_dev:
-            # Mode développement: ne pas envoyer d'email réel
-            print(f"\n{'='*60}")
-            print(f"[DEV MODE] Email de réinitialisation de mot de passe")
-            print(f"{'='*60}")
-            print(f"Destinataire: {user.email}")
-            print(f"Matricule: {user.matricule}")
-            print(f"Nom: {user.prenom} {user.nom}")
-            print(f"\nLien de réinitialisation:")
-            print(f"http://localhost:5173/reset-password?token={reset_token}")
-            print(f"{'='*60}\n")
+            # Mode développement: ne pas envoyer d'email réel (une seule écriture)
+            separator = '=' * 60
+            print(
+                f"\n{separator}\n"
+                f"[DEV MODE] Email de réinitialisation de mot de passe\n"
+                f"{separator}\n"
+                f"Destinataire: {user.email}\n"
+                f"Matricule: {user.matricule}\n"
+                f"Nom: {user.prenom} {user.nom}\n"
+                f"\nLien de réinitialisation:\n"
+                f"http://localhost:5173/reset-password?token={reset_token}\n"
+                f"{separator}\n"
+            )
             
             return {
                 "email": masked_email,
@@ -396,15 +419,16 @@ class AuthService:
         user_agent: Optional[str] = None
     ) -> None:
         """
-        Enregistre une connexion réussie dans les logs d'audit.
+        Commite la connexion puis l'enregistre dans les logs d'audit.
         
         Args:
-            db: Session de base de données
+            db: Session de la transaction en cours, commitée avant la mise en file
             user: Utilisateur connecté
             ip_address: Adresse IP
             user_agent: User agent
         """
-        audit_log = AuditLog(
+        AuditLogQueue.enqueue_after_commit(
+            db=db,
             user_id=user.id,
             action="LOGIN_SUCCESS",
             entity_type="AUTH",
@@ -417,12 +441,9 @@ class AuthService:
             ip_address=ip_address,
             user_agent=user_agent
         )
-        db.add(audit_log)
-        db.commit()
     
     @staticmethod
     def _log_failed_login(
-        db: Session,
         matricule: str,
         reason: str,
         ip_address: Optional[str] = None,
@@ -433,14 +454,13 @@ class AuthService:
         Enregistre une tentative de connexion échouée dans les logs d'audit.
         
         Args:
-            db: Session de base de données
             matricule: Matricule utilisé pour la tentative
             reason: Raison de l'échec
             ip_address: Adresse IP
             user_agent: User agent
             user_id: ID de l'utilisateur si trouvé
         """
-        audit_log = AuditLog(
+        AuditLogQueue.enqueue(
             user_id=user_id,
             action="LOGIN_FAILED",
             entity_type="AUTH",
@@ -453,8 +473,6 @@ class AuthService:
             ip_address=ip_address,
             user_agent=user_agent
         )
-        db.add(audit_log)
-        db.commit()
     
     @staticmethod
     def _log_profile_update(
@@ -464,19 +482,20 @@ class AuthService:
         ip_address: Optional[str] = None
     ) -> None:
         """
-        Enregistre une mise à jour de profil dans les logs d'audit.
+        Commite la mise à jour de profil puis l'enregistre dans les logs d'audit.
         
         Args:
-            db: Session de base de données
+            db: Session de la transaction en cours, commitée avant la mise en file
             user: Utilisateur
             old_values: Anciennes valeurs
             ip_address: Adresse IP
         """
-        audit_log = AuditLog(
+        AuditLogQueue.enqueue_after_commit(
+            db=db,
             user_id=user.id,
             action="PROFILE_UPDATE",
             entity_type="USER",
-            entity_id=str(user.id),
+            entity_id=user.id,
             details={
                 "matricule": user.matricule,
                 "old_values": old_values,
@@ -489,12 +508,9 @@ class AuthService:
             },
             ip_address=ip_address
         )
-        db.add(audit_log)
-        db.commit()
     
     @staticmethod
     def _log_password_reset_request(
-        db: Session,
         user: User,
         ip_address: Optional[str] = None
     ) -> None:
@@ -502,21 +518,18 @@ class AuthService:
         Enregistre une demande de réinitialisation de mot de passe.
         
         Args:
-            db: Session de base de données
             user: Utilisateur
             ip_address: Adresse IP
         """
-        audit_log = AuditLog(
+        AuditLogQueue.enqueue(
             user_id=user.id,
             action="PASSWORD_RESET_REQUEST",
             entity_type="AUTH",
-            entity_id=str(user.id),
+            entity_id=user.id,
             details={
                 "matricule": user.matricule,
                 "email": user.email,
                 "message": "Demande de réinitialisation de mot de passe"
             },
             ip_address=ip_address
-        )
-        db.add(audit_log)
-        db.commit()
\ No newline at end of file
+        )
\ No newline at end of file
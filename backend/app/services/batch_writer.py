@@ -0,0 +1,188 @@
+"""
+Écriture par lots en arrière-plan.
+
+Socle commun des files d'écriture (logs d'audit, hits de cache,
+utilisation des tokens) : les lignes sont mises en file (dictionnaires,
+sans instance ORM) et écrites par lots par un thread de fond :
+- dès que max_rows lignes sont disponibles
+- au plus tard toutes les flush_interval secondes
+- à l'arrêt du processus (atexit)
+
+Au-delà de max_pending lignes en attente, l'écriture redevient synchrone
+(backpressure), dans une transaction dédiée.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+# Écrit un lot de lignes dans la session fournie, sans commit
+WriteFunc = Callable[[Session, List[Dict[str, Any]]], None]
+
+
+class BatchWriter:
+    """
+    File partagée (thread-safe) de lignes écrites par lots.
+    
+    Seul le thread de flush accède à la base, avec sa propre session.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        write: WriteFunc,
+        max_rows: int,
+        flush_interval: float,
+        max_pending: int = 10_000,
+        row_fallback: bool = False
+    ):
+        """
+        Args:
+            name: Nom court (nom du thread de flush)
+            label: Désignation des lignes dans les logs (ex: "logs d'audit")
+            write: Fonction d'écriture d'un lot (sans commit)
+            max_rows: Taille maximale d'un lot
+            flush_interval: Attente maximale avant l'écriture d'un lot
+                incomplet (secondes)
+            max_pending: Au-delà, les lignes sont écrites de façon synchrone
+            row_fallback: Si le lot échoue, réécrire ses lignes une par une
+                (une ligne invalide ne fait plus perdre tout le lot)
+        """
+        self.name = name
+        self.label = label
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.row_fallback = row_fallback
+        self._write_func = write
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        
+        # Lignes restantes écrites à l'arrêt du processus
+        atexit.register(self.flush)
+    
+    def is_saturated(self) -> bool:
+        """Indique si max_pending lignes sont déjà en attente."""
+        return self._queue.qsize() >= self.max_pending
+    
+    def put(self, row: Dict[str, Any]) -> None:
+        """
+        Ajoute une ligne à la file.
+        
+        Args:
+            row: Ligne à écrire
+        """
+        if self.is_saturated():
+            logger.warning(f"⚠️ File des {self.label} saturée, écriture synchrone")
+            self._write([row])
+            return
+        
+        self._queue.put(row)
+        self._start_flusher()
+    
+    def flush(self) -> int:
+        """
+        Écrit immédiatement toutes les lignes en attente.
+        
+        Returns:
+            Nombre de lignes écrites
+        """
+        written = 0
+        while True:
+            batch = self._drain(self.max_rows)
+            if not batch:
+                return written
+            written += self._write(batch)
+    
+    def _drain(self, max_rows: int, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Retire jusqu'à max_rows lignes de la file.
+        
+        Args:
+            max_rows: Nombre maximal de lignes
+            timeout: Attente maximale de la première ligne (None = pas d'attente)
+        
+        Returns:
+            Lignes retirées (éventuellement vide)
+        """
+        batch = []
+        try:
+            if timeout is None:
+                batch.append(self._queue.get_nowait())
+            else:
+                batch.append(self._queue.get(timeout=timeout))
+            while len(batch) < max_rows:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+    
+    def _write(self, rows: List[Dict[str, Any]]) -> int:
+        """Écrit un lot dans une transaction dédiée (ligne à ligne en repli)."""
+        if self._commit(rows):
+            logger.debug(f"💾 {len(rows)} {self.label} écrits")
+            return len(rows)
+        
+        if not self.row_fallback or len(rows) == 1:
+            return 0
+        
+        logger.warning(f"⚠️ Lot de {len(rows)} {self.label} rejeté, écriture ligne à ligne")
+        return sum(1 for row in rows if self._commit([row]))
+    
+    def _commit(self, rows: List[Dict[str, Any]]) -> bool:
+        """Écrit et commite des lignes ; False (erreur journalisée) en cas d'échec."""
+        db = SessionLocal()
+        try:
+            self._write_func(db, rows)
+            db.commit()
+            return True
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erreur écriture {self.label} ({len(rows)} lignes): {e}")
+            return False
+        finally:
+            db.close()
+    
+    def _start_flusher(self) -> None:
+        """Démarre le thread de flush s'il ne tourne pas déjà."""
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            
+            self._flusher = threading.Thread(
+                target=self._flush_periodically,
+                name=f"{self.name}-flusher",
+                daemon=True
+            )
+            self._flusher.start()
+    
+    def _flush_periodically(self) -> None:
+        """Boucle du thread de fond : un lot dès qu'il est plein ou à l'échéance."""
+        while True:
+            batch = self._drain(self.max_rows, timeout=self.flush_interval)
+            deadline = time.monotonic() + self.flush_interval
+            while batch and len(batch) < self.max_rows:
+                # Compléter le lot jusqu'à l'échéance
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                more = self._drain(self.max_rows - len(batch), timeout=remaining)
+                if not more:
+                    break
+                batch.extend(more)
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    logger.error(f"❌ Erreur flush périodique {self.label}: {e}")
@@ -0,0 +1,131 @@
+"""
+File d'attente des hits du cache de requêtes.
+
+Un hit (L1 ou L2) ne fait plus d'écriture dans la requête : il est mis en
+file et un thread de fond applique les lots toutes les
+FLUSH_INTERVAL_SECONDS (ou dès FLUSH_MAX_ROWS hits) :
+- un seul UPDATE multi-lignes atomique de query_cache (hit_count,
+  last_hit_at, expires_at) via QueryCache.register_hits
+- un upsert des statistiques journalières par jour concerné
+
+Le déclenchement des lots et la backpressure sont ceux de BatchWriter
+(voir batch_writer.py).
+"""
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.query_cache import QueryCache
+from app.services.batch_writer import BatchWriter
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Taille maximale d'un lot appliqué
+FLUSH_MAX_ROWS = 500
+
+# Attente maximale avant l'application d'un lot incomplet (secondes)
+FLUSH_INTERVAL_SECONDS = 0.1
+
+# Au-delà, les hits sont écrits de façon synchrone
+MAX_PENDING_ROWS = 10_000
+
+
+# =============================================================================
+# CACHE HIT QUEUE
+# =============================================================================
+
+class CacheHitQueue:
+    """File partagée (thread-safe) des hits de cache à enregistrer."""
+    
+    @classmethod
+    def enqueue(
+        cls,
+        cache_id: uuid.UUID,
+        tokens: int,
+        cost_usd: float,
+        cost_xaf: float,
+        ttl_days: int,
+        hit_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Ajoute un hit à la file.
+        
+        Args:
+            cache_id: ID de l'entrée de cache servie
+            tokens: Tokens économisés
+            cost_usd: Coût économisé en USD
+            cost_xaf: Coût économisé en XAF
+            ttl_days: TTL appliqué à l'entrée à partir du hit
+            hit_at: Instant (UTC) du hit, celui de la requête (défaut: maintenant)
+        """
+        if hit_at is None:
+            hit_at = datetime.now(timezone.utc)
+        row = {
+            "cache_id": cache_id,
+            "hit_at": hit_at,
+            "expires_at": hit_at + timedelta(days=ttl_days),
+            # Jour des statistiques : celui du hit (UTC), pas de l'écriture
+            "day": hit_at.date(),
+            "tokens": tokens or 0,
+            "cost_usd": Decimal(str(cost_usd)),
+            "cost_xaf": Decimal(str(cost_xaf)),
+        }
+        
+        _writer.put(row)
+    
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Applique immédiatement tous les hits en attente.
+        
+        Returns:
+            Nombre de hits enregistrés
+        """
+        return _writer.flush()
+
+
+def _apply_hits(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Applique un lot de hits (agrégés par entrée et par jour, sans commit)."""
+    # Import différé : cache_service importe ce module
+    from app.services.cache_service import CacheService
+    
+    # Agrégation par entrée de cache et par jour
+    entries: Dict[uuid.UUID, Dict[str, Any]] = {}
+    days: Dict[date, Dict[str, Any]] = {}
+    for row in rows:
+        entry = entries.setdefault(
+            row["cache_id"],
+            {"id": row["cache_id"], "hits": 0, "last_hit_at": row["hit_at"], "expires_at": row["expires_at"]}
+        )
+        entry["hits"] += 1
+        entry["last_hit_at"] = max(entry["last_hit_at"], row["hit_at"])
+        entry["expires_at"] = max(entry["expires_at"], row["expires_at"])
+        
+        stats = days.setdefault(
+            row["day"],
+            {"hits": 0, "tokens": 0, "cost_usd": Decimal(0), "cost_xaf": Decimal(0)}
+        )
+        stats["hits"] += 1
+        stats["tokens"] += row["tokens"]
+        stats["cost_usd"] += row["cost_usd"]
+        stats["cost_xaf"] += row["cost_xaf"]
+    
+    QueryCache.register_hits(db, entries.values())
+    for day, stats in days.items():
+        CacheService._record_cache_hits(db, day=day, **stats)
+
+
+_writer = BatchWriter(
+    name="cache-hit",
+    label="hits de cache",
+    write=_apply_hits,
+    max_rows=FLUSH_MAX_ROWS,
+    flush_interval=FLUSH_INTERVAL_SECONDS,
+    max_pending=MAX_PENDING_ROWS
+)
@@ -3,8 +3,10 @@
 CacheService - Service de gestion du cache des requêtes RAG.
 
 Ce service gère le cache à 2 niveaux pour les requêtes du chatbot :
-- Niveau 1 (L1) : Correspondance exacte via hash SHA-256
-- Niveau 2 (L2) : Similarité sémantique via cosine similarity (> 0.95)
+- Niveau 1 (L1) : Correspondance exacte via hash SHA-256, servie d'abord
+  depuis un LRU en mémoire du processus
+- Niveau 2 (L2) : Similarité sémantique via cosine similarity (> 0.95),
+  calculée en mémoire sur une matrice d'embeddings normalisés
 
 Les configurations (TTL, seuil similarité) sont lues depuis la DB via ConfigService.
 
@@ -14,18 +16,25 @@ SPRINT 13 - MONITORING: Ajout des métriques Prometheus pour le cache
 
 import logging
 import hashlib
-import math
-from datetime import datetime, date, timedelta
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, date, timedelta, timezone
 from typing import Optional, List, Dict, Any, Tuple
 from decimal import Decimal
+from functools import lru_cache
+
+import numpy as np
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db.session import SessionLocal
 from app.models.query_cache import QueryCache
 from app.models.cache_document_map import CacheDocumentMap
 from app.models.cache_statistics import CacheStatistics
+from app.services.cache_hit_queue import CacheHitQueue
 
 # SPRINT 13 - Monitoring : Import des métriques Prometheus
 from app.core.metrics import (
@@ -46,14 +55,48 @@ DEFAULT_CACHE_TTL_DAYS = 7
 DEFAULT_SIMILARITY_THRESHOLD = 0.95
 DEFAULT_EMBEDDING_DIMENSION = 1024
 
+# Format de stockage des embeddings du cache (float32 big-endian)
+EMBEDDING_DTYPE = np.dtype(">f4")
+
+# Durée de validité de la config cache en mémoire (secondes)
+CACHE_CONFIG_TTL_SECONDS = 30
+
+# Cache L1 local (par processus) : nombre maximal d'entrées et durée de
+# validité (secondes), qui borne le décalage avec les invalidations faites
+# par les autres workers
+L1_LOCAL_MAX_ENTRIES = 1024
+L1_LOCAL_TTL_SECONDS = 30
+
+# Intervalle minimal entre deux vérifications de la signature L2 en base
+# (secondes) : entre deux, la matrice en mémoire est utilisée telle quelle
+L2_SYNC_INTERVAL_SECONDS = 5
+
+# Colonnes lues pour servir un hit : SELECT Core (tuples, sans objet ORM
+# ni identity map), sans embedding ni mappings documents
+HIT_COLUMNS = (
+    QueryCache.id,
+    QueryCache.query_text,
+    QueryCache.response,
+    QueryCache.sources,
+    QueryCache.token_count,
+    QueryCache.cost_saved_usd,
+    QueryCache.cost_saved_xaf,
+    QueryCache.hit_count,
+)
+
 
 # =============================================================================
 # FONCTIONS POUR RÉCUPÉRER LES CONFIGS DEPUIS LA DB
 # =============================================================================
 
-def get_cache_config() -> Dict[str, Any]:
+_cache_config: Optional[Dict[str, Any]] = None
+_cache_config_expires_at = 0.0
+_cache_config_lock = threading.Lock()
+
+
+def _load_cache_config() -> Dict[str, Any]:
     """
-    Récupère la configuration du cache depuis la DB.
+    Lit la configuration du cache depuis la DB.
     
     Returns:
         Dict avec ttl_days, similarity_threshold
@@ -85,6 +128,37 @@ def get_cache_config() -> Dict[str, Any]:
         }
 
 
+def get_cache_config() -> Dict[str, Any]:
+    """
+    Récupère la configuration du cache (copie mémoire de
+    CACHE_CONFIG_TTL_SECONDS secondes, la DB n'est relue qu'à expiration).
+    
+    Returns:
+        Dict avec ttl_days, similarity_threshold
+    """
+    global _cache_config, _cache_config_expires_at
+    
+    with _cache_config_lock:
+        if _cache_config is not None and time.monotonic() < _cache_config_expires_at:
+            return _cache_config
+    
+    config = _load_cache_config()
+    
+    with _cache_config_lock:
+        _cache_config = config
+        _cache_config_expires_at = time.monotonic() + CACHE_CONFIG_TTL_SECONDS
+    
+    return config
+
+
+def invalidate_cache_config() -> None:
+    """Force la relecture de la configuration du cache au prochain accès."""
+    global _cache_config
+    
+    with _cache_config_lock:
+        _cache_config = None
+
+
 def get_cache_ttl_days() -> int:
     """Récupère le TTL du cache en jours."""
     config = get_cache_config()
@@ -98,34 +172,35 @@ def get_similarity_threshold() -> float:
 
 
 # =============================================================================
-# UTILITAIRES MATHÉMATIQUES
+# UTILITAIRES
 # =============================================================================
 
-def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
+def encode_embedding(embedding: Optional[List[float]]) -> Optional[bytes]:
     """
-    Calcule la similarité cosine entre deux vecteurs.
+    Normalise un embedding (norme L2 = 1) et l'encode pour stockage.
+    
+    Les embeddings unitaires rendent la similarité cosine égale au
+    produit scalaire ; le format float32 big-endian (4 octets/dimension)
+    est celui de float4send côté PostgreSQL.
     
     Args:
-        vec1: Premier vecteur
-        vec2: Deuxième vecteur
+        embedding: Vecteur embedding
     
     Returns:
-        Similarité cosine entre 0 et 1
+        Octets du vecteur unitaire, None si vide ou de norme nulle
     """
-    if not vec1 or not vec2 or len(vec1) != len(vec2):
-        return 0.0
-    
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    norm1 = math.sqrt(sum(a * a for a in vec1))
-    norm2 = math.sqrt(sum(b * b for b in vec2))
+    if not embedding:
+        return None
     
-    if norm1 == 0 or norm2 == 0:
-        return 0.0
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        return None
     
-    return dot_product / (norm1 * norm2)
+    return (vector / norm).astype(EMBEDDING_DTYPE).tobytes()
 
 
-def compute_query_hash(query: str) -> str:
+def compute_query_hash(query: str) -> bytes:
     """
     Calcule le hash SHA-256 d'une requête.
     
@@ -133,11 +208,18 @@ def compute_query_hash(query: str) -> str:
         query: Texte de la requête
     
     Returns:
-        Hash SHA-256 de 64 caractères
+        Digest SHA-256 brut (32 octets, colonne BYTEA)
     """
-    # Normalisation : lowercase, strip, collapse whitespace
-    normalized = " ".join(query.lower().strip().split())
-    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    # Normalisation : lowercase, collapse whitespace (split() sans argument
+    # ignore aussi les espaces de début/fin). Plus rapide qu'un re.sub(r"\s+")
+    # et produit les mêmes hash que les entrées déjà en base.
+    normalized = " ".join(query.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).digest()
+
+
+def _now() -> datetime:
+    """Instant courant (UTC, avec fuseau) : colonnes timestamptz du cache."""
+    return datetime.now(timezone.utc)
 
 
 # =============================================================================
@@ -158,12 +240,25 @@ class CacheService:
     """
     
     def __init__(self):
-        """Initialise le CacheService."""
-        config = get_cache_config()
-        logger.info(
-            f"CacheService initialisé - TTL: {config['ttl_days']} jours, "
-            f"Seuil similarité: {config['similarity_threshold']} (depuis DB)"
-        )
+        """
+        Initialise le CacheService.
+        
+        Aucun accès DB ici : la configuration (TTL, seuil) est lue à la
+        demande via get_cache_config().
+        """
+        logger.info("CacheService initialisé")
+        
+        # Matrice L2 en mémoire : embeddings normalisés (float32, [N, d])
+        # et ids des entrées correspondantes (même ordre)
+        self._l2_lock = threading.Lock()
+        self._l2_matrix: Optional[np.ndarray] = None
+        self._l2_ids: List[Any] = []
+        self._l2_signature: Optional[Tuple[Any, ...]] = None
+        self._l2_checked_at = 0.0
+        
+        # Cache L1 local (LRU) : query_hash -> (échéance monotonic, entrée)
+        self._l1_lock = threading.Lock()
+        self._l1_local: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
     
     def _validate_document_ids(
         self,
@@ -186,30 +281,36 @@ class CacheService:
         from uuid import UUID
         from app.models.document import Document
         
-        valid_ids = []
-        
+        # Conversion en UUID (ordre conservé, doublons et IDs invalides ignorés)
+        uuids: Dict[str, UUID] = {}
         for doc_id in document_ids:
             # Ignorer les IDs vides
             if not doc_id:
                 continue
             
             try:
-                # Tenter de convertir en UUID
                 uuid_obj = UUID(str(doc_id))
-                
-                # Vérifier si le document existe
-                exists = db.query(Document.id).filter(
-                    Document.id == uuid_obj
-                ).first()
-                
-                if exists:
-                    valid_ids.append(str(uuid_obj))
-                else:
-                    logger.debug(f"Document ID non trouvé dans DB, ignoré: {doc_id}")
-                    
-            except (ValueError, AttributeError) as e:
+            except (ValueError, AttributeError):
                 logger.debug(f"Document ID invalide (pas un UUID), ignoré: {doc_id}")
                 continue
+            
+            uuids.setdefault(str(uuid_obj), uuid_obj)
+        
+        if not uuids:
+            return []
+        
+        # Vérifier l'existence de tous les documents en une seule requête
+        found = {
+            str(row[0])
+            for row in db.query(Document.id).filter(Document.id.in_(list(uuids.values()))).all()
+        }
+        
+        valid_ids = []
+        for doc_id in uuids:
+            if doc_id in found:
+                valid_ids.append(doc_id)
+            else:
+                logger.debug(f"Document ID non trouvé dans DB, ignoré: {doc_id}")
         
         logger.debug(f"Document IDs validés: {len(valid_ids)}/{len(document_ids)}")
         
@@ -222,32 +323,51 @@ class CacheService:
     def check_cache_level1(
         self,
         query: str,
-        db: Session
+        db: Session,
+        query_hash: Optional[bytes] = None,
+        now: Optional[datetime] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Vérifie le cache de niveau 1 (correspondance exacte).
         
         Recherche une correspondance exacte via le hash SHA-256 de la requête.
-        Si trouvé : incrémente hit_count, réinitialise TTL, retourne la réponse.
+        Si trouvé : met le hit en file (hit_count, TTL, statistiques) et
+        retourne la réponse.
         
         SPRINT 13: Enregistre les métriques Prometheus en cas de hit.
         
         Args:
             query: Texte de la requête utilisateur
             db: Session de base de données
+            query_hash: Hash déjà calculé de la requête (évite un recalcul)
+            now: Instant de la requête (défaut: maintenant)
         
         Returns:
             Dict avec response, sources, cache_level si trouvé, None sinon
         """
-        query_hash = compute_query_hash(query)
+        if query_hash is None:
+            query_hash = compute_query_hash(query)
+        if now is None:
+            now = _now()
+        
+        # Cache local d'abord : aucun accès à la base
+        entry = self._get_l1_local(query_hash)
+        if entry is not None:
+            logger.info(f"Cache L1 - Hit local (id={entry['cache_id']})")
+            self._enqueue_l1_hit(entry, now)
+            record_cache_operation(
+                operation="hit",
+                level="level1"
+            )
+            return self._l1_result(entry)
         
-        logger.debug(f"Cache L1 - Recherche hash: {query_hash[:16]}...")
+        logger.debug(f"Cache L1 - Recherche hash: {query_hash[:8].hex()}...")
         
         # Recherche dans la DB
-        cache_entry = db.query(QueryCache).filter(
-            and_(
+        cache_entry = db.execute(
+            select(*HIT_COLUMNS).where(
                 QueryCache.query_hash == query_hash,
-                QueryCache.expires_at > datetime.utcnow()
+                QueryCache.expires_at > now
             )
         ).first()
         
@@ -258,18 +378,22 @@ class CacheService:
         # Hit trouvé
         logger.info(f"Cache L1 - Hit! (id={cache_entry.id}, hits={cache_entry.hit_count})")
         
-        # Mettre à jour les statistiques
-        cache_entry.increment_hit()
-        cache_entry.reset_ttl(days=get_cache_ttl_days())
-        db.commit()
+        entry = {
+            "cache_id": cache_entry.id,
+            "response": cache_entry.response,
+            "sources": cache_entry.sources,
+            "hit_count": cache_entry.hit_count,
+            "token_count": cache_entry.token_count,
+            "cost_usd": float(cache_entry.cost_saved_usd),
+            "cost_xaf": float(cache_entry.cost_saved_xaf),
+            "query_text": cache_entry.query_text
+        }
         
-        # Enregistrer dans les statistiques journalières
-        self._record_cache_hit(
-            db=db,
-            tokens=cache_entry.token_count,
-            cost_usd=float(cache_entry.cost_saved_usd),
-            cost_xaf=float(cache_entry.cost_saved_xaf)
-        )
+        # Mise à jour de l'entrée et des statistiques en arrière-plan
+        self._enqueue_l1_hit(entry, now)
+        
+        self._put_l1_local(query_hash, entry)
+        result = self._l1_result(entry)
         
         # SPRINT 13 - Monitoring : Enregistrer le hit L1
         record_cache_operation(
@@ -277,16 +401,70 @@ class CacheService:
             level="level1"
         )
         
+        return result
+    
+    @staticmethod
+    def _l1_result(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Construit la réponse d'un hit L1 depuis une entrée locale."""
         return {
-            "cache_id": str(cache_entry.id),
-            "response": cache_entry.response,
-            "sources": cache_entry.sources,
+            "cache_id": str(entry["cache_id"]),
+            "response": entry["response"],
+            "sources": entry["sources"],
             "cache_level": 1,
-            "hit_count": cache_entry.hit_count,
-            "token_count": cache_entry.token_count,
-            "query_text": cache_entry.query_text
+            "hit_count": entry["hit_count"],
+            "token_count": entry["token_count"],
+            "query_text": entry["query_text"]
         }
     
+    def _get_l1_local(self, query_hash: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Retourne l'entrée L1 locale de ce hash si elle est encore valide.
+        
+        Chaque hit repousse expires_at d'au moins un jour : la durée de
+        validité locale (L1_LOCAL_TTL_SECONDS) expire toujours avant.
+        """
+        with self._l1_lock:
+            item = self._l1_local.get(query_hash)
+            if item is None:
+                return None
+            
+            valid_until, entry = item
+            if time.monotonic() >= valid_until:
+                del self._l1_local[query_hash]
+                return None
+            
+            self._l1_local.move_to_end(query_hash)
+            return entry
+    
+    def _put_l1_local(self, query_hash: bytes, entry: Dict[str, Any]) -> None:
+        """Ajoute une entrée au cache L1 local (éviction LRU)."""
+        with self._l1_lock:
+            self._l1_local[query_hash] = (time.monotonic() + L1_LOCAL_TTL_SECONDS, entry)
+            self._l1_local.move_to_end(query_hash)
+            while len(self._l1_local) > L1_LOCAL_MAX_ENTRIES:
+                self._l1_local.popitem(last=False)
+    
+    def _invalidate_l1_local(self, query_hash: Optional[bytes] = None) -> None:
+        """Retire une entrée (ou toutes si query_hash est None) du cache L1 local."""
+        with self._l1_lock:
+            if query_hash is None:
+                self._l1_local.clear()
+            else:
+                self._l1_local.pop(query_hash, None)
+    
+    @staticmethod
+    def _enqueue_l1_hit(entry: Dict[str, Any], now: datetime) -> None:
+        """Met un hit L1 en file et incrémente le compteur de l'entrée locale."""
+        CacheHitQueue.enqueue(
+            cache_id=entry["cache_id"],
+            tokens=entry["token_count"],
+            cost_usd=entry["cost_usd"],
+            cost_xaf=entry["cost_xaf"],
+            ttl_days=get_cache_ttl_days(),
+            hit_at=now
+        )
+        entry["hit_count"] += 1
+    
     # =========================================================================
     # CACHE LEVEL 2 - SIMILARITÉ SÉMANTIQUE
     # =========================================================================
@@ -295,14 +473,16 @@ class CacheService:
         self,
         query: str,
         query_embedding: List[float],
-        db: Session
+        db: Session,
+        now: Optional[datetime] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Vérifie le cache de niveau 2 (similarité sémantique).
         
         Recherche une requête similaire via cosine similarity sur les embeddings.
         Seuil configurable (défaut: 0.95 = 95% de similarité).
-        Si trouvé : incrémente hit_count, réinitialise TTL, retourne la réponse.
+        Si trouvé : met le hit en file (hit_count, TTL, statistiques) et
+        retourne la réponse.
         
         SPRINT 13: Enregistre les métriques Prometheus en cas de hit.
         
@@ -310,6 +490,7 @@ class CacheService:
             query: Texte de la requête utilisateur
             query_embedding: Vecteur embedding de la requête
             db: Session de base de données
+            now: Instant de la requête (défaut: maintenant)
         
         Returns:
             Dict avec response, sources, cache_level, similarity si trouvé, None sinon
@@ -317,75 +498,208 @@ class CacheService:
         if not query_embedding:
             logger.warning("Cache L2 - Embedding vide, skip")
             return None
+        if now is None:
+            now = _now()
         
         threshold = get_similarity_threshold()
         logger.debug(f"Cache L2 - Recherche similarité > {threshold}")
         
-        # Récupérer tous les caches non expirés avec embedding
-        cache_entries = db.query(QueryCache).filter(
-            and_(
-                QueryCache.query_embedding.isnot(None),
-                QueryCache.expires_at > datetime.utcnow()
-            )
-        ).all()
+        matrix, cache_ids = self._get_l2_matrix(db, now)
         
-        if not cache_entries:
+        if matrix is None:
             logger.debug("Cache L2 - Aucun cache avec embedding disponible")
             return None
         
-        # Rechercher la meilleure correspondance
-        best_match = None
-        best_similarity = 0.0
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query_vector)
         
-        for entry in cache_entries:
-            if not entry.query_embedding:
-                continue
-            
-            similarity = cosine_similarity(query_embedding, entry.query_embedding)
-            
-            if similarity > threshold and similarity > best_similarity:
-                best_similarity = similarity
-                best_match = entry
+        if query_vector.shape != (matrix.shape[1],) or query_norm == 0:
+            logger.debug("Cache L2 - Dimension d'embedding incompatible, skip")
+            return None
         
-        if best_match is None:
+        # Produits scalaires de toutes les entrées (unitaires) en un seul
+        # produit matrice-vecteur ; la norme de la requête ne change pas
+        # l'argmax, seul le meilleur score est divisé
+        scores = matrix @ query_vector
+        best_index = int(np.argmax(scores))
+        best_similarity = float(scores[best_index] / query_norm)
+        
+        if best_similarity <= threshold:
             logger.debug(f"Cache L2 - Miss (meilleure similarité: {best_similarity:.4f})")
             return None
         
+        # Seule l'entrée retenue est chargée, sans son embedding
+        best_match = db.execute(
+            select(*HIT_COLUMNS).where(
+                QueryCache.id == cache_ids[best_index],
+                QueryCache.expires_at > now
+            )
+        ).first()
+        
+        if best_match is None:
+            # Entrée supprimée ou expirée depuis la construction de la matrice
+            logger.debug("Cache L2 - Miss (entrée disparue, matrice invalidée)")
+            self._invalidate_l2_matrix()
+            return None
+        
         # Hit trouvé
         logger.info(
             f"Cache L2 - Hit! (id={best_match.id}, similarity={best_similarity:.4f}, "
             f"hits={best_match.hit_count})"
         )
         
-        # Mettre à jour les statistiques
-        best_match.increment_hit()
-        best_match.reset_ttl(days=get_cache_ttl_days())
-        db.commit()
-        
-        # Enregistrer dans les statistiques journalières
-        self._record_cache_hit(
-            db=db,
+        # Mise à jour de l'entrée et des statistiques en arrière-plan
+        CacheHitQueue.enqueue(
+            cache_id=best_match.id,
             tokens=best_match.token_count,
             cost_usd=float(best_match.cost_saved_usd),
-            cost_xaf=float(best_match.cost_saved_xaf)
+            cost_xaf=float(best_match.cost_saved_xaf),
+            ttl_days=get_cache_ttl_days(),
+            hit_at=now
         )
         
-        # SPRINT 13 - Monitoring : Enregistrer le hit L2
-        record_cache_operation(
-            operation="hit",
-            level="level2"
-        )
-        
-        return {
+        result = {
             "cache_id": str(best_match.id),
             "response": best_match.response,
             "sources": best_match.sources,
             "cache_level": 2,
             "similarity": best_similarity,
-            "hit_count": best_match.hit_count,
+            "hit_count": best_match.hit_count + 1,
             "token_count": best_match.token_count,
             "query_text": best_match.query_text
         }
+        
+        # SPRINT 13 - Monitoring : Enregistrer le hit L2
+        record_cache_operation(
+            operation="hit",
+            level="level2"
+        )
+        
+        return result
+    
+    def _get_l2_matrix(
+        self,
+        db: Session,
+        now: datetime
+    ) -> Tuple[Optional[np.ndarray], List[Any]]:
+        """
+        Retourne la matrice des embeddings L2 normalisés et les ids associés.
+        
+        La signature des entrées actives (nombre, dernière création) est
+        vérifiée au plus toutes les L2_SYNC_INTERVAL_SECONDS ; la matrice
+        n'est reconstruite que si elle a changé, y compris par un autre
+        processus.
+        
+        Args:
+            db: Session de base de données
+            now: Instant de la requête (entrées expirées exclues)
+        
+        Returns:
+            Tuple (matrice [N, d] ou None si aucune entrée, liste des ids)
+        """
+        with self._l2_lock:
+            if (
+                self._l2_signature is not None
+                and time.monotonic() - self._l2_checked_at < L2_SYNC_INTERVAL_SECONDS
+            ):
+                return self._l2_matrix, self._l2_ids
+        
+        active = and_(
+            QueryCache.query_embedding.isnot(None),
+            QueryCache.expires_at > now
+        )
+        signature = tuple(
+            db.execute(
+                select(func.count(QueryCache.id), func.max(QueryCache.created_at))
+                .where(active)
+            ).one()
+        )
+        
+        with self._l2_lock:
+            if signature == self._l2_signature:
+                self._l2_checked_at = time.monotonic()
+                return self._l2_matrix, self._l2_ids
+        
+        # Aucune entrée active (cache vide ou tout expiré) : pas de scan
+        rows = db.execute(
+            select(QueryCache.id, QueryCache.query_embedding).where(active)
+        ).all() if signature[0] else []
+        
+        cache_ids = []
+        blobs = []
+        for cache_id, embedding in rows:
+            # Une seule dimension par matrice (celle de la première entrée)
+            if not embedding or (blobs and len(embedding) != len(blobs[0])):
+                continue
+            cache_ids.append(cache_id)
+            blobs.append(embedding)
+        
+        matrix = None
+        if blobs:
+            # Embeddings stockés unitaires (encode_embedding) : la
+            # normalisation ci-dessous reste une garantie peu coûteuse,
+            # exécutée seulement à la reconstruction
+            # float32 conservé : en int8, le produit NumPy est plus lent (pas
+            # de noyau BLAS entier) et l'erreur (~0.01) dépasse la marge du seuil
+            matrix = (
+                np.frombuffer(b"".join(blobs), dtype=EMBEDDING_DTYPE)
+                .reshape(len(blobs), -1)
+                .astype(np.float32)
+            )
+            norms = np.linalg.norm(matrix, axis=1)
+            nonzero = norms > 0
+            if not nonzero.all():
+                matrix = matrix[nonzero]
+                norms = norms[nonzero]
+                cache_ids = [cache_id for cache_id, keep in zip(cache_ids, nonzero) if keep]
+            # Normalisation sur place (pas de copie supplémentaire de la matrice)
+            matrix /= norms[:, np.newaxis]
+            if not cache_ids:
+                matrix = None
+        
+        with self._l2_lock:
+            self._l2_matrix = matrix
+            self._l2_ids = cache_ids
+            self._l2_signature = signature
+            self._l2_checked_at = time.monotonic()
+        
+        logger.debug(f"Cache L2 - Matrice reconstruite ({len(cache_ids)} entrées)")
+        
+        return matrix, cache_ids
+    
+    def _append_l2_entry(self, cache_id: Any, embedding_bytes: Optional[bytes]) -> None:
+        """
+        Ajoute une nouvelle entrée à la matrice L2 en mémoire.
+        
+        La matrice et la liste des ids sont recopiées (pas de modification
+        sur place des tableaux déjà retournés à d'autres threads). La
+        signature n'est pas modifiée : la prochaine vérification resynchronise
+        la matrice avec la base.
+        """
+        if embedding_bytes is None:
+            return
+        
+        row = np.frombuffer(embedding_bytes, dtype=EMBEDDING_DTYPE).astype(np.float32)
+        
+        with self._l2_lock:
+            if self._l2_signature is None:
+                # Pas encore construite : elle le sera au prochain lookup
+                return
+            
+            if self._l2_matrix is None:
+                self._l2_matrix = row[np.newaxis, :]
+            elif self._l2_matrix.shape[1] == row.shape[0]:
+                self._l2_matrix = np.vstack((self._l2_matrix, row))
+            else:
+                return
+            self._l2_ids = self._l2_ids + [cache_id]
+    
+    def _invalidate_l2_matrix(self) -> None:
+        """Force la reconstruction de la matrice L2 au prochain lookup."""
+        with self._l2_lock:
+            self._l2_matrix = None
+            self._l2_ids = []
+            self._l2_signature = None
     
     # =========================================================================
     # RECHERCHE DANS LE CACHE
@@ -395,7 +709,8 @@ class CacheService:
         self,
         query: str,
         query_embedding: Optional[List[float]],
-        db: Session
+        db: Session,
+        query_hash: Optional[bytes] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Vérifie le cache à tous les niveaux (L1 puis L2).
@@ -408,27 +723,31 @@ class CacheService:
             query: Texte de la requête
             query_embedding: Embedding de la requête (optionnel pour L2)
             db: Session de base de données
+            query_hash: Hash déjà calculé de la requête (optionnel)
         
         Returns:
             Résultat du cache si trouvé, None sinon
         """
+        # Un seul instant pour toute la requête (expiration, jour des stats)
+        now = _now()
+        
         # Essayer L1 d'abord (plus rapide)
-        result = self.check_cache_level1(query, db)
+        result = self.check_cache_level1(query, db, query_hash=query_hash, now=now)
         if result:
             # SPRINT 13 - Monitoring : Mettre à jour le hit rate
-            self._update_cache_metrics(db)
+            self._update_cache_metrics(db, now.date())
             return result
         
         # Essayer L2 si embedding disponible
         if query_embedding:
-            result = self.check_cache_level2(query, query_embedding, db)
+            result = self.check_cache_level2(query, query_embedding, db, now=now)
             if result:
                 # SPRINT 13 - Monitoring : Mettre à jour le hit rate
-                self._update_cache_metrics(db)
+                self._update_cache_metrics(db, now.date())
                 return result
         
         # Enregistrer le miss
-        self._record_cache_miss(db)
+        self._record_cache_miss(db, now.date())
         
         # SPRINT 13 - Monitoring : Enregistrer le miss
         record_cache_operation(
@@ -437,7 +756,7 @@ class CacheService:
         )
         
         # SPRINT 13 - Monitoring : Mettre à jour le hit rate
-        self._update_cache_metrics(db)
+        self._update_cache_metrics(db, now.date())
         
         return None
     
@@ -455,7 +774,8 @@ class CacheService:
         tokens: int,
         cost_usd: float,
         cost_xaf: float,
-        db: Session
+        db: Session,
+        query_hash: Optional[bytes] = None
     ) -> QueryCache:
         """
         Sauvegarde une requête et sa réponse dans le cache.
@@ -472,14 +792,19 @@ class CacheService:
             cost_usd: Coût en USD
             cost_xaf: Coût en XAF
             db: Session de base de données
+            query_hash: Hash déjà calculé lors de la vérification du cache
         
         Returns:
             L'objet QueryCache créé
         """
-        query_hash = compute_query_hash(query)
+        if query_hash is None:
+            query_hash = compute_query_hash(query)
         ttl_days = get_cache_ttl_days()
         
-        logger.info(f"Sauvegarde cache - Hash: {query_hash[:16]}..., TTL: {ttl_days} jours")
+        logger.info(f"Sauvegarde cache - Hash: {query_hash[:8].hex()}..., TTL: {ttl_days} jours")
+        
+        # Embedding stocké unitaire en float32 (similarité L2 = produit scalaire)
+        embedding_bytes = encode_embedding(query_embedding)
         
         # Valider les document_ids avant insertion pour éviter FK violation
         valid_document_ids = self._validate_document_ids(document_ids, db)
@@ -494,7 +819,7 @@ class CacheService:
             logger.info(f"Cache existant trouvé (id={existing.id}), mise à jour")
             existing.response = response
             existing.sources = sources
-            existing.query_embedding = query_embedding
+            existing.query_embedding = embedding_bytes
             existing.token_count = tokens
             existing.cost_saved_usd = Decimal(str(cost_usd))
             existing.cost_saved_xaf = Decimal(str(cost_xaf))
@@ -503,17 +828,14 @@ class CacheService:
             # Supprimer les anciens mappings et créer les nouveaux
             db.query(CacheDocumentMap).filter(
                 CacheDocumentMap.cache_id == existing.id
-            ).delete()
-            
-            for doc_id in valid_document_ids:
-                mapping = CacheDocumentMap(
-                    cache_id=existing.id,
-                    document_id=doc_id
-                )
-                db.add(mapping)
+            ).delete(synchronize_session=False)
+            self._insert_document_maps(existing.id, valid_document_ids, db)
             
+            # Pas de refresh : l'appelant n'a pas besoin de recharger la
+            # ligne (embedding, sources) après le commit
             db.commit()
-            db.refresh(existing)
+            self._invalidate_l1_local(query_hash)
+            self._invalidate_l2_matrix()
             
             # SPRINT 13 - Monitoring : Mettre à jour le nombre d'entrées
             self._update_cache_entries_metric(db)
@@ -524,36 +846,55 @@ class CacheService:
         cache_entry = QueryCache(
             query_text=query,
             query_hash=query_hash,
-            query_embedding=query_embedding,
+            query_embedding=embedding_bytes,
             response=response,
             sources=sources,
             token_count=tokens,
             cost_saved_usd=Decimal(str(cost_usd)),
             cost_saved_xaf=Decimal(str(cost_xaf)),
-            expires_at=datetime.utcnow() + timedelta(days=ttl_days)
+            expires_at=_now() + timedelta(days=ttl_days)
         )
         
         db.add(cache_entry)
         db.flush()  # Pour obtenir l'ID
         
         # Créer les mappings document avec les IDs validés
-        for doc_id in valid_document_ids:
-            mapping = CacheDocumentMap(
-                cache_id=cache_entry.id,
-                document_id=doc_id
-            )
-            db.add(mapping)
+        self._insert_document_maps(cache_entry.id, valid_document_ids, db)
         
+        # id lu avant le commit : après expiration, tout accès recharge la ligne
+        cache_id = cache_entry.id
         db.commit()
-        db.refresh(cache_entry)
+        self._append_l2_entry(cache_id, embedding_bytes)
         
-        logger.info(f"Cache créé - id={cache_entry.id}, documents={len(valid_document_ids)}")
+        logger.info(f"Cache créé - id={cache_id}, documents={len(valid_document_ids)}")
         
         # SPRINT 13 - Monitoring : Mettre à jour le nombre d'entrées
         self._update_cache_entries_metric(db)
         
         return cache_entry
     
+    def _insert_document_maps(
+        self,
+        cache_id: Any,
+        document_ids: List[Any],
+        db: Session
+    ) -> None:
+        """
+        Insère les mappings cache/documents en un seul INSERT multi-lignes.
+        
+        Args:
+            cache_id: ID de l'entrée de cache
+            document_ids: IDs de documents validés (sans doublon)
+            db: Session de base de données
+        """
+        if not document_ids:
+            return
+        
+        db.execute(
+            CacheDocumentMap.__table__.insert(),
+            [{"cache_id": cache_id, "document_id": doc_id} for doc_id in document_ids]
+        )
+    
     # =========================================================================
     # INVALIDATION DU CACHE
     # =========================================================================
@@ -578,25 +919,23 @@ class CacheService:
         """
         logger.info(f"Invalidation cache pour document: {document_id}")
         
-        # Trouver tous les mappings pour ce document
-        mappings = db.query(CacheDocumentMap).filter(
+        # Supprimer en une requête les entrées de cache utilisant ce document
+        # (ON DELETE CASCADE supprime les mappings)
+        document_cache_ids = db.query(CacheDocumentMap.cache_id).filter(
             CacheDocumentMap.document_id == document_id
-        ).all()
+        )
+        deleted_count = db.query(QueryCache).filter(
+            QueryCache.id.in_(document_cache_ids.scalar_subquery())
+        ).delete(synchronize_session=False)
         
-        if not mappings:
+        if not deleted_count:
             logger.debug("Aucun cache à invalider pour ce document")
             return 0
         
-        # Extraire les cache_ids uniques
-        cache_ids = list(set(m.cache_id for m in mappings))
-        
-        # Supprimer les entrées de cache (cascade supprime les mappings)
-        deleted_count = db.query(QueryCache).filter(
-            QueryCache.id.in_(cache_ids)
-        ).delete(synchronize_session=False)
-        
         db.commit()
         
+        self._invalidate_l1_local()
+        self._invalidate_l2_matrix()
         logger.info(f"Caches invalidés: {deleted_count}")
         
         # SPRINT 13 - Monitoring : Mettre à jour le nombre d'entrées
@@ -619,11 +958,12 @@ class CacheService:
         logger.info("Nettoyage des caches expirés")
         
         deleted_count = db.query(QueryCache).filter(
-            QueryCache.expires_at < datetime.utcnow()
+            QueryCache.expires_at < _now()
         ).delete(synchronize_session=False)
         
         db.commit()
         
+        self._invalidate_l2_matrix()
         logger.info(f"Caches expirés supprimés: {deleted_count}")
         
         # SPRINT 13 - Monitoring : Mettre à jour le nombre d'entrées
@@ -648,6 +988,8 @@ class CacheService:
         deleted_count = db.query(QueryCache).delete(synchronize_session=False)
         db.commit()
         
+        self._invalidate_l1_local()
+        self._invalidate_l2_matrix()
         logger.info(f"Tous les caches supprimés: {deleted_count}")
         
         # SPRINT 13 - Monitoring : Mettre à jour le nombre d'entrées (devrait être 0)
@@ -659,53 +1001,112 @@ class CacheService:
     # STATISTIQUES
     # =========================================================================
     
-    def _record_cache_hit(
-        self,
+    @staticmethod
+    def _record_cache_hits(
         db: Session,
+        day: date,
+        hits: int,
         tokens: int,
-        cost_usd: float,
-        cost_xaf: float
+        cost_usd: Decimal,
+        cost_xaf: Decimal
     ) -> None:
-        """Enregistre un hit dans les statistiques journalières."""
-        today = date.today()
-        
-        stats = db.query(CacheStatistics).filter(
-            CacheStatistics.date == today
-        ).first()
-        
-        if stats is None:
-            stats = CacheStatistics(date=today)
-            db.add(stats)
+        """
+        Enregistre un lot de hits dans les statistiques d'un jour.
         
-        stats.increment_hit(tokens=tokens, cost_usd=cost_usd, cost_xaf=cost_xaf)
+        Upsert sur la date, sans commit : appelé par CacheHitQueue avec la
+        mise à jour des entrées de cache.
+        """
+        stats = CacheStatistics.__table__.c
+        CacheService._upsert_daily_statistics(
+            db,
+            day=day,
+            requests=hits,
+            insert_values={
+                "cache_hits": hits,
+                "cache_misses": 0,
+                "hit_rate": 100,
+                "tokens_saved": tokens,
+                "cost_saved_usd": cost_usd,
+                "cost_saved_xaf": cost_xaf,
+            },
+            update_values={
+                "cache_hits": stats.cache_hits + hits,
+                "hit_rate": func.round(
+                    (stats.cache_hits + hits) * 100.0 / (stats.total_requests + hits), 2
+                ),
+                "tokens_saved": stats.tokens_saved + tokens,
+                "cost_saved_usd": stats.cost_saved_usd + cost_usd,
+                "cost_saved_xaf": stats.cost_saved_xaf + cost_xaf,
+            }
+        )
+    
+    def _record_cache_miss(self, db: Session, day: date) -> None:
+        """Enregistre un miss dans les statistiques du jour (UTC) de la requête."""
+        stats = CacheStatistics.__table__.c
+        self._upsert_daily_statistics(
+            db,
+            day=day,
+            requests=1,
+            insert_values={
+                "cache_hits": 0,
+                "cache_misses": 1,
+                "hit_rate": 0,
+                "tokens_saved": 0,
+                "cost_saved_usd": 0,
+                "cost_saved_xaf": 0,
+            },
+            update_values={
+                "cache_misses": stats.cache_misses + 1,
+                "hit_rate": func.round(
+                    stats.cache_hits * 100.0 / (stats.total_requests + 1), 2
+                ),
+            }
+        )
         db.commit()
     
-    def _record_cache_miss(self, db: Session) -> None:
-        """Enregistre un miss dans les statistiques journalières."""
-        today = date.today()
-        
-        stats = db.query(CacheStatistics).filter(
-            CacheStatistics.date == today
-        ).first()
-        
-        if stats is None:
-            stats = CacheStatistics(date=today)
-            db.add(stats)
+    @staticmethod
+    def _upsert_daily_statistics(
+        db: Session,
+        day: date,
+        requests: int,
+        insert_values: Dict[str, Any],
+        update_values: Dict[str, Any]
+    ) -> None:
+        """
+        INSERT ... ON CONFLICT (date) DO UPDATE de la ligne d'un jour.
         
-        stats.increment_miss()
-        db.commit()
+        Args:
+            db: Session de base de données
+            day: Jour des statistiques
+            requests: Nombre de requêtes à ajouter
+            insert_values: Valeurs si la ligne du jour n'existe pas encore
+            update_values: Expressions appliquées si elle existe déjà
+        """
+        table = CacheStatistics.__table__
+        stmt = pg_insert(table).values(
+            date=day,
+            total_requests=requests,
+            **insert_values
+        ).on_conflict_do_update(
+            index_elements=[table.c.date],
+            set_={
+                "total_requests": table.c.total_requests + requests,
+                "updated_at": func.now(),
+                **update_values
+            }
+        )
+        db.execute(stmt)
     
-    def _update_cache_metrics(self, db: Session) -> None:
+    def _update_cache_metrics(self, db: Session, day: date) -> None:
         """
         Met à jour les métriques Prometheus du cache.
         
         SPRINT 13: Nouvelle méthode pour calculer et mettre à jour le cache hit rate.
         """
         try:
-            # Récupérer les stats d'aujourd'hui
-            today = date.today()
+            # Récupérer les stats du jour (UTC) de la requête
             stats = db.query(CacheStatistics).filter(
-                CacheStatistics.date == today
+                CacheStatistics.date == day
             ).first()
             
             if stats:
@@ -743,7 +1144,7 @@ class CacheService:
         """
         try:
             count = db.query(QueryCache).filter(
-                QueryCache.expires_at > datetime.utcnow()
+                QueryCache.expires_at > _now()
             ).count()
             return count
         except Exception as e:
@@ -765,7 +1166,7 @@ class CacheService:
         Returns:
             Dict avec les statistiques
         """
-        start_date = date.today() - timedelta(days=days - 1)
+        start_date = _now().date() - timedelta(days=days - 1)
         
         stats = db.query(CacheStatistics).filter(
             CacheStatistics.date >= start_date
@@ -826,9 +1227,7 @@ class CacheService:
 # SINGLETON INSTANCE
 # =============================================================================
 
-_cache_service: Optional[CacheService] = None
-
-
+@lru_cache(maxsize=1)
 def get_cache_service() -> CacheService:
     """
     Retourne une instance singleton du CacheService.
@@ -836,10 +1235,7 @@ def get_cache_service() -> CacheService:
     Returns:
         Instance CacheService
     """
-    global _cache_service
-    if _cache_service is None:
-        _cache_service = CacheService()
-    return _cache_service
+    return CacheService()
 
 
 # =============================================================================
@@ -849,7 +1245,8 @@ def get_cache_service() -> CacheService:
 def check_cache(
     query: str,
     query_embedding: Optional[List[float]],
-    db: Session
+    db: Session,
+    query_hash: Optional[bytes] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Raccourci pour vérifier le cache.
@@ -858,11 +1255,14 @@ def check_cache(
         query: Texte de la requête
         query_embedding: Embedding de la requête (optionnel)
         db: Session de base de données
+        query_hash: Hash déjà calculé de la requête (optionnel)
     
     Returns:
         Résultat du cache si trouvé
     """
-    return get_cache_service().check_cache(query, query_embedding, db)
+    return get_cache_service().get_cached_response(
+        query, query_embedding, db, query_hash=query_hash
+    )
 
 
 def save_to_cache(
@@ -874,7 +1274,8 @@ def save_to_cache(
     tokens: int,
     cost_usd: float,
     cost_xaf: float,
-    db: Session
+    db: Session,
+    query_hash: Optional[bytes] = None
 ) -> QueryCache:
     """
     Raccourci pour sauvegarder dans le cache.
@@ -888,7 +1289,8 @@ def save_to_cache(
         tokens=tokens,
         cost_usd=cost_usd,
         cost_xaf=cost_xaf,
-        db=db
+        db=db,
+        query_hash=query_hash
     )
 
 
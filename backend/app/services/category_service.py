@@ -1,60 +1,231 @@
 """Category service."""
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import func, and_, or_, tuple_, select, lambda_stmt, update, delete
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from typing import Optional
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import binascii
+import threading
+import time
 import uuid
 
 from app.models.category import Category
 from app.models.document import Document
 from app.models.user import User
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryWithStats
-from app.models.audit_log import AuditLog
+from app.services.audit_log_queue import AuditLogQueue
+
+
+# Columns returned by the writes and reads (no ORM instance, no relationship)
+CATEGORY_COLUMNS = (
+    Category.id,
+    Category.name,
+    Category.description,
+    Category.color,
+    Category.created_by,
+    Category.created_at,
+    Category.updated_at,
+)
+
+CATEGORY_STATS_COLUMNS = (
+    *CATEGORY_COLUMNS,
+    func.count(Document.id).label('document_count'),
+)
+
+
+# SQLSTATE unique_violation (UNIQUE constraint on categories.name)
+UNIQUE_VIOLATION = "23505"
+
+# SQLSTATE foreign_key_violation (documents.category_id ON DELETE RESTRICT)
+FOREIGN_KEY_VIOLATION = "23503"
+
+# In-process cache of category names by id (read on every document list
+# and indexing run, rarely written). The TTL bounds staleness across
+# workers; writes in this process invalidate immediately.
+CATEGORY_NAME_TTL_SECONDS = 60
+
+_category_names: dict[uuid.UUID, tuple[float, str]] = {}
+_category_names_lock = threading.Lock()
+
+
+def invalidate_category_names(category_id: Optional[uuid.UUID] = None) -> None:
+    """
+    Drop a cached category name (or all of them if category_id is None).
+    
+    Args:
+        category_id: Category UUID
+    """
+    with _category_names_lock:
+        if category_id is None:
+            _category_names.clear()
+        else:
+            _category_names.pop(category_id, None)
+
+
+def _name_conflict(db: Session, error: IntegrityError, name: str) -> HTTPException:
+    """
+    Roll back a failed write and map a duplicate name to a 400 error.
+    
+    Args:
+        db: Database session
+        error: Error raised by the flush/commit
+        name: Category name that was written
+        
+    Returns:
+        HTTPException to raise
+        
+    Raises:
+        IntegrityError: If the error is not a unique violation
+    """
+    db.rollback()
+    if getattr(error.orig, "pgcode", None) != UNIQUE_VIOLATION:
+        raise error
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Une catégorie avec le nom '{name}' existe déjà"
+    )
 
 
 class CategoryService:
     """Service for category management."""
     
+    @staticmethod
+    def encode_cursor(name: str, category_id: uuid.UUID) -> str:
+        """
+        Build an opaque keyset cursor pointing after a category.
+        
+        Args:
+            name: Name of the last category of the page
+            category_id: UUID of the last category of the page
+            
+        Returns:
+            URL-safe base64 cursor
+        """
+        return urlsafe_b64encode(f"{name}:{category_id}".encode("utf-8")).decode("ascii")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[str, uuid.UUID]:
+        """
+        Decode a keyset cursor built by encode_cursor.
+        
+        Args:
+            cursor: Opaque cursor
+            
+        Returns:
+            Tuple of (last name, last id)
+            
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        try:
+            # The name may contain ':', the UUID never does
+            decoded = urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            name, _, category_id = decoded.rpartition(":")
+            return name, uuid.UUID(category_id)
+        except (ValueError, UnicodeError, binascii.Error):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Curseur de pagination invalide"
+            )
+    
     @staticmethod
     def get_categories(
         db: Session,
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None,
-        include_stats: bool = False
-    ) -> tuple[list[Category], int]:
+        include_stats: bool = False,
+        cursor: Optional[str] = None
+    ) -> tuple[list, int]:
         """
         Get paginated list of categories.
         
         Args:
             db: Database session
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
             search: Optional search term (searches in name and description)
             include_stats: Whether to include document count
+            cursor: Keyset cursor of the previous page (see encode_cursor)
             
         Returns:
-            Tuple of (categories list, total count)
+            Tuple of (categories list, total count); with include_stats,
+            the items are dicts from get_all_categories_with_stats
         """
-        query = db.query(Category)
+        if include_stats:
+            # Document counts from one aggregated query, not one per category
+            return CategoryService.get_all_categories_with_stats(
+                db, skip=skip, limit=limit, search=search, cursor=cursor
+            )
+        
+        # No relationship is used by callers: fail fast on lazy loads
+        stmt = select(
+            Category,
+            func.count().over().label('total')
+        ).options(raiseload("*"))
         
-        # Apply search filter
+        # Apply search filter (served by the trigram index ix_categories_name_trgm)
         if search:
             search_term = f"%{search}%"
-            query = query.filter(
+            stmt = stmt.where(
                 or_(
                     Category.name.ilike(search_term),
                     Category.description.ilike(search_term)
                 )
             )
         
-        # Get total count
-        total = query.count()
+        # Page and total count in a single query
+        rows, total = CategoryService._fetch_page(db, stmt, skip, limit, cursor)
         
-        # Apply pagination and get results
-        categories = query.order_by(Category.name).offset(skip).limit(limit).all()
+        return [category for category, _ in rows], total
+    
+    @staticmethod
+    def _fetch_page(
+        db: Session,
+        stmt,
+        skip: int,
+        limit: int,
+        cursor: Optional[str]
+    ) -> tuple[list, int]:
+        """
+        Fetch one page of a listing query and the total count.
         
-        return categories, total
+        The page is positioned by keyset on (name, id) when a cursor is
+        given (index ix_categories_name_id, cost independent of the page
+        depth), by OFFSET otherwise (legacy page-number pagination).
+        
+        Args:
+            db: Database session
+            stmt: Listing select whose last column is count(*) OVER () AS total
+            skip: Number of records to skip (ignored when cursor is given)
+            limit: Maximum number of records to return
+            cursor: Keyset cursor of the previous page
+            
+        Returns:
+            Tuple of (rows, total count)
+        """
+        if cursor is None:
+            page = stmt.offset(skip)
+        else:
+            last_name, last_id = CategoryService.decode_cursor(cursor)
+            page = stmt.where(tuple_(Category.name, Category.id) > (last_name, last_id))
+        
+        rows = db.execute(page.order_by(Category.name, Category.id).limit(limit)).all()
+        
+        if rows and cursor is None:
+            # count(*) OVER () is computed before LIMIT/OFFSET
+            total = rows[0].total
+        elif rows or skip or cursor:
+            # After a cursor the window only counts the remaining rows, and a
+            # page past the end carries no row: count the whole listing
+            total = db.execute(
+                select(func.count()).select_from(stmt.subquery())
+            ).scalar()
+        else:
+            total = 0
+        
+        return rows, total
     
     @staticmethod
     def get_category_by_id(db: Session, category_id: uuid.UUID) -> Optional[Category]:
@@ -68,7 +239,11 @@ class CategoryService:
         Returns:
             Category or None if not found
         """
-        return db.query(Category).filter(Category.id == category_id).first()
+        # lambda_stmt: statement built and cached once, only the id is bound
+        stmt = lambda_stmt(
+            lambda: select(Category).options(raiseload("*")).where(Category.id == category_id)
+        )
+        return db.execute(stmt).scalars().first()
     
     @staticmethod
     def get_category_by_name(db: Session, name: str) -> Optional[Category]:
@@ -82,7 +257,37 @@ class CategoryService:
         Returns:
             Category or None if not found
         """
-        return db.query(Category).filter(Category.name == name).first()
+        stmt = lambda_stmt(
+            lambda: select(Category).options(raiseload("*")).where(Category.name == name)
+        )
+        return db.execute(stmt).scalars().first()
+    
+    @staticmethod
+    def get_category_name(db: Session, category_id: uuid.UUID) -> Optional[str]:
+        """
+        Get a category name, served from the in-process cache when fresh.
+        
+        Args:
+            db: Database session
+            category_id: Category UUID
+            
+        Returns:
+            Category name or None if not found
+        """
+        with _category_names_lock:
+            item = _category_names.get(category_id)
+        if item is not None and time.monotonic() < item[0]:
+            return item[1]
+        
+        name = db.execute(
+            lambda_stmt(lambda: select(Category.name).where(Category.id == category_id))
+        ).scalar()
+        if name is None:
+            return None
+        
+        with _category_names_lock:
+            _category_names[category_id] = (time.monotonic() + CATEGORY_NAME_TTL_SECONDS, name)
+        return name
     
     @staticmethod
     def create_category(
@@ -108,15 +313,7 @@ class CategoryService:
         Raises:
             HTTPException: If category with same name already exists
         """
-        # Check if category with same name exists
-        existing = CategoryService.get_category_by_name(db, category_data.name)
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Une catégorie avec le nom '{category_data.name}' existe déjà"
-            )
-        
-        # Create category
+        # Create category (duplicate names rejected by the UNIQUE constraint)
         category = Category(
             name=category_data.name,
             description=category_data.description,
@@ -125,15 +322,18 @@ class CategoryService:
         )
         
         db.add(category)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError as e:
+            raise _name_conflict(db, e, category_data.name)
         db.refresh(category)
         
-        # Create audit log
-        audit_log = AuditLog(
+        # Audit log written off the request path, once the category exists
+        AuditLogQueue.enqueue(
             user_id=created_by_id,
             action="CATEGORY_CREATED",
             entity_type="CATEGORY",
-            entity_id=str(category.id),
+            entity_id=category.id,
             details={
                 "name": category.name,
                 "description": category.description,
@@ -142,8 +342,6 @@ class CategoryService:
             ip_address=ip_address,
             user_agent=user_agent
         )
-        db.add(audit_log)
-        db.commit()
         
         return category
     
@@ -155,7 +353,7 @@ class CategoryService:
         updated_by_id: uuid.UUID,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None
-    ) -> Category:
+    ) -> dict:
         """
         Update a category.
         
@@ -168,49 +366,64 @@ class CategoryService:
             user_agent: User agent of the request
             
         Returns:
-            Updated category
+            Updated category fields
             
         Raises:
             HTTPException: If category not found or name conflict
         """
-        # Get category
-        category = CategoryService.get_category_by_id(db, category_id)
-        if not category:
+        update_data = category_data.model_dump(exclude_unset=True)
+        
+        if update_data:
+            # Single UPDATE ... FROM categories AS old RETURNING: the joined
+            # row is the pre-update snapshot, which gives the audit values
+            # without a prior SELECT. A rename onto an existing name is
+            # rejected by the UNIQUE constraint.
+            old = Category.__table__.alias("old")
+            stmt = update(Category).where(
+                Category.id == category_id,
+                old.c.id == Category.id
+            ).values(**update_data).returning(
+                *CATEGORY_COLUMNS,
+                old.c.name.label("old_name"),
+                old.c.description.label("old_description"),
+                old.c.color.label("old_color")
+            ).execution_options(synchronize_session=False)
+            try:
+                row = db.execute(stmt).first()
+            except IntegrityError as e:
+                raise _name_conflict(db, e, category_data.name)
+        else:
+            # Nothing to change: current values are also the old ones
+            row = db.execute(
+                select(
+                    *CATEGORY_COLUMNS,
+                    Category.name.label("old_name"),
+                    Category.description.label("old_description"),
+                    Category.color.label("old_color")
+                ).where(Category.id == category_id)
+            ).first()
+        
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Catégorie non trouvée"
             )
         
-        # Store old values for audit
         old_values = {
-            "name": category.name,
-            "description": category.description,
-            "color": category.color
+            "name": row.old_name,
+            "description": row.old_description,
+            "color": row.old_color
         }
         
-        # Check if new name conflicts with existing category
-        if category_data.name and category_data.name != category.name:
-            existing = CategoryService.get_category_by_name(db, category_data.name)
-            if existing:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Une catégorie avec le nom '{category_data.name}' existe déjà"
-                )
-        
-        # Update fields
-        update_data = category_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(category, field, value)
-        
         db.commit()
-        db.refresh(category)
+        invalidate_category_names(category_id)
         
-        # Create audit log
-        audit_log = AuditLog(
+        # Audit log written off the request path, once the update is committed
+        AuditLogQueue.enqueue(
             user_id=updated_by_id,
             action="CATEGORY_UPDATED",
             entity_type="CATEGORY",
-            entity_id=str(category.id),
+            entity_id=category_id,
             details={
                 "old_values": old_values,
                 "new_values": update_data
@@ -218,10 +431,8 @@ class CategoryService:
             ip_address=ip_address,
             user_agent=user_agent
         )
-        db.add(audit_log)
-        db.commit()
         
-        return category
+        return {column.key: row._mapping[column.key] for column in CATEGORY_COLUMNS}
     
     @staticmethod
     def delete_category(
@@ -244,48 +455,66 @@ class CategoryService:
         Raises:
             HTTPException: If category not found or has associated documents
         """
-        # Get category
-        category = CategoryService.get_category_by_id(db, category_id)
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Catégorie non trouvée"
-            )
-        
-        # Check if category has documents
-        document_count = db.query(func.count(Document.id)).filter(
-            Document.category_id == category_id
+        # Check if category has documents: EXISTS stops at the first one
+        # (none can reference a missing category)
+        has_documents = db.query(
+            db.query(Document.id).filter(Document.category_id == category_id).exists()
         ).scalar()
         
-        if document_count > 0:
+        if has_documents:
+            CategoryService._raise_has_documents(db, category_id)
+        
+        # Delete category, returning its data for the audit log. A document
+        # added since the check is caught by the FK (ON DELETE RESTRICT).
+        try:
+            row = db.execute(
+                delete(Category).where(Category.id == category_id).returning(
+                    Category.name, Category.description, Category.color
+                ).execution_options(synchronize_session=False)
+            ).first()
+        except IntegrityError as e:
+            db.rollback()
+            if getattr(e.orig, "pgcode", None) != FOREIGN_KEY_VIOLATION:
+                raise
+            CategoryService._raise_has_documents(db, category_id)
+        
+        if not row:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Impossible de supprimer cette catégorie car elle contient {document_count} document(s). Veuillez d'abord réassigner ou supprimer ces documents."
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Catégorie non trouvée"
             )
         
-        # Store category data for audit
-        category_data = {
-            "name": category.name,
-            "description": category.description,
-            "color": category.color
-        }
-        
-        # Delete category
-        db.delete(category)
         db.commit()
+        invalidate_category_names(category_id)
         
-        # Create audit log
-        audit_log = AuditLog(
+        # Audit log written off the request path, once the delete is committed
+        AuditLogQueue.enqueue(
             user_id=deleted_by_id,
             action="CATEGORY_DELETED",
             entity_type="CATEGORY",
-            entity_id=str(category_id),
-            details=category_data,
+            entity_id=category_id,
+            details=dict(row._mapping),
             ip_address=ip_address,
             user_agent=user_agent
         )
-        db.add(audit_log)
-        db.commit()
+    
+    @staticmethod
+    def _raise_has_documents(db: Session, category_id: uuid.UUID) -> None:
+        """
+        Refuse the deletion of a category that still has documents.
+        
+        The documents are counted here only, for the error message.
+        
+        Raises:
+            HTTPException: Always
+        """
+        document_count = db.query(func.count(Document.id)).filter(
+            Document.category_id == category_id
+        ).scalar()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Impossible de supprimer cette catégorie car elle contient {document_count} document(s). Veuillez d'abord réassigner ou supprimer ces documents."
+        )
     
     @staticmethod
     def get_category_with_stats(db: Session, category_id: uuid.UUID) -> Optional[dict]:
@@ -299,76 +528,66 @@ class CategoryService:
         Returns:
             Dictionary with category and stats or None if not found
         """
-        category = CategoryService.get_category_by_id(db, category_id)
-        if not category:
-            return None
-        
-        # Get document count
-        document_count = db.query(func.count(Document.id)).filter(
-            Document.category_id == category_id
-        ).scalar()
-        
-        return {
-            **category.__dict__,
-            "document_count": document_count
-        }
+        # Category columns and document count in a single aggregated query
+        row = db.execute(
+            select(*CATEGORY_STATS_COLUMNS).select_from(Category).outerjoin(
+                Document, Document.category_id == Category.id
+            ).where(
+                Category.id == category_id
+            ).group_by(Category.id)
+        ).first()
+        
+        return dict(row._mapping) if row else None
     
     @staticmethod
     def get_all_categories_with_stats(
         db: Session,
         skip: int = 0,
         limit: int = 100,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> tuple[list[dict], int]:
         """
         Get all categories with document count.
         
         Args:
             db: Database session
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
             search: Optional search term
+            cursor: Keyset cursor of the previous page (see encode_cursor)
             
         Returns:
             Tuple of (categories with stats, total count)
         """
-        # Build query with document count
-        query = db.query(
-            Category,
-            func.count(Document.id).label('document_count')
-        ).outerjoin(Document)
+        # Core select with document count: rows, no ORM instances
+        stmt = select(
+            *CATEGORY_STATS_COLUMNS,
+            func.count().over().label('total')
+        ).select_from(Category).outerjoin(
+            Document, Document.category_id == Category.id
+        )
         
-        # Apply search filter
+        # Apply search filter (served by the trigram index ix_categories_name_trgm)
         if search:
             search_term = f"%{search}%"
-            query = query.filter(
+            stmt = stmt.where(
                 or_(
                     Category.name.ilike(search_term),
                     Category.description.ilike(search_term)
                 )
             )
         
-        query = query.group_by(Category.id)
+        # The window counts the groups (evaluated after GROUP BY)
+        stmt = stmt.group_by(Category.id)
         
-        # Get total count
-        total = query.count()
+        # Page and total count in a single query
+        results, total = CategoryService._fetch_page(db, stmt, skip, limit, cursor)
         
-        # Apply pagination
-        results = query.order_by(Category.name).offset(skip).limit(limit).all()
-        
-        # Format results
-        categories_with_stats = []
-        for category, doc_count in results:
-            cat_dict = {
-                "id": category.id,
-                "name": category.name,
-                "description": category.description,
-                "color": category.color,
-                "created_by": category.created_by,
-                "created_at": category.created_at,
-                "updated_at": category.updated_at,
-                "document_count": doc_count or 0
-            }
-            categories_with_stats.append(cat_dict)
+        # Rows map directly to the response fields (total dropped)
+        categories_with_stats = [
+            {key: value for key, value in row._mapping.items() if key != 'total'}
+            for row in results
+        ]
         
         return categories_with_stats, total
\ No newline at end of file
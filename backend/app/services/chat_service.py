@@ -14,16 +14,18 @@ Sprint 7 - Phase 3 : Chat Service
 """
 
 import logging
+import threading
 import time
 import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any, AsyncGenerator
 from uuid import UUID
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, and_
+from sqlalchemy.orm import Session, defer, selectinload
+from sqlalchemy import desc, and_, cast, func, select, update, Text
 import asyncio
-from app.services.notification import NotificationService
+from app.services.notification_queue import NotificationQueue
+from app.services.token_usage_service import TokenUsageService
 
 from app.core.config import settings
 from app.db.session import SessionLocal
@@ -31,7 +33,7 @@ from app.models.user import User
 from app.models.conversation import Conversation
 from app.models.message import Message, MessageRole
 from app.models.feedback import Feedback, FeedbackRating
-from app.models.token_usage import TokenUsage, OperationType
+from app.models.token_usage import OperationType
 from app.schemas.message import (
     ChatRequest,
     ChatStreamStartEvent,
@@ -41,41 +43,11 @@ from app.schemas.message import (
     ChatStreamEndEvent,
     ChatStreamErrorEvent,
     SourceReference,
-    MessageResponse
+    MessageResponse,
+    MessageHistoryTuple
 )
 from app.schemas.conversation import ConversationResponse, ConversationSummary
 
-def _send_notification_in_thread(notification_func: str, **kwargs):
-    """
-    Exécute une notification dans un thread séparé avec sa propre session DB et event loop.
-    
-    Cette approche garantit que la notification est envoyée même si la requête
-    HTTP se termine avant.
-    
-    Args:
-        notification_func: Nom de la méthode NotificationService à appeler
-        **kwargs: Arguments à passer à la méthode (sans db)
-    """
-    import threading
-    
-    def _run_in_thread():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        db = SessionLocal()
-        try:
-            method = getattr(NotificationService, notification_func)
-            loop.run_until_complete(method(db=db, **kwargs))
-            logger.info(f"✅ Notification {notification_func} envoyée avec succès")
-        except Exception as e:
-            logger.error(f"❌ Erreur notification {notification_func}: {e}", exc_info=True)
-        finally:
-            db.close()
-            loop.close()
-    
-    thread = threading.Thread(target=_run_in_thread, daemon=True)
-    thread.start()
-    logger.info(f"🔔 Thread notification {notification_func} démarré")
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
@@ -89,14 +61,29 @@ DEFAULT_HISTORY_LIMIT = 5
 DEFAULT_SEARCH_TOP_K = 10
 DEFAULT_RERANK_TOP_N = 3
 
+# Champs de MessageResponse lus sur le modèle Message (sources et feedback
+# sont fournis à part par get_conversation_with_messages)
+MESSAGE_RESPONSE_FIELDS = tuple(
+    field for field in MessageResponse.model_fields
+    if field not in ("sources", "feedback")
+)
+
+# Durée de validité de la config chat en mémoire (secondes)
+CHAT_CONFIG_TTL_SECONDS = 30
+
 
 # =============================================================================
 # FONCTIONS POUR RÉCUPÉRER LES CONFIGS DEPUIS LA DB
 # =============================================================================
 
-def get_chat_config() -> Dict[str, Any]:
+_chat_config: Optional[Dict[str, Any]] = None
+_chat_config_expires_at = 0.0
+_chat_config_lock = threading.Lock()
+
+
+def _load_chat_config() -> Dict[str, Any]:
     """
-    Récupère la configuration du chat depuis la DB.
+    Lit la configuration du chat depuis la DB.
     
     Returns:
         Dict avec history_limit, search_top_k, rerank_top_n
@@ -128,6 +115,37 @@ def get_chat_config() -> Dict[str, Any]:
         }
 
 
+def get_chat_config() -> Dict[str, Any]:
+    """
+    Récupère la configuration du chat (copie mémoire de
+    CHAT_CONFIG_TTL_SECONDS secondes, la DB n'est relue qu'à expiration).
+    
+    Returns:
+        Dict avec history_limit, search_top_k, rerank_top_n
+    """
+    global _chat_config, _chat_config_expires_at
+    
+    with _chat_config_lock:
+        if _chat_config is not None and time.monotonic() < _chat_config_expires_at:
+            return _chat_config
+    
+    config = _load_chat_config()
+    
+    with _chat_config_lock:
+        _chat_config = config
+        _chat_config_expires_at = time.monotonic() + CHAT_CONFIG_TTL_SECONDS
+    
+    return config
+
+
+def invalidate_chat_config() -> None:
+    """Force la relecture de la configuration du chat au prochain accès."""
+    global _chat_config
+    
+    with _chat_config_lock:
+        _chat_config = None
+
+
 # =============================================================================
 # CHAT SERVICE
 # =============================================================================
@@ -169,6 +187,42 @@ class ChatService:
             return text
         return text[:max_length - 3] + "..."   
     
+    def _build_source_references(
+        self,
+        sources: List[Dict[str, Any]]
+    ) -> List[SourceReference]:
+        """
+        Construit les références de sources envoyées au client.
+        
+        Les sources sans document_id UUID valide (le retriever et le
+        generator utilisent "" par défaut) sont ignorées : une seule d'entre
+        elles ferait échouer toute la réponse.
+        
+        Args:
+            sources: Sources au format dict
+        
+        Returns:
+            Liste de SourceReference
+        """
+        source_refs = []
+        for s in sources:
+            try:
+                document_id = UUID(str(s.get("document_id")))
+            except ValueError:
+                logger.warning(f"Source ignorée, document_id invalide: {s.get('document_id')!r}")
+                continue
+            
+            source_refs.append(SourceReference(
+                document_id=document_id,
+                title=s.get("title", ""),
+                category=s.get("category"),
+                page=s.get("page"),
+                chunk_index=s.get("chunk_index"),
+                relevance_score=s.get("relevance_score"),
+                excerpt=self._truncate_excerpt(s.get("text") or s.get("content") or s.get("excerpt"))
+            ))
+        return source_refs
+    
     # =========================================================================
     # PIPELINE PRINCIPAL
     # =========================================================================
@@ -184,7 +238,8 @@ class ChatService:
         Traite une requête utilisateur avec streaming.
         
         Pipeline complet :
-        1. Créer/récupérer la conversation
+        1. Créer/récupérer la conversation (embedding de la question calculé
+           en parallèle dans un thread)
         2. Sauvegarder le message utilisateur
         3. Vérifier le cache (L1 puis L2)
         4. Si miss : Embedding → Search → Rerank → Generate
@@ -209,6 +264,12 @@ class ChatService:
             db = SessionLocal()
             close_db = True
         
+        # Lancer l'embedding dans le thread pool dès maintenant : l'appel
+        # Mistral se déroule pendant les écritures DB de la conversation
+        # (la session reste utilisée par ce seul thread)
+        loop = asyncio.get_running_loop()
+        embedding_future = loop.run_in_executor(None, self._embed_query, query)
+        
         try:
             # 1. Créer ou récupérer la conversation
             conversation, is_new_conversation = await self._get_or_create_conversation(
@@ -217,14 +278,7 @@ class ChatService:
                 db=db
             )
             
-            # 2. Sauvegarder le message utilisateur
-            user_message = self._save_user_message(
-                conversation_id=conversation.id,
-                content=query,
-                db=db
-            )
-            
-            # Envoyer l'événement de démarrage
+            # Envoyer l'événement de démarrage sans attendre le message utilisateur
             assistant_message_id = uuid.uuid4()
             yield {
                 "event": "start",
@@ -232,17 +286,27 @@ class ChatService:
                     conversation_id=conversation.id,
                     message_id=assistant_message_id,
                     is_new_conversation=is_new_conversation
-                ).model_dump()
+                )
             }
             
-            # 3. Générer l'embedding de la question
-            query_embedding = await self._embed_query(query)
+            # 2. Sauvegarder le message utilisateur
+            user_message = self._save_user_message(
+                conversation_id=conversation.id,
+                content=query,
+                db=db
+            )
+            
+            # 3. Récupérer l'embedding de la question
+            query_embedding = await embedding_future
             
-            # 4. Vérifier le cache
-            cache_result = self.cache_service.check_cache(
+            # 4. Vérifier le cache (hash calculé une fois, réutilisé à la sauvegarde)
+            from app.services.cache_service import compute_query_hash
+            query_hash = compute_query_hash(query)
+            cache_result = self.cache_service.get_cached_response(
                 query=query,
                 query_embedding=query_embedding,
-                db=db
+                db=db,
+                query_hash=query_hash
             )
             
             if cache_result:
@@ -266,6 +330,7 @@ class ChatService:
                 async for event in self._execute_rag_pipeline(
                     query=query,
                     query_embedding=query_embedding,
+                    query_hash=query_hash,
                     conversation=conversation,
                     assistant_message_id=assistant_message_id,
                     start_time=start_time,
@@ -282,10 +347,12 @@ class ChatService:
                 "data": ChatStreamErrorEvent(
                     error=str(e),
                     code="PROCESSING_ERROR"
-                ).model_dump()
+                )
             }
         
         finally:
+            # Inutile si la requête a échoué avant d'utiliser l'embedding
+            embedding_future.cancel()
             if close_db:
                 db.close()
     
@@ -318,22 +385,11 @@ class ChatService:
         sources = cache_result.get("sources", [])
         
         # Envoyer les sources
-        source_refs = [
-                SourceReference(
-                    document_id=s.get("document_id", ""),
-                    title=s.get("title", ""),
-                    category=s.get("category"),
-                    page=s.get("page"),
-                    chunk_index=s.get("chunk_index"),
-                    relevance_score=s.get("relevance_score"),
-                    excerpt=self._truncate_excerpt(s.get("text") or s.get("content") or s.get("excerpt"))
-                )
-                for s in sources
-            ]
+        source_refs = self._build_source_references(sources)
         
         yield {
             "event": "sources",
-            "data": ChatStreamSourcesEvent(sources=source_refs).model_dump()
+            "data": ChatStreamSourcesEvent(sources=source_refs)
         }
         
         # Streamer les tokens (simulé par chunks)
@@ -342,7 +398,7 @@ class ChatService:
             chunk = response_content[i:i + chunk_size]
             yield {
                 "event": "token",
-                "data": ChatStreamTokenEvent(content=chunk).model_dump()
+                "data": ChatStreamTokenEvent(content=chunk)
             }
         
         # Calculer les métadonnées
@@ -368,7 +424,7 @@ class ChatService:
         
         # Générer le titre si nouvelle conversation
         if is_new_conversation:
-            await self._generate_and_save_title(conversation, query, db)
+            self._generate_and_save_title(conversation, query, db)
         
         # Envoyer les métadonnées
         yield {
@@ -381,19 +437,20 @@ class ChatService:
                 cache_hit=True,
                 response_time_seconds=response_time,
                 model_used="cached"
-            ).model_dump()
+            )
         }
         
         # Envoyer l'événement de fin
         yield {
             "event": "done",
-            "data": ChatStreamEndEvent(message_id=assistant_message_id).model_dump()
+            "data": ChatStreamEndEvent(message_id=assistant_message_id)
         }
     
     async def _execute_rag_pipeline(
         self,
         query: str,
         query_embedding: List[float],
+        query_hash: bytes,
         conversation: Conversation,
         assistant_message_id: UUID,
         start_time: float,
@@ -407,6 +464,7 @@ class ChatService:
         Args:
             query: Question de l'utilisateur
             query_embedding: Embedding de la question
+            query_hash: Hash SHA-256 de la question (clé du cache L1)
             conversation: Conversation en cours
             assistant_message_id: ID du message assistant
             start_time: Timestamp de début
@@ -417,19 +475,38 @@ class ChatService:
         Yields:
             Événements SSE
         """
+        config = get_chat_config()
+        
+        # IDs lus ici : les tâches du thread pool ne touchent pas aux objets
+        # ORM de la session de la requête
+        conversation_id = conversation.id
+        user_id = user.id
+        
+        # 0. Historique lu dans le thread pool pendant la recherche et le
+        # reranking (avec sa propre session : le reranker utilise db)
+        loop = asyncio.get_running_loop()
+        history_future = loop.run_in_executor(
+            None,
+            self._load_conversation_history,
+            conversation_id,
+            config["history_limit"]
+        )
+        
         # 1. Recherche hybride
         chunks = await self.retriever.search(
             query=query,
-            top_k=get_chat_config()["search_top_k"]
+            top_k=config["search_top_k"]
         )
         
         if not chunks:
             # Aucun résultat de recherche
             from app.rag.prompts import NO_CONTEXT_RESPONSE
             
+            history_future.cancel()
+            
             yield {
                 "event": "token",
-                "data": ChatStreamTokenEvent(content=NO_CONTEXT_RESPONSE).model_dump()
+                "data": ChatStreamTokenEvent(content=NO_CONTEXT_RESPONSE)
             }
             
             response_time = time.time() - start_time
@@ -451,7 +528,7 @@ class ChatService:
             )
             
             if is_new_conversation:
-                await self._generate_and_save_title(conversation, query, db)
+                self._generate_and_save_title(conversation, query, db)
             
             yield {
                 "event": "metadata",
@@ -463,20 +540,31 @@ class ChatService:
                     cache_hit=False,
                     response_time_seconds=response_time,
                     model_used="none"
-                ).model_dump()
+                )
             }
             
             yield {
                 "event": "done",
-                "data": ChatStreamEndEvent(message_id=assistant_message_id).model_dump()
+                "data": ChatStreamEndEvent(message_id=assistant_message_id)
             }
             return
         
+        # Titre généré dans le thread pool pendant le reranking et la
+        # génération (avec sa propre session), attendu avant la fin du flux
+        title_future = None
+        if is_new_conversation:
+            title_future = loop.run_in_executor(
+                None,
+                self._generate_title_in_background,
+                conversation_id,
+                query
+            )
+        
         # 2. Reranking
         reranked_results = await self.reranker.rerank(
             query=query,
             chunks=chunks,
-            top_n=get_chat_config()["rerank_top_n"],
+            top_n=config["rerank_top_n"],
             user_id=user.id,  
             db=db   
         )
@@ -501,30 +589,15 @@ class ChatService:
             sources.append(source_dict)
         
         # Envoyer les sources
-        source_refs = [
-            SourceReference(
-                document_id=s.get("document_id", ""),
-                title=s.get("title", ""),
-                category=s.get("category"),
-                page=s.get("page"),
-                chunk_index=s.get("chunk_index"),
-                relevance_score=s.get("relevance_score"),
-                excerpt=self._truncate_excerpt(s.get("text") or s.get("content") or s.get("excerpt"))
-            )
-            for s in sources
-        ]
+        source_refs = self._build_source_references(sources)
         
         yield {
             "event": "sources",
-            "data": ChatStreamSourcesEvent(sources=source_refs).model_dump()
+            "data": ChatStreamSourcesEvent(sources=source_refs)
         }
         
-        # 3. Récupérer l'historique
-        history = self._get_conversation_history(
-            conversation_id=conversation.id,
-            limit=get_chat_config()["history_limit"],
-            db=db
-        )
+        # 3. Récupérer l'historique (lu en parallèle, étape 0)
+        history = await history_future
         
         # 4. Génération streamée
         full_response = ""
@@ -541,7 +614,7 @@ class ChatService:
                 full_response += chunk.content
                 yield {
                     "event": "token",
-                    "data": ChatStreamTokenEvent(content=chunk.content).model_dump()
+                    "data": ChatStreamTokenEvent(content=chunk.content)
                 }
             
             elif chunk.type == "metadata" and chunk.metadata:
@@ -555,7 +628,7 @@ class ChatService:
                     "data": ChatStreamErrorEvent(
                         error=chunk.error or "Erreur de génération",
                         code="GENERATION_ERROR"
-                    ).model_dump()
+                    )
                 }
                 return
         
@@ -570,10 +643,11 @@ class ChatService:
         )
         cost_xaf = cost_usd * get_exchange_rate()
         
-        # 6. Sauvegarder le message assistant
-        assistant_message = self._save_assistant_message(
+        # 6. Sauvegarder le message assistant (un commit) avant metadata/done :
+        # le client relit la conversation dès la fin de la réponse
+        self._save_assistant_message(
             id=assistant_message_id,
-            conversation_id=conversation.id,
+            conversation_id=conversation_id,
             content=full_response,
             sources=sources,
             token_count_input=total_tokens_input,
@@ -586,24 +660,10 @@ class ChatService:
             db=db
         )
         
-        # 7. Sauvegarder dans le cache
-        document_ids = list(set(s.get("document_id", "") for s in sources if s.get("document_id")))
-        self.cache_service.save_to_cache(
-            query=query,
-            query_embedding=query_embedding,
-            response=full_response,
-            sources=sources,
-            document_ids=document_ids,
-            tokens=total_tokens_input + total_tokens_output,
-            cost_usd=cost_usd,
-            cost_xaf=cost_xaf,
-            db=db
-        )
-        
-        # 8. Tracker l'utilisation des tokens
+        # 7. Tracker l'utilisation des tokens (tampon, pas de commit)
         self._track_token_usage(
             operation_type=OperationType.RESPONSE_GENERATION,
-            user_id=user.id,
+            user_id=user_id,
             model_name=model_used,
             token_count_input=total_tokens_input,
             token_count_output=total_tokens_output,
@@ -613,9 +673,24 @@ class ChatService:
             message_id=assistant_message_id
         )
         
-        # 9. Générer le titre si nouvelle conversation
-        if is_new_conversation:
-            await self._generate_and_save_title(conversation, query, db)
+        # 8. Sauvegarder dans le cache depuis le thread pool, sans attendre
+        loop.run_in_executor(
+            None,
+            lambda: self._save_to_cache_in_background(
+                query=query,
+                query_embedding=query_embedding,
+                query_hash=query_hash,
+                response=full_response,
+                sources=sources,
+                tokens=total_tokens_input + total_tokens_output,
+                cost_usd=cost_usd,
+                cost_xaf=cost_xaf
+            )
+        )
+        
+        # 9. Attendre le titre lancé pendant le reranking
+        if title_future is not None:
+            await title_future
         
         # Envoyer les métadonnées finales
         yield {
@@ -628,13 +703,13 @@ class ChatService:
                 cache_hit=False,
                 response_time_seconds=response_time,
                 model_used=model_used
-            ).model_dump()
+            )
         }
         
         # Envoyer l'événement de fin
         yield {
             "event": "done",
-            "data": ChatStreamEndEvent(message_id=assistant_message_id).model_dump()
+            "data": ChatStreamEndEvent(message_id=assistant_message_id)
         }
     
     # =========================================================================
@@ -719,34 +794,47 @@ class ChatService:
             
             total = query.count()
             
-            conversations = query.order_by(
+            MAX_PREVIEW_LENGTH = 100
+            
+            # Nombre de messages et début du dernier message en sous-requêtes
+            # corrélées : une seule requête, évaluées pour les seules
+            # conversations de la page (index messages.conversation_id)
+            message_count = select(func.count(Message.id)).where(
+                Message.conversation_id == Conversation.id
+            ).scalar_subquery()
+            
+            # Un caractère de plus que l'aperçu pour savoir s'il faut tronquer
+            last_content = select(
+                func.left(Message.content, MAX_PREVIEW_LENGTH + 1)
+            ).where(
+                Message.conversation_id == Conversation.id
+            ).order_by(desc(Message.created_at)).limit(1).scalar_subquery()
+            
+            rows = query.with_entities(
+                Conversation.id,
+                Conversation.title,
+                Conversation.is_archived,
+                Conversation.updated_at,
+                message_count.label("message_count"),
+                last_content.label("last_content")
+            ).order_by(
                 desc(Conversation.updated_at)
             ).offset(skip).limit(limit).all()
             
             # Convertir en summaries avec message count
             summaries = []
-            for conv in conversations:
-                message_count = db.query(Message).filter(
-                    Message.conversation_id == conv.id
-                ).count()
-                
-                # Récupérer le dernier message
-                last_message = db.query(Message).filter(
-                    Message.conversation_id == conv.id
-                ).order_by(desc(Message.created_at)).first()
-                
-                MAX_PREVIEW_LENGTH = 100
+            for row in rows:
                 last_preview = None
-                if last_message:
-                    content = last_message.content
-                    last_preview = content[:MAX_PREVIEW_LENGTH - 3] + "..." if len(content) > 100 else content
+                if row.last_content is not None:
+                    content = row.last_content
+                    last_preview = content[:MAX_PREVIEW_LENGTH - 3] + "..." if len(content) > MAX_PREVIEW_LENGTH else content
                 
                 summaries.append(ConversationSummary(
-                    id=conv.id,
-                    title=conv.title or "Nouvelle conversation",
-                    is_archived=conv.is_archived,
-                    updated_at=conv.updated_at,
-                    message_count=message_count,
+                    id=row.id,
+                    title=row.title or "Nouvelle conversation",
+                    is_archived=row.is_archived,
+                    updated_at=row.updated_at,
+                    message_count=row.message_count,
                     last_message_preview=last_preview
                 ))
             
@@ -771,7 +859,8 @@ class ChatService:
             db: Session DB
         
         Returns:
-            Dict avec conversation et messages, None si non trouvé
+            Dict avec conversation, messages (sans sources) et sources_raw
+            (JSON brut des sources de chaque message), None si non trouvé
         """
         conversation = db.query(Conversation).filter(
             and_(
@@ -783,25 +872,31 @@ class ChatService:
         if not conversation:
             return None
         
-        messages = db.query(Message).options(
-                joinedload(Message.feedbacks)  # Charger la relation feedbacks
+        # Les sources (JSONB) sont lues en texte brut et non décodées :
+        # l'endpoint les recopie telles quelles dans la réponse JSON
+        rows = db.query(Message, cast(Message.sources, Text)).options(
+                defer(Message.sources),
+                selectinload(Message.feedbacks)  # Charger la relation feedbacks
             ).filter(
                 Message.conversation_id == conversation_id
             ).order_by(Message.created_at).all()
         
-        for message in messages:
-            # Filtrer les feedbacks pour ne garder que celui de l'utilisateur actuel
-            user_feedback = next(
+        messages = []
+        sources_raw = []
+        for message, raw in rows:
+            data = {field: getattr(message, field) for field in MESSAGE_RESPONSE_FIELDS}
+            # Ne garder que le feedback de l'utilisateur actuel
+            data["feedback"] = next(
                 (f for f in message.feedbacks if f.user_id == user_id),
                 None
             )
-            # Ajouter l'attribut .feedback (singulier) sur le message
-            # Pydantic avec from_attributes=True utilisera cet attribut
-            message.feedback = user_feedback
+            messages.append(MessageResponse.model_validate(data))
+            sources_raw.append(raw)
         
         return {
             "conversation": ConversationResponse.model_validate(conversation),
-            "messages": [MessageResponse.model_validate(m) for m in messages]
+            "messages": messages,
+            "sources_raw": sources_raw
         }
     
     def delete_conversation(
@@ -969,25 +1064,91 @@ class ChatService:
             response_time_seconds=response_time_seconds
         )
         db.add(message)
-        db.commit()
-        db.refresh(message)
         
-        # Mettre à jour updated_at de la conversation
-        conversation = db.query(Conversation).filter(
-            Conversation.id == conversation_id
-        ).first()
-        if conversation:
-            conversation.updated_at = datetime.utcnow()
-            db.commit()
+        # Mettre à jour updated_at de la conversation, dans la même transaction
+        db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
         
         return message
     
+    def _save_to_cache_in_background(
+        self,
+        query: str,
+        query_embedding: List[float],
+        query_hash: bytes,
+        response: str,
+        sources: List[Dict[str, Any]],
+        tokens: int,
+        cost_usd: float,
+        cost_xaf: float
+    ) -> None:
+        """
+        Sauvegarde une réponse générée dans le cache, hors du flux de la
+        réponse (thread pool, session dédiée).
+        
+        Args:
+            query: Question de l'utilisateur
+            query_embedding: Embedding de la question
+            query_hash: Hash SHA-256 de la question (clé du cache L1)
+            response: Réponse générée
+            sources: Sources citées
+            tokens: Tokens consommés
+            cost_usd: Coût USD
+            cost_xaf: Coût XAF
+        """
+        db = SessionLocal()
+        try:
+            document_ids = list(set(s.get("document_id", "") for s in sources if s.get("document_id")))
+            self.cache_service.save_to_cache(
+                query=query,
+                query_embedding=query_embedding,
+                response=response,
+                sources=sources,
+                document_ids=document_ids,
+                tokens=tokens,
+                cost_usd=cost_usd,
+                cost_xaf=cost_xaf,
+                db=db,
+                query_hash=query_hash
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Erreur sauvegarde cache: {e}", exc_info=True)
+        finally:
+            db.close()
+    
+    def _generate_title_in_background(
+        self,
+        conversation_id: UUID,
+        query: str
+    ) -> None:
+        """
+        Génère le titre d'une nouvelle conversation (thread pool, session
+        dédiée).
+        
+        Args:
+            conversation_id: ID de la conversation
+            query: Question initiale
+        """
+        db = SessionLocal()
+        try:
+            conversation = db.get(Conversation, conversation_id)
+            if conversation:
+                self._generate_and_save_title(conversation, query, db)
+        finally:
+            db.close()
+    
     def _get_conversation_history(
         self,
         conversation_id: UUID,
         limit: int,
         db: Session
-    ) -> List[Dict[str, Any]]:
+    ) -> List[MessageHistoryTuple]:
         """
         Récupère l'historique de conversation.
         
@@ -997,7 +1158,7 @@ class ChatService:
             db: Session DB
         
         Returns:
-            Liste de messages formatés pour le prompt
+            Liste de tuples (rôle, contenu) pour le prompt
         """
         messages = db.query(Message).filter(
             Message.conversation_id == conversation_id
@@ -1007,13 +1168,33 @@ class ChatService:
         messages = list(reversed(messages))
         
         # Prendre les derniers messages (alternance user/assistant)
-        return [
-            {
-                "role": m.role.value,
-                "content": m.content
-            }
-            for m in messages[-limit:]
-        ]
+        return [(m.role.value, m.content) for m in messages[-limit:]]
+    
+    def _load_conversation_history(
+        self,
+        conversation_id: UUID,
+        limit: int
+    ) -> List[MessageHistoryTuple]:
+        """
+        Récupère l'historique de conversation avec une session dédiée
+        (exécuté hors du thread de la requête).
+        
+        Args:
+            conversation_id: ID de la conversation
+            limit: Nombre de messages max
+        
+        Returns:
+            Liste de tuples (rôle, contenu) pour le prompt
+        """
+        db = SessionLocal()
+        try:
+            return self._get_conversation_history(
+                conversation_id=conversation_id,
+                limit=limit,
+                db=db
+            )
+        finally:
+            db.close()
     
     # =========================================================================
     # GESTION DES FEEDBACKS
@@ -1092,7 +1273,7 @@ class ChatService:
         
         # SPRINT 14 - Notification temps réel (seulement pour nouveaux feedbacks)
         if is_new_feedback and user_name:
-            _send_notification_in_thread(
+            NotificationQueue.submit(
                 "notify_feedback_received",
                 feedback_id=feedback.id,
                 message_id=message_id,
@@ -1106,9 +1287,10 @@ class ChatService:
     # UTILITAIRES
     # =========================================================================
     
-    async def _embed_query(self, query: str) -> List[float]:
+    def _embed_query(self, query: str) -> List[float]:
         """
-        Génère l'embedding d'une question.
+        Génère l'embedding d'une question (appel bloquant, exécuté dans le
+        thread pool par process_query_streaming).
         
         Args:
             query: Question à embedder
@@ -1119,7 +1301,7 @@ class ChatService:
         result = self.mistral_client.embed_texts([query])
         return result.embeddings[0] if result.embeddings else []
     
-    async def _generate_and_save_title(
+    def _generate_and_save_title(
         self,
         conversation: Conversation,
         query: str,
@@ -1195,7 +1377,8 @@ class ChatService:
         if exchange_rate is None:
             exchange_rate = 569.41080  # Fallback
 
-        usage = TokenUsage(
+        # Insertion groupée (tampon TokenUsageService, pas de commit ici)
+        TokenUsageService.enqueue(
             operation_type=operation_type,
             model_name=model_name,
             token_count_input=token_count_input,
@@ -1206,10 +1389,8 @@ class ChatService:
             exchange_rate=float(exchange_rate),
             user_id=user_id,
             message_id=message_id,
-            document_id=document_id 
+            document_id=document_id
         )
-        db.add(usage)
-        db.commit()
 
 
 # =============================================================================
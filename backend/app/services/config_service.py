@@ -345,6 +345,13 @@ class ConfigService:
     
     def _invalidate_cache(self, key: str):
         """Invalide une entrée du cache."""
+        if key.startswith("cache."):
+            from app.services.cache_service import invalidate_cache_config
+            invalidate_cache_config()
+        elif key.startswith(("chat.", "search.")):
+            from app.services.chat_service import invalidate_chat_config
+            invalidate_chat_config()
+        
         if not self._redis:
             return
         
@@ -355,6 +362,11 @@ class ConfigService:
     
     def invalidate_all_cache(self):
         """Invalide tout le cache de configuration."""
+        from app.services.cache_service import invalidate_cache_config
+        from app.services.chat_service import invalidate_chat_config
+        invalidate_cache_config()
+        invalidate_chat_config()
+        
         if not self._redis:
             return
         
@@ -425,7 +425,7 @@ class DocumentService:
         """
         from app.models.document import Document, DocumentStatus
         from app.models.user import User as UserModel
-        from app.models.category import Category
+        from app.services.category_service import CategoryService
         
         # Construction de la requête de base avec jointure pour l'uploader
         query = db.query(Document)
@@ -530,9 +530,7 @@ class DocumentService:
             # Récupérer la catégorie
             category_name = None
             if doc.category_id:
-                category = db.query(Category).filter(Category.id == doc.category_id).first()
-                if category:
-                    category_name = category.name
+                category_name = CategoryService.get_category_name(db, doc.category_id)
             
             # Calculer les coûts depuis les métadonnées
             total_cost_usd = 0.0
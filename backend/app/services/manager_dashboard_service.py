@@ -8,32 +8,181 @@ Version simplifiée du DashboardService admin.
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Any, Callable
 from uuid import UUID
 import logging
 
+import redis
+
+from app.core.config import settings
+
 from app.models.user import User
 from app.models.document import Document
 from app.models.chunk import Chunk
 from app.models.message import Message
 from app.models.conversation import Conversation
 from app.models.category import Category
+from app.utils.serialization import dumps
 
 logger = logging.getLogger(__name__)
 
+# Préfixe pour les clés Redis
+CACHE_PREFIX = "irobot:manager_dashboard:"
+
+# TTL du cache par sous-partie des stats (secondes)
+DOCUMENTS_CACHE_TTL = 60
+MESSAGES_CACHE_TTL = 30
+DOCUMENTS_BY_CATEGORY_CACHE_TTL = 300
+
 
 class ManagerDashboardService:
     """Service pour le dashboard manager (sans affichage des coûts)."""
     
+    _redis_client: Optional[redis.Redis] = None
+    
+    @classmethod
+    def _get_redis(cls) -> Optional[redis.Redis]:
+        """Récupère le client Redis (lazy init, valeurs en bytes)."""
+        if cls._redis_client is None:
+            try:
+                cls._redis_client = redis.from_url(settings.REDIS_URL)
+            except Exception as e:
+                logger.warning(f"Redis non disponible: {e}")
+        return cls._redis_client
+    
+    @classmethod
+    def _get_cached_part(
+        cls,
+        key: str,
+        ttl: int,
+        compute: Callable[[], Any]
+    ) -> bytes:
+        """
+        Récupère une sous-partie des stats pré-sérialisée en JSON.
+        
+        La sous-partie est lue depuis Redis si présente, sinon calculée,
+        sérialisée avec orjson et mise en cache avec son propre TTL.
+        
+        Args:
+            key: Clé Redis (sans préfixe)
+            ttl: Durée de vie du cache en secondes
+            compute: Fonction calculant la sous-partie
+            
+        Returns:
+            JSON de la sous-partie (bytes)
+        """
+        redis_client = cls._get_redis()
+        cache_key = f"{CACHE_PREFIX}{key}"
+        
+        if redis_client:
+            try:
+                cached = redis_client.get(cache_key)
+                if cached:
+                    return cached
+            except Exception as e:
+                logger.debug(f"Erreur cache get: {e}")
+        
+        payload = dumps(compute())
+        
+        if redis_client:
+            try:
+                redis_client.setex(cache_key, ttl, payload)
+            except Exception as e:
+                logger.debug(f"Erreur cache set: {e}")
+        
+        return payload
+    
+    @staticmethod
+    def _compute_document_stats(db: Session, manager_id: UUID) -> Dict:
+        """Compte les documents du manager par statut et leurs chunks."""
+        documents_query = db.query(Document).filter(
+            Document.uploaded_by == manager_id
+        )
+        
+        total_documents = documents_query.count()
+        completed_documents = documents_query.filter(
+            Document.status == "COMPLETED"
+        ).count()
+        processing_documents = documents_query.filter(
+            Document.status.in_(["PENDING", "PROCESSING"])
+        ).count()
+        failed_documents = documents_query.filter(
+            Document.status == "FAILED"
+        ).count()
+        
+        # Total chunks des documents du manager
+        total_chunks = db.query(Chunk).join(Document).filter(
+            Document.uploaded_by == manager_id
+        ).count()
+        
+        return {
+            "total": total_documents,
+            "completed": completed_documents,
+            "processing": processing_documents,
+            "failed": failed_documents,
+            "total_chunks": total_chunks
+        }
+    
     @staticmethod
-    def get_manager_stats(
+    def _compute_message_stats(
+        db: Session,
+        manager_id: UUID,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict:
+        """Compte les messages générés sur la période (si le manager a des documents)."""
+        has_documents = db.query(Document.id).filter(
+            Document.uploaded_by == manager_id
+        ).first() is not None
+        
+        messages_count = 0
+        if has_documents:
+            # Compter les messages qui ont référencé des chunks des docs du manager
+            # Pour simplifier, on compte les messages assistant dans la période
+            # qui ont des sources (dans un vrai système, il faudrait parser les sources)
+            messages_count = db.query(Message).filter(
+                Message.role == "ASSISTANT",
+                Message.created_at >= start_date,
+                Message.created_at <= end_date,
+                Message.sources.isnot(None)
+            ).count()
+        
+        return {"total": messages_count}
+    
+    @staticmethod
+    def _compute_documents_by_category(db: Session, manager_id: UUID) -> List[Dict]:
+        """Répartition des documents du manager par catégorie (sans filtre temporel)."""
+        docs_by_category = db.query(
+            Category.name,
+            func.count(Document.id).label('count')
+        ).join(Document).filter(
+            Document.uploaded_by == manager_id
+        ).group_by(Category.name).all()
+        
+        return [
+            {"category": name, "count": count}
+            for name, count in docs_by_category
+        ]
+    
+    @classmethod
+    def get_manager_stats_json(
+        cls,
         db: Session,
         manager_id: UUID,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
-    ) -> Dict:
+    ) -> bytes:
         """
-        Récupère les statistiques du dashboard manager.
+        Récupère les statistiques du dashboard manager déjà sérialisées en JSON.
+        
+        Chaque sous-partie est mise en cache séparément dans Redis avec son
+        propre TTL, puis les fragments JSON sont concaténés sans re-sérialiser
+        l'ensemble. Structure (sans coûts) :
+        
+        - documents: total, completed, processing, failed, total_chunks
+        - messages: total (réponses avec sources sur la période)
+        - documents_by_category: liste de {category, count} (sans filtre temporel)
+        - date_range: start, end (ISO 8601)
         
         Args:
             db: Session de base de données
@@ -42,10 +191,16 @@ class ManagerDashboardService:
             end_date: Date de fin (optionnel, défaut: maintenant)
             
         Returns:
-            Dictionnaire avec les statistiques (sans coûts)
+            JSON de ManagerDashboardOverviewResponse (bytes)
         """
         try:
-            # Date range par défaut : 30 derniers jours
+            # La clé des messages dépend de la période demandée ;
+            # la période par défaut (glissante) partage une même clé.
+            period_key = (
+                f"{start_date.isoformat() if start_date else 'default'}:"
+                f"{end_date.isoformat() if end_date else 'default'}"
+            )
+            
             if not start_date:
                 start_date = datetime.utcnow() - timedelta(days=30)
             if not end_date:
@@ -53,72 +208,33 @@ class ManagerDashboardService:
             
             logger.info(f"📊 Récupération stats manager {manager_id} du {start_date} au {end_date}")
             
-            # Documents uploadés par le manager
-            documents_query = db.query(Document).filter(
-                Document.uploaded_by == manager_id
+            documents = cls._get_cached_part(
+                f"documents:{manager_id}",
+                DOCUMENTS_CACHE_TTL,
+                lambda: cls._compute_document_stats(db, manager_id)
+            )
+            messages = cls._get_cached_part(
+                f"messages:{manager_id}:{period_key}",
+                MESSAGES_CACHE_TTL,
+                lambda: cls._compute_message_stats(db, manager_id, start_date, end_date)
+            )
+            documents_by_category = cls._get_cached_part(
+                f"documents_by_category:{manager_id}",
+                DOCUMENTS_BY_CATEGORY_CACHE_TTL,
+                lambda: cls._compute_documents_by_category(db, manager_id)
+            )
+            date_range = dumps({
+                "start": start_date.isoformat(),
+                "end": end_date.isoformat()
+            })
+            
+            return (
+                b'{"documents":' + documents
+                + b',"messages":' + messages
+                + b',"documents_by_category":' + documents_by_category
+                + b',"date_range":' + date_range
+                + b'}'
             )
-            
-            total_documents = documents_query.count()
-            completed_documents = documents_query.filter(
-                Document.status == "COMPLETED"
-            ).count()
-            processing_documents = documents_query.filter(
-                Document.status.in_(["PENDING", "PROCESSING"])
-            ).count()
-            failed_documents = documents_query.filter(
-                Document.status == "FAILED"
-            ).count()
-            
-            # Total chunks des documents du manager
-            total_chunks = db.query(Chunk).join(Document).filter(
-                Document.uploaded_by == manager_id
-            ).count()
-            
-            # Messages utilisant les documents du manager (période filtrée)
-            manager_doc_ids = [doc.id for doc in documents_query.all()]
-            
-            messages_count = 0
-            if manager_doc_ids:
-                # Compter les messages qui ont référencé des chunks des docs du manager
-                # Pour simplifier, on compte les messages assistant dans la période
-                # qui ont des sources (dans un vrai système, il faudrait parser les sources)
-                messages_count = db.query(Message).filter(
-                    Message.role == "ASSISTANT",
-                    Message.created_at >= start_date,
-                    Message.created_at <= end_date,
-                    Message.sources.isnot(None)
-                ).count()
-            
-            # Documents par catégorie (tous les documents du manager, pas de filtre temporel)
-            docs_by_category = db.query(
-                Category.name,
-                func.count(Document.id).label('count')
-            ).join(Document).filter(
-                Document.uploaded_by == manager_id
-            ).group_by(Category.name).all()
-            
-            logger.info(f"✅ Stats manager récupérées: {total_documents} docs, {messages_count} messages")
-            
-            return {
-                "documents": {
-                    "total": total_documents,
-                    "completed": completed_documents,
-                    "processing": processing_documents,
-                    "failed": failed_documents,
-                    "total_chunks": total_chunks
-                },
-                "messages": {
-                    "total": messages_count
-                },
-                "documents_by_category": [
-                    {"category": name, "count": count}
-                    for name, count in docs_by_category
-                ],
-                "date_range": {
-                    "start": start_date.isoformat(),
-                    "end": end_date.isoformat()
-                }
-            }
             
         except Exception as e:
             logger.error(f"❌ Erreur récupération stats manager: {str(e)}")
@@ -5,7 +5,6 @@
 # ==============================================================================
 
 import asyncio
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any, AsyncGenerator
@@ -28,15 +27,25 @@ from app.schemas.notification import (
     NotificationListResponse,
     NotificationResponse,
     DocumentStatusEvent,
-    FeedbackEvent,
-    DashboardStatsEvent
+    FeedbackEvent
 )
 from app.services.audit_log_service import AuditLogService
+from app.utils.serialization import dumps
 
 
 logger = logging.getLogger(__name__)
 
 
+def format_sse_event(event: str, data: Any) -> str:
+    """
+    Formater un événement SSE.
+    
+    La sérialisation (orjson) est faite une seule fois par événement ;
+    la trame obtenue peut être diffusée telle quelle à N connexions.
+    """
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
 # ==============================================================================
 # SSE CONNECTION MANAGER
 # ==============================================================================
@@ -141,14 +150,14 @@ class SSEConnectionManager:
         Returns:
             Nombre de connexions notifiées
         """
-        message = {"event": event, "data": data}
+        frame = format_sse_event(event, data)
         sent_count = 0
         
         async with self._lock:
             connections = self._connections.get(user_id, [])
             for queue, role in connections:
                 try:
-                    await queue.put(message)
+                    queue.put_nowait(frame)
                     sent_count += 1
                 except Exception as e:
                     logger.error(f"SSE: Erreur envoi à {user_id}: {e}")
@@ -168,14 +177,14 @@ class SSEConnectionManager:
         Returns:
             Nombre de connexions notifiées
         """
-        message = {"event": event, "data": data}
+        frame = format_sse_event(event, data)
         sent_count = 0
         
         async with self._lock:
             # Envoyer aux connexions /admin/events/stream
             for queue in self._admin_connections:
                 try:
-                    await queue.put(message)
+                    queue.put_nowait(frame)
                     sent_count += 1
                 except Exception as e:
                     logger.error(f"SSE: Erreur broadcast admin: {e}")
@@ -185,7 +194,7 @@ class SSEConnectionManager:
                 for queue, role in connections:
                     if role == "ADMIN":
                         try:
-                            await queue.put(message)
+                            queue.put_nowait(frame)
                             sent_count += 1
                         except Exception as e:
                             logger.error(f"SSE: Erreur broadcast à admin {user_id}: {e}")
@@ -206,14 +215,14 @@ class SSEConnectionManager:
         Returns:
             Nombre de connexions notifiées
         """
-        message = {"event": event, "data": data}
+        frame = format_sse_event(event, data)
         sent_count = 0
         
         async with self._lock:
             # Envoyer aux connexions /admin/events/stream
             for queue in self._admin_connections:
                 try:
-                    await queue.put(message)
+                    queue.put_nowait(frame)
                     sent_count += 1
                 except Exception as e:
                     logger.error(f"SSE: Erreur broadcast: {e}")
@@ -223,7 +232,7 @@ class SSEConnectionManager:
                 for queue, role in connections:
                     if role in ("ADMIN", "MANAGER"):
                         try:
-                            await queue.put(message)
+                            queue.put_nowait(frame)
                             sent_count += 1
                         except Exception as e:
                             logger.error(f"SSE: Erreur broadcast à {role} {user_id}: {e}")
@@ -233,14 +242,14 @@ class SSEConnectionManager:
     
     async def broadcast_dashboard_update(self, data: dict) -> int:
         """Diffuser une mise à jour dashboard à tous."""
-        message = {"event": "dashboard_update", "data": data}
+        frame = format_sse_event("dashboard_update", data)
         sent_count = 0
         
         async with self._lock:
             for user_id, queues in self._dashboard_connections.items():
                 for queue in queues:
                     try:
-                        await queue.put(message)
+                        queue.put_nowait(frame)
                         sent_count += 1
                     except Exception as e:
                         logger.error(f"SSE: Erreur dashboard update: {e}")
@@ -767,7 +776,7 @@ class NotificationService:
                 priority=priority,
                 title=title,
                 message=message,
-                data=data or {}
+                data=data
             )
         )
     
@@ -882,7 +891,7 @@ class NotificationService:
                     priority=n.priority,
                     title=n.title,
                     message=n.message,
-                    data=n.data or {},
+                    data=n.data,
                     is_read=n.is_read,
                     is_dismissed=n.is_dismissed,
                     created_at=n.created_at,
@@ -1124,10 +1133,8 @@ class NotificationService:
                         queue.get(),
                         timeout=heartbeat_interval
                     )
-                    yield NotificationService._format_sse_event(
-                        message["event"],
-                        message["data"]
-                    )
+                    # Trame SSE déjà formatée par le gestionnaire de connexions
+                    yield message
                 except asyncio.TimeoutError:
                     # Envoyer un heartbeat
                     yield NotificationService._format_sse_event(
@@ -1163,10 +1170,8 @@ class NotificationService:
                         queue.get(),
                         timeout=heartbeat_interval
                     )
-                    yield NotificationService._format_sse_event(
-                        message["event"],
-                        message["data"]
-                    )
+                    # Trame SSE déjà formatée par le gestionnaire de connexions
+                    yield message
                 except asyncio.TimeoutError:
                     yield NotificationService._format_sse_event(
                         "heartbeat",
@@ -1203,10 +1208,8 @@ class NotificationService:
                         queue.get(),
                         timeout=heartbeat_interval
                     )
-                    yield NotificationService._format_sse_event(
-                        message["event"],
-                        message["data"]
-                    )
+                    # Trame SSE déjà formatée par le gestionnaire de connexions
+                    yield message
                 except asyncio.TimeoutError:
                     yield NotificationService._format_sse_event(
                         "heartbeat",
@@ -1220,8 +1223,7 @@ class NotificationService:
     @staticmethod
     def _format_sse_event(event: str, data: dict) -> str:
         """Formater un événement SSE."""
-        json_data = json.dumps(data, default=str, ensure_ascii=False)
-        return f"event: {event}\ndata: {json_data}\n\n"
+        return format_sse_event(event, data)
     
     # =========================================================================
     # NETTOYAGE
@@ -0,0 +1,91 @@
+"""
+Envoi des notifications hors de la requête HTTP.
+
+Une notification n'est plus envoyée par un thread et une event loop créés
+pour elle : les coroutines NotificationService sont soumises à une seule
+event loop de fond (thread démon démarré au premier envoi), chacune avec
+sa propre session DB.
+
+Au plus MAX_CONCURRENT_NOTIFICATIONS notifications s'exécutent en même
+temps : les autres attendent dans la loop, sans ouvrir de connexion DB.
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from app.db.session import SessionLocal
+from app.services.notification import NotificationService
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Notifications exécutées simultanément (sessions DB ouvertes au plus)
+MAX_CONCURRENT_NOTIFICATIONS = 4
+
+
+# =============================================================================
+# NOTIFICATION QUEUE
+# =============================================================================
+
+class NotificationQueue:
+    """
+    Event loop partagée (thread-safe) des notifications à envoyer.
+    
+    Seul le thread de la loop exécute les notifications.
+    """
+    
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock = threading.Lock()
+    _semaphore: Optional[asyncio.Semaphore] = None
+    
+    @classmethod
+    def submit(cls, notification_func: str, **kwargs: Any) -> None:
+        """
+        Soumet une notification à la loop de fond et retourne aussitôt.
+        
+        Args:
+            notification_func: Nom de la méthode NotificationService à appeler
+            **kwargs: Arguments à passer à la méthode (sans db)
+        """
+        asyncio.run_coroutine_threadsafe(
+            cls._send(notification_func, kwargs),
+            cls._get_loop()
+        )
+        logger.debug(f"🔔 Notification {notification_func} soumise")
+    
+    @classmethod
+    async def _send(cls, notification_func: str, kwargs: Dict[str, Any]) -> None:
+        """Envoie une notification avec sa propre session DB."""
+        if cls._semaphore is None:
+            # Créé dans le thread de la loop, seul à y accéder
+            cls._semaphore = asyncio.Semaphore(MAX_CONCURRENT_NOTIFICATIONS)
+        
+        async with cls._semaphore:
+            db = SessionLocal()
+            try:
+                method = getattr(NotificationService, notification_func)
+                await method(db=db, **kwargs)
+                logger.info(f"✅ Notification {notification_func} envoyée avec succès")
+            except Exception as e:
+                logger.error(f"❌ Erreur notification {notification_func}: {e}", exc_info=True)
+            finally:
+                db.close()
+    
+    @classmethod
+    def _get_loop(cls) -> asyncio.AbstractEventLoop:
+        """Retourne la loop de fond, démarrée au premier appel."""
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="notification-loop",
+                    daemon=True
+                ).start()
+                cls._loop = loop
+            return cls._loop
@@ -0,0 +1,122 @@
+"""
+Service d'enregistrement groupé des TokenUsage.
+
+Chaque appel LLM produit une ligne token_usages. Au lieu d'un
+INSERT + COMMIT par opération, les lignes sont mises en file et
+insérées par lots (INSERT multi-lignes via SQLAlchemy Core) par un
+BatchWriter (voir batch_writer.py pour le déclenchement des lots et la
+backpressure). Si un lot est rejeté (ex: message_id inexistant), ses
+lignes sont réinsérées une à une : seule la ligne fautive est perdue.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.token_usage import TokenUsage
+from app.services.batch_writer import BatchWriter
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Taille maximale d'un lot inséré
+FLUSH_MAX_ROWS = 100
+
+# Attente maximale avant l'insertion d'un lot incomplet (secondes)
+FLUSH_INTERVAL_SECONDS = 0.5
+
+# Au-delà, les lignes sont écrites de façon synchrone
+MAX_PENDING_ROWS = 10_000
+
+
+# =============================================================================
+# TOKEN USAGE SERVICE
+# =============================================================================
+
+class TokenUsageService:
+    """
+    File partagée (thread-safe) des TokenUsage à insérer.
+    
+    Utilisable depuis le code synchrone comme asynchrone.
+    """
+    
+    @classmethod
+    def enqueue(
+        cls,
+        operation_type,
+        model_name: str,
+        token_count_input: Optional[int],
+        token_count_output: Optional[int],
+        token_count_total: int,
+        cost_usd: float,
+        cost_xaf: float,
+        exchange_rate: float,
+        user_id: Optional[uuid.UUID] = None,
+        document_id: Optional[uuid.UUID] = None,
+        message_id: Optional[uuid.UUID] = None,
+        token_metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Ajoute une utilisation de tokens à la file.
+        
+        Args:
+            operation_type: Type d'opération (OperationType)
+            model_name: Nom du modèle
+            token_count_input: Tokens en entrée
+            token_count_output: Tokens en sortie
+            token_count_total: Total des tokens
+            cost_usd: Coût USD
+            cost_xaf: Coût XAF
+            exchange_rate: Taux de change USD/XAF appliqué
+            user_id: ID de l'utilisateur
+            document_id: ID du document
+            message_id: ID du message
+            token_metadata: Métadonnées additionnelles
+        """
+        row = {
+            "id": uuid.uuid4(),
+            "operation_type": operation_type,
+            "model_name": model_name,
+            "token_count_input": token_count_input,
+            "token_count_output": token_count_output,
+            "token_count_total": token_count_total,
+            "cost_usd": cost_usd,
+            "cost_xaf": cost_xaf,
+            "exchange_rate": exchange_rate,
+            "user_id": user_id,
+            "document_id": document_id,
+            "message_id": message_id,
+            "token_metadata": token_metadata,
+            "created_at": datetime.utcnow(),
+        }
+        
+        _writer.put(row)
+    
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Insère immédiatement toutes les lignes en attente.
+        
+        Returns:
+            Nombre de lignes insérées
+        """
+        return _writer.flush()
+
+
+def _insert_token_usages(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Insère un lot de token_usages (INSERT multi-lignes, sans commit)."""
+    db.execute(TokenUsage.__table__.insert(), rows)
+
+
+_writer = BatchWriter(
+    name="token-usage",
+    label="token_usages",
+    write=_insert_token_usages,
+    max_rows=FLUSH_MAX_ROWS,
+    flush_interval=FLUSH_INTERVAL_SECONDS,
+    max_pending=MAX_PENDING_ROWS,
+    row_fallback=True
+)
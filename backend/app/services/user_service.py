@@ -2,9 +2,7 @@
 
 SPRINT 14 : Ajout des notifications temps réel pour les opérations CRUD.
 """
-import asyncio
 import logging
-import threading
 from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, func
@@ -17,60 +15,23 @@ from io import BytesIO
 from app.core.security import get_password_hash, verify_password, validate_password_strength
 from app.models.user import User, UserRole
 from app.models.audit_log import AuditLog
+from pydantic import ValidationError
+
 from app.schemas.user import (
+    USER_IMPORT_ADAPTER,
     UserCreate,
     UserUpdate,
-    UserImportRow,
     UserImportResult,
     UserResponse,
     UserStatsResponse
 )
 
 # SPRINT 14 - Notifications
-from app.services.notification import NotificationService
-from app.db.session import SessionLocal
+from app.services.notification_queue import NotificationQueue
 
 logger = logging.getLogger(__name__)
 
 
-# =============================================================================
-# HELPER POUR NOTIFICATIONS ASYNC - CORRIGÉ SPRINT 14 V2
-# =============================================================================
-
-def _send_notification_in_thread(notification_func: str, **kwargs):
-    """
-    Exécute une notification dans un thread séparé avec sa propre session DB et event loop.
-    
-    Cette approche garantit que la notification est envoyée même si la requête
-    HTTP se termine avant.
-    
-    Args:
-        notification_func: Nom de la méthode NotificationService à appeler
-        **kwargs: Arguments à passer à la méthode (sans db)
-    """
-    def _run_in_thread():
-        # Créer une nouvelle event loop pour ce thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        db = SessionLocal()
-        try:
-            method = getattr(NotificationService, notification_func)
-            # Exécuter la coroutine dans la loop de ce thread
-            loop.run_until_complete(method(db=db, **kwargs))
-            logger.info(f"✅ Notification {notification_func} envoyée avec succès")
-        except Exception as e:
-            logger.error(f"❌ Erreur notification {notification_func}: {e}", exc_info=True)
-        finally:
-            db.close()
-            loop.close()
-    
-    # Lancer dans un thread séparé pour ne pas bloquer
-    thread = threading.Thread(target=_run_in_thread, daemon=True)
-    thread.start()
-    logger.info(f"🔔 Thread notification {notification_func} démarré")
-
-
 class UserService:
     """Service de gestion des utilisateurs."""
     
@@ -245,7 +206,7 @@ class UserService:
         
         # SPRINT 14 - Notification temps réel
         if created_by_name:
-            _send_notification_in_thread(
+            NotificationQueue.submit(
                 "notify_user_created",
                 created_user_id=new_user.id,
                 matricule=new_user.matricule,
@@ -332,7 +293,7 @@ class UserService:
             # Vérifier si c'est une activation/désactivation
             if "is_active" in update_data and was_active != user.is_active:
                 if user.is_active:
-                    _send_notification_in_thread(
+                    NotificationQueue.submit(
                         "notify_user_activated",
                         user_id=user.id,
                         matricule=user.matricule,
@@ -341,7 +302,7 @@ class UserService:
                         activated_by_name=updated_by_name
                     )
                 else:
-                    _send_notification_in_thread(
+                    NotificationQueue.submit(
                         "notify_user_deactivated",
                         user_id=user.id,
                         matricule=user.matricule,
@@ -351,7 +312,7 @@ class UserService:
                     )
             else:
                 # Mise à jour normale
-                _send_notification_in_thread(
+                NotificationQueue.submit(
                     "notify_user_updated",
                     updated_user_id=user.id,
                     matricule=user.matricule,
@@ -430,7 +391,7 @@ class UserService:
         
         # SPRINT 14 - Notification temps réel (après commit car user supprimé)
         if deleted_by_name:
-            _send_notification_in_thread(
+            NotificationQueue.submit(
                 "notify_user_deleted",
                 deleted_user_id=deleted_id,
                 matricule=deleted_matricule,
@@ -561,7 +522,7 @@ class UserService:
         
         # SPRINT 14 - Notification temps réel
         if reset_by_name:
-            _send_notification_in_thread(
+            NotificationQueue.submit(
                 "notify_user_password_reset",
                 user_id=user.id,
                 matricule=user.matricule,
@@ -615,43 +576,58 @@ class UserService:
         errors = []
         created_users = []
         
-        # Parcourir les lignes (skip header)
+        # Extraire les lignes (skip header)
+        rows = []
+        row_numbers = []
         for row_idx, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+            matricule, email, nom, prenom, role, password = (tuple(row) + (None,) * 6)[:6]
+            
+            if not all([matricule, email, nom, prenom, password]):
+                errors.append({
+                    "row": row_idx,
+                    "error": "Données manquantes"
+                })
+                error_count += 1
+                continue
+            
+            rows.append({
+                "matricule": str(matricule).strip(),
+                "email": str(email).strip(),
+                "nom": str(nom).strip(),
+                "prenom": str(prenom).strip(),
+                "role": str(role).upper().strip() if role else "USER",
+                "password": str(password),
+                "is_active": True,
+            })
+            row_numbers.append(row_idx)
+        
+        # Valider toutes les lignes en un seul appel
+        try:
+            users_data = list(enumerate(USER_IMPORT_ADAPTER.validate_python(rows)))
+        except ValidationError as e:
+            row_errors = {}
+            for err in e.errors():
+                index, *field = err["loc"]
+                message = f"{field[0]}: {err['msg']}" if field else err["msg"]
+                row_errors.setdefault(index, message)
+            
+            for index, message in sorted(row_errors.items()):
+                errors.append({
+                    "row": row_numbers[index],
+                    "matricule": rows[index]["matricule"],
+                    "error": message
+                })
+                error_count += 1
+            
+            # Lignes valides (chemin rare : fichier partiellement invalide)
+            users_data = [
+                (index, UserCreate.model_validate(data))
+                for index, data in enumerate(rows)
+                if index not in row_errors
+            ]
+        
+        for index, user_data in users_data:
             try:
-                # Extraire les données
-                matricule, email, nom, prenom, role, password = row[:6]
-                
-                # Valider les données
-                if not all([matricule, email, nom, prenom, password]):
-                    errors.append({
-                        "row": row_idx,
-                        "error": "Données manquantes"
-                    })
-                    error_count += 1
-                    continue
-                
-                # Normaliser le rôle
-                role = str(role).upper().strip() if role else "USER"
-                if role not in ["ADMIN", "MANAGER", "USER"]:
-                    errors.append({
-                        "row": row_idx,
-                        "matricule": matricule,
-                        "error": f"Rôle invalide: {role}"
-                    })
-                    error_count += 1
-                    continue
-                
-                # Créer l'utilisateur
-                user_data = UserCreate(
-                    matricule=str(matricule).strip(),
-                    email=str(email).strip().lower(),
-                    nom=str(nom).strip(),
-                    prenom=str(prenom).strip(),
-                    role=UserRole[role],
-                    password=str(password),
-                    is_active=True
-                )
-                
                 # Note: Les notifications sont envoyées dans create_user
                 user = UserService.create_user(
                     db=db,
@@ -666,19 +642,21 @@ class UserService:
                 
             except HTTPException as e:
                 errors.append({
-                    "row": row_idx,
-                    "matricule": matricule if matricule else "N/A",
+                    "row": row_numbers[index],
+                    "matricule": user_data.matricule,
                     "error": e.detail
                 })
                 error_count += 1
             except Exception as e:
                 errors.append({
-                    "row": row_idx,
-                    "matricule": matricule if matricule else "N/A",
+                    "row": row_numbers[index],
+                    "matricule": user_data.matricule,
                     "error": str(e)
                 })
                 error_count += 1
         
+        errors.sort(key=lambda error: error["row"])
+        
         # Log d'audit global
         audit_log = AuditLog(
             user_id=imported_by,
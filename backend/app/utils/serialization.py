@@ -0,0 +1,75 @@
+"""
+Utilitaires de sérialisation JSON rapides (orjson).
+
+orjson sérialise nativement les dataclasses, UUID et datetime ;
+le hook `orjson_default` ne sert que pour les types restants
+(modèles Pydantic, Decimal, Enum non-str).
+
+Les datetime naïfs sont sérialisés sans décalage horaire (pas de
+OPT_NAIVE_UTC), comme dans les réponses existantes de l'API.
+"""
+
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+
+
+def orjson_default(obj: Any) -> Any:
+    """
+    Hook `default` pour orjson.
+
+    Args:
+        obj: Objet non supporté nativement par orjson
+
+    Returns:
+        Représentation sérialisable de l'objet
+
+    Raises:
+        TypeError: Si le type n'est pas géré
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Type {type(obj).__name__} non sérialisable en JSON")
+
+
+# Options orjson globales (UUID sérialisés nativement)
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_UUID
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Sérialise un objet en JSON (bytes) avec orjson.
+
+    Args:
+        obj: Objet à sérialiser
+
+    Returns:
+        JSON encodé en UTF-8
+    """
+    return orjson.dumps(obj, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+def dumps_db_json(obj: Any) -> str:
+    """
+    Sérialiseur JSON/JSONB du moteur SQLAlchemy (json_serializer).
+
+    Les clés non-str (ex: int) sont converties en str, comme json.dumps.
+
+    Args:
+        obj: Valeur d'une colonne JSON/JSONB
+
+    Returns:
+        JSON encodé (str, attendu par le driver)
+    """
+    return orjson.dumps(
+        obj,
+        default=orjson_default,
+        option=ORJSON_OPTIONS | orjson.OPT_NON_STR_KEYS
+    ).decode()
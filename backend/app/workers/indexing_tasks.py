@@ -184,7 +184,7 @@ def index_to_weaviate(self, document_id: str) -> Dict[str, Any]:
     # Imports à l'intérieur de la fonction pour éviter les erreurs au chargement du module
     from app.models.document import Document, DocumentStatus, ProcessingStage
     from app.models.chunk import Chunk
-    from app.models.category import Category
+    from app.services.category_service import CategoryService
     from app.clients.weaviate_client import get_weaviate_client
     
     db = SessionLocal()
@@ -233,9 +233,7 @@ def index_to_weaviate(self, document_id: str) -> Dict[str, Any]:
         # Catégorie
         category_name = ""
         if document.category_id:
-            category = db.query(Category).filter(Category.id == document.category_id).first()
-            if category:
-                category_name = category.name
+            category_name = CategoryService.get_category_name(db, document.category_id) or ""
         
         # Titre du document (depuis métadonnées ou filename)
         doc_metadata = document.document_metadata or {}
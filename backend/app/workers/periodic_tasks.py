@@ -354,8 +354,8 @@ def cleanup_old_logs() -> Dict[str, Any]:
     Returns:
         Dict avec les statistiques de nettoyage
     """
-    from app.models.audit_log import AuditLog
     from app.models.token_usage import TokenUsage
+    from app.services.audit_log_service import AuditLogService
     
     db = SessionLocal()
     
@@ -372,16 +372,15 @@ def cleanup_old_logs() -> Dict[str, Any]:
             "deleted": {}
         }
         
-        # Nettoyer audit_logs
+        # Nettoyer audit_logs (partitions expirées puis suppression par lots)
         try:
-            audit_count = db.query(AuditLog).filter(
-                AuditLog.created_at < cutoff_date
-            ).count()
+            AuditLogService.ensure_partitions(db)
+            
+            audit_count = AuditLogService.cleanup_old_logs(
+                db, days_to_keep=LOG_RETENTION_DAYS
+            )
             
             if audit_count > 0:
-                db.query(AuditLog).filter(
-                    AuditLog.created_at < cutoff_date
-                ).delete(synchronize_session=False)
                 results["deleted"]["audit_logs"] = audit_count
                 logger.info(f"Supprimé {audit_count} audit_logs anciens")
         except Exception as e:
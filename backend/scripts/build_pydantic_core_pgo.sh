@@ -0,0 +1,49 @@
+#!/bin/sh
+# Rebuild pydantic-core with profile-guided optimisation (PGO).
+#
+# 1. build an instrumented wheel of the installed pydantic-core version
+# 2. run scripts/pgo_training.py (dashboard / notification / chat schemas)
+# 3. rebuild with the merged profile and install it in place
+#
+# Used by the Dockerfile when built with --build-arg PYDANTIC_CORE_PGO=1.
+set -e
+
+APP_DIR=$(cd "$(dirname "$0")/.." && pwd)
+BUILD_DIR=/tmp/pydantic-core-pgo
+PROFDATA_DIR="$BUILD_DIR/pgo-data"
+PROFDATA="$BUILD_DIR/merged.profdata"
+
+PYDANTIC_CORE_VERSION=$(python -c "import pydantic_core; print(pydantic_core.__version__)")
+echo "🔧 Build PGO de pydantic-core ${PYDANTIC_CORE_VERSION}"
+
+# Toolchain Rust + llvm-profdata
+apt-get update && apt-get install -y --no-install-recommends git
+curl --proto '=https' --tlsv1.2 -sSf https://sh.rustup.rs \
+    | sh -s -- -y --profile minimal --component llvm-tools-preview
+. "$HOME/.cargo/env"
+pip install --no-cache-dir maturin
+LLVM_PROFDATA=$(find "$(rustc --print sysroot)" -name llvm-profdata -type f | head -n 1)
+
+git clone --depth 1 --branch "v${PYDANTIC_CORE_VERSION}" \
+    https://github.com/pydantic/pydantic-core.git "$BUILD_DIR/src"
+cd "$BUILD_DIR/src"
+
+# 1. Build instrumenté
+RUSTFLAGS="-Cprofile-generate=$PROFDATA_DIR" \
+    maturin build --release --out "$BUILD_DIR/wheels-instrumented"
+pip install --no-cache-dir --force-reinstall --no-deps "$BUILD_DIR"/wheels-instrumented/*.whl
+
+# 2. Entraînement sur les schemas de l'application (variables factices pour Settings)
+(cd "$APP_DIR" && set -a && . ./.env.example && set +a && python scripts/pgo_training.py)
+
+# 3. Build final avec le profil fusionné
+"$LLVM_PROFDATA" merge -o "$PROFDATA" "$PROFDATA_DIR"
+RUSTFLAGS="-Cprofile-use=$PROFDATA -Ccodegen-units=1" \
+    maturin build --release --out "$BUILD_DIR/wheels"
+pip install --no-cache-dir --force-reinstall --no-deps "$BUILD_DIR"/wheels/*.whl
+
+# Nettoyage (toolchain et sources inutiles à l'exécution)
+cd /
+rm -rf "$BUILD_DIR" "$HOME/.rustup" "$HOME/.cargo"
+apt-get purge -y git && rm -rf /var/lib/apt/lists/*
+echo "✅ pydantic-core ${PYDANTIC_CORE_VERSION} (PGO) installé"
@@ -0,0 +1,128 @@
+"""Training workload for the PGO build of pydantic-core.
+
+Exercises the validation/serialization paths of the dashboard, notification
+and chat schemas (lists of models, datetimes, optional-heavy fields, JSON
+dumps) without needing a database. Run by scripts/build_pydantic_core_pgo.sh
+against the instrumented pydantic-core build.
+"""
+import sys
+import os
+import uuid
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.schemas.manager_dashboard import (
+    ManagerDashboardOverviewResponse,
+    ManagerDocumentsTimelineResponse,
+    ManagerTopDocumentsResponse,
+)
+from app.schemas.message import MessageResponse
+from app.schemas.notification import NotificationListResponse
+
+ITERATIONS = 200
+
+
+def manager_dashboard_payload() -> dict:
+    """Build a manager dashboard overview payload."""
+    return {
+        "documents": {
+            "total": 45, "completed": 42, "processing": 2, "failed": 1, "total_chunks": 1250
+        },
+        "messages": {"total": 320},
+        "documents_by_category": [
+            {"category": f"Catégorie {i}", "count": i} for i in range(12)
+        ],
+        "date_range": {"start": "2025-11-01T00:00:00", "end": "2025-11-28T23:59:59"},
+    }
+
+
+def notification_list_payload(size: int = 50) -> dict:
+    """Build a paginated notification list payload."""
+    now = datetime.utcnow()
+    items = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": uuid.uuid4() if i % 3 else None,
+            "type": "DOCUMENT_COMPLETED",
+            "priority": "MEDIUM",
+            "title": f"Document {i} traité",
+            "message": "Le document a été indexé avec succès" if i % 2 else None,
+            "data": {"document_id": str(uuid.uuid4())} if i % 4 else None,
+            "is_read": bool(i % 2),
+            "is_dismissed": False,
+            "created_at": now - timedelta(minutes=i),
+            "read_at": now if i % 2 else None,
+            "expires_at": None,
+            "icon": "FileCheck",
+            "color": "#10b981",
+        }
+        for i in range(size)
+    ]
+    return {
+        "items": items, "total": size, "unread_count": size // 2,
+        "page": 1, "page_size": size, "total_pages": 1,
+    }
+
+
+def message_payload() -> dict:
+    """Build an assistant message payload with sources."""
+    return {
+        "id": uuid.uuid4(),
+        "conversation_id": uuid.uuid4(),
+        "role": "ASSISTANT",
+        "content": "Voici la procédure à suivre. " * 20,
+        "sources": [
+            {"document_id": str(uuid.uuid4()), "title": f"Doc {i}", "page": i}
+            for i in range(5)
+        ],
+        "token_count_input": 1500,
+        "token_count_output": 200,
+        "cost_usd": 0.002,
+        "cost_xaf": 1.2,
+        "model_used": "mistral-medium-latest",
+        "created_at": datetime.utcnow(),
+    }
+
+
+def run():
+    """Run the training workload."""
+    timeline = {
+        "timeline": [
+            {"date": f"2025-11-{day:02d}", "documents_count": day} for day in range(1, 29)
+        ]
+    }
+    top_documents = {
+        "documents": [
+            {
+                "document_id": str(uuid.uuid4()),
+                "title": f"Lettre_Circulaire_{i}.pdf",
+                "category": None if i % 5 else "Lettres Circulaires",
+                "usage_count": i,
+                "total_chunks": 28,
+                "uploaded_at": "2025-11-15T10:30:00",
+            }
+            for i in range(10)
+        ]
+    }
+
+    for _ in range(ITERATIONS):
+        overview = ManagerDashboardOverviewResponse.model_validate(manager_dashboard_payload())
+        ManagerDashboardOverviewResponse.model_validate_json(overview.model_dump_json())
+
+        notifications = NotificationListResponse.model_validate(notification_list_payload())
+        notifications.model_dump(mode="json")
+        notifications.model_dump_json()
+
+        message = MessageResponse.model_validate(message_payload())
+        message.model_dump_json()
+
+        ManagerDocumentsTimelineResponse.model_validate(timeline).model_dump_json()
+        ManagerTopDocumentsResponse.model_validate(top_documents).model_dump_json()
+
+    print(f"✅ PGO training workload done ({ITERATIONS} iterations)")
+
+
+if __name__ == "__main__":
+    run()
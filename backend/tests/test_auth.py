@@ -99,6 +99,64 @@ class TestLogin:
             json={"password": "TestPassword123!"}
         )
         assert response.status_code == 422
+    
+    def test_authenticate_malformed_matricule(self, db_session, monkeypatch):
+        """Test malformed matricule is rejected without a password check."""
+        from app.services import auth_service
+        from app.services.auth_service import AuthService
+        
+        def fail_verify(*args, **kwargs):
+            raise AssertionError("verify_password ne doit pas être appelé")
+        
+        monkeypatch.setattr(auth_service, "verify_password", fail_verify)
+        
+        assert AuthService.authenticate_user(db_session, "AB", "TestPassword123!") is None
+        assert AuthService.authenticate_user(db_session, "A" * 51, "TestPassword123!") is None
+    
+    def test_authenticate_unknown_user(self, db_session, monkeypatch):
+        """Test unknown matricule still runs a (dummy) password check."""
+        from app.services import auth_service
+        from app.services.auth_service import AuthService
+        
+        calls = []
+        real_verify = auth_service.verify_password
+        
+        def spy_verify(password, hashed_password):
+            calls.append(hashed_password)
+            return real_verify(password, hashed_password)
+        
+        monkeypatch.setattr(auth_service, "verify_password", spy_verify)
+        
+        assert AuthService.authenticate_user(db_session, "UNKNOWN001", "TestPassword123!") is None
+        assert len(calls) == 1
+    
+    def test_login_matricule_with_space(self, client: TestClient, db_session):
+        """Test a matricule accepted by the schemas (with a space) can log in."""
+        from app.models.user import User
+        
+        user = User(
+            matricule="ABC 001",
+            email="space@test.com",
+            nom="Space",
+            prenom="User",
+            hashed_password=get_password_hash("TestPassword123!"),
+            role="USER",
+            is_active=True,
+            is_verified=True
+        )
+        db_session.add(user)
+        db_session.commit()
+        
+        response = client.post(
+            "/api/v1/auth/login",
+            json={
+                "matricule": "ABC 001",
+                "password": "TestPassword123!"
+            }
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["user"]["matricule"] == "ABC 001"
 
 
 class TestRefreshToken:
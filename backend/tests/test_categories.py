@@ -0,0 +1,57 @@
+"""Tests for category keyset pagination cursors."""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.category_service import CategoryService
+
+
+class TestCategoryCursor:
+    """Tests for encode_cursor / decode_cursor."""
+    
+    def test_cursor_round_trip(self):
+        """Test a cursor decodes to the name and id it was built from."""
+        category_id = uuid.uuid4()
+        
+        cursor = CategoryService.encode_cursor("Crédit", category_id)
+        
+        assert CategoryService.decode_cursor(cursor) == ("Crédit", category_id)
+    
+    def test_cursor_round_trip_name_with_colon(self):
+        """Test a ':' in the category name survives the round trip."""
+        category_id = uuid.uuid4()
+        
+        cursor = CategoryService.encode_cursor("RH: procédures: 2025", category_id)
+        
+        assert CategoryService.decode_cursor(cursor) == ("RH: procédures: 2025", category_id)
+    
+    def test_cursor_is_url_safe(self):
+        """Test the cursor can be passed as a query parameter as is."""
+        cursor = CategoryService.encode_cursor("??>>", uuid.uuid4())
+        
+        assert "+" not in cursor
+        assert "/" not in cursor
+    
+    @pytest.mark.parametrize("cursor", [
+        "not-a-cursor!",
+        "Zm9v",  # "foo": no UUID
+        CategoryService.encode_cursor("Crédit", uuid.uuid4())[:-8],
+    ])
+    def test_malformed_cursor(self, cursor):
+        """Test a malformed cursor is rejected with a 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            CategoryService.decode_cursor(cursor)
+        
+        assert exc_info.value.status_code == 400
+    
+    def test_malformed_cursor_endpoint(self, client, admin_headers):
+        """Test the listing endpoint answers 400 to a malformed cursor."""
+        response = client.get(
+            "/api/v1/categories",
+            params={"cursor": "not-a-cursor!"},
+            headers=admin_headers
+        )
+        
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Curseur de pagination invalide"
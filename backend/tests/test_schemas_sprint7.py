@@ -10,6 +10,8 @@ Tests pour :
 Sprint 7 - Phase 5 : Tests
 """
 
+import json
+
 import pytest
 from datetime import datetime
 from uuid import uuid4, UUID
@@ -34,6 +36,8 @@ from app.schemas.message import (
     ChatStreamErrorEvent,
     SourceReference,
     MessageResponse,
+    MessageHistoryItem,
+    encode_sse_event,
 )
 from app.schemas.feedback import (
     FeedbackCreate,
@@ -203,22 +207,24 @@ class TestMessageSchemas:
     
     def test_source_reference(self):
         """Test référence de source."""
+        doc_id = uuid4()
         schema = SourceReference(
-            document_id="doc-123",
+            document_id=doc_id,
             title="Circulaire N°001/2024",
             category="Lettres Circulaires",
             page=5,
             relevance_score=0.95
         )
-        assert schema.document_id == "doc-123"
+        assert schema.document_id == doc_id
         assert schema.relevance_score == 0.95
     
     def test_source_reference_minimal(self):
         """Test référence de source minimale."""
         schema = SourceReference(
-            document_id="doc-123",
+            document_id=str(uuid4()),
             title="Document test"
         )
+        assert isinstance(schema.document_id, UUID)
         assert schema.category is None
         assert schema.page is None
     
@@ -242,8 +248,8 @@ class TestMessageSchemas:
     def test_stream_sources_event(self):
         """Test événement de sources."""
         sources = [
-            SourceReference(document_id="1", title="Doc 1"),
-            SourceReference(document_id="2", title="Doc 2"),
+            SourceReference(document_id=uuid4(), title="Doc 1"),
+            SourceReference(document_id=uuid4(), title="Doc 2"),
         ]
         schema = ChatStreamSourcesEvent(sources=sources)
         assert len(schema.sources) == 2
@@ -277,6 +283,37 @@ class TestMessageSchemas:
         )
         assert schema.error == "Erreur de connexion"
         assert schema.code == "CONNECTION_ERROR"
+    
+    def test_stream_event_is_immutable(self):
+        """Test que les événements de stream sont figés."""
+        schema = ChatStreamTokenEvent(content="Voici ")
+        with pytest.raises(AttributeError):
+            schema.content = "autre"
+    
+    def test_encode_sse_token_event(self):
+        """Test encodage SSE rapide d'un token."""
+        frame = encode_sse_event("token", ChatStreamTokenEvent(content='Voici "ça"'))
+        assert frame.startswith(b"event: token\ndata: ")
+        assert frame.endswith(b"\n\n")
+        payload = json.loads(frame.split(b"data: ", 1)[1])
+        assert payload == {"content": 'Voici "ça"', "event": "token"}
+    
+    def test_encode_sse_sources_event(self):
+        """Test encodage SSE d'un événement contenant des modèles Pydantic."""
+        event = ChatStreamSourcesEvent(
+            sources=[SourceReference(document_id=uuid4(), title="Doc 1")]
+        )
+        frame = encode_sse_event("sources", event)
+        payload = json.loads(frame.split(b"data: ", 1)[1])
+        assert payload["event"] == "sources"
+        assert payload["sources"][0]["title"] == "Doc 1"
+    
+    def test_encode_sse_end_event_uuid(self):
+        """Test encodage SSE d'un UUID."""
+        msg_id = uuid4()
+        frame = encode_sse_event("done", ChatStreamEndEvent(message_id=msg_id))
+        payload = json.loads(frame.split(b"data: ", 1)[1])
+        assert payload["message_id"] == str(msg_id)
 
 
 # =============================================================================
@@ -378,4 +415,14 @@ class TestSchemaValidation:
             message_id=uuid4(),
             rating=FeedbackRatingEnum.THUMBS_UP
         )
-        assert schema.comment is None
\ No newline at end of file
+        assert schema.comment is None
+    
+    def test_history_item_frozen_and_strict(self):
+        """Test que MessageHistoryItem est immuable et refuse les champs inconnus."""
+        item = MessageHistoryItem(role="USER", content="Bonjour")
+        
+        with pytest.raises(ValidationError):
+            item.content = "Autre"
+        
+        with pytest.raises(ValidationError):
+            MessageHistoryItem(role="USER", content="Bonjour", extra="x")
@@ -2,7 +2,12 @@
 import pytest
 from datetime import timedelta
 
+from fastapi import HTTPException
+from jose import jwt
+
+from app.core.config import settings
 from app.core.security import (
+    ALGORITHM,
     verify_password,
     get_password_hash,
     create_access_token,
@@ -122,6 +127,46 @@ class TestJWTTokens:
         assert payload is not None
         assert "exp" in payload
         assert isinstance(payload["exp"], int)
+    
+    def test_decode_token_expected_type(self):
+        """Test decoding with the expected token type."""
+        token = create_access_token({"sub": "user@example.com"})
+        
+        payload = decode_token(token, required_claims=("sub", "exp"), expected_type="access")
+        
+        assert payload["type"] == "access"
+    
+    def test_decode_token_wrong_type(self):
+        """Test a refresh token is rejected where an access token is expected."""
+        token = create_refresh_token({"sub": "user@example.com"})
+        
+        with pytest.raises(HTTPException) as exc_info:
+            decode_token(token, expected_type="access")
+        
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.detail == "Type de token invalide"
+    
+    def test_decode_token_missing_sub(self):
+        """Test a token without sub is rejected when sub is required."""
+        token = create_access_token({"user_id": "123"})
+        
+        with pytest.raises(HTTPException) as exc_info:
+            decode_token(token, required_claims=("sub", "exp"))
+        
+        assert exc_info.value.status_code == 401
+    
+    def test_decode_token_missing_exp(self):
+        """Test a token without exp is rejected when exp is required."""
+        token = jwt.encode(
+            {"sub": "user@example.com", "type": "access"},
+            settings.SECRET_KEY,
+            algorithm=ALGORITHM
+        )
+        
+        with pytest.raises(HTTPException) as exc_info:
+            decode_token(token, required_claims=("sub", "exp"), expected_type="access")
+        
+        assert exc_info.value.status_code == 401
 
 
 class TestPasswordComplexity: